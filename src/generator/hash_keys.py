@@ -0,0 +1,118 @@
+import hashlib
+import logging
+from operator import methodcaller
+
+logger = logging.getLogger(__name__)
+
+
+class HashKeyCollision(ValueError):
+    """Raised when two different business keys get the same hash key"""
+
+
+class HashKeyGenerator:
+    """Generates stable surrogate keys from the business identity of objects, e.g. (model code, entity code)
+
+    The same business key always gets the same hash key, across documents and runs, unlike the ObjectID's Power
+    Designer generates. Parts of a key are trimmed, upper cased and joined with a separator before they are hashed,
+    so 'Country' and ' COUNTRY' are the same object. Keys are hashed in batches: the strings are built and hashed by
+    map() over the whole batch, instead of a Python function call per object.
+
+    Every hash key is remembered with its business key, so a hash that is generated for two different business keys
+    is detected.
+
+    Example:
+        generator = HashKeyGenerator(algorithm="sha256")
+        lst_ids = generator.generate([("DA_Central", "COUNTRY"), ("DA_Central", "CITY")])
+    """
+
+    def __init__(
+        self, algorithm: str = "md5", separator: str = "||", check_collisions: bool = True
+    ):
+        """Sets up the generator
+
+        Args:
+            algorithm (str, optional): A hashlib algorithm, like 'md5', 'sha1', 'sha256' or 'blake2b'.
+                Defaults to "md5".
+            separator (str, optional): Put between the parts of a key, should not occur in the parts.
+                Defaults to "||".
+            check_collisions (bool, optional): Check whether hash keys are unique. Defaults to True.
+
+        Raises:
+            ValueError: When hashlib doesn't have the algorithm
+        """
+        # The shake algorithms have no fixed length, they need one for every digest
+        if algorithm not in hashlib.algorithms_available or algorithm.startswith("shake"):
+            raise ValueError(
+                f"Unknown hash algorithm '{algorithm}', choose from {sorted(hashlib.algorithms_guaranteed)}"
+            )
+        self.algorithm = algorithm
+        self.separator = separator
+        self.check_collisions = check_collisions
+        self._hash = getattr(hashlib, algorithm, None) or (
+            lambda data: hashlib.new(algorithm, data)
+        )
+        # Hash key as key, the business key it was generated for as value
+        self.dict_keys = {}
+
+    def generate(self, lst_keys: list) -> list:
+        """Generates the hash keys of a batch of business keys
+
+        Args:
+            lst_keys (list): Business keys, each a tuple of its parts (a single string is a key of one part).
+                None parts are treated as empty strings.
+
+        Returns:
+            list: Upper case hexadecimal hash keys, in the order of lst_keys
+
+        Raises:
+            HashKeyCollision: When a hash key is generated for two different business keys
+        """
+        lst_normalized = list(map(self.__normalize, lst_keys))
+        lst_hashes = list(
+            map(
+                str.upper,
+                map(
+                    methodcaller("hexdigest"),
+                    map(self._hash, map(str.encode, lst_normalized)),
+                ),
+            )
+        )
+        if self.check_collisions:
+            self.__check(lst_hashes, lst_normalized)
+        return lst_hashes
+
+    def key(self, *parts) -> str:
+        """Generates the hash key of a single business key
+
+        Args:
+            *parts (str): Parts of the business key
+
+        Returns:
+            str: The hash key
+        """
+        return self.generate([parts])[0]
+
+    def __normalize(self, key) -> str:
+        """Joins the trimmed, upper cased parts of a business key"""
+        if isinstance(key, str):
+            return key.strip().upper()
+        return self.separator.join(
+            "" if part is None else str(part).strip().upper() for part in key
+        )
+
+    def __check(self, lst_hashes: list, lst_normalized: list):
+        """Registers the generated hash keys and checks them against earlier ones"""
+        dict_batch = dict(zip(lst_hashes, lst_normalized))
+        if len(dict_batch) == len(lst_hashes) and self.dict_keys.keys().isdisjoint(dict_batch):
+            self.dict_keys.update(dict_batch)
+            return
+        # A hash key is repeated: fine for the same business key, a collision for a different one
+        for hash_key, key in zip(lst_hashes, lst_normalized):
+            key_known = self.dict_keys.setdefault(hash_key, key)
+            if key_known != key:
+                logger.error(
+                    f"Hash key {hash_key} ({self.algorithm}) is generated for '{key_known}' and '{key}'"
+                )
+                raise HashKeyCollision(
+                    f"Hash key {hash_key} is generated for '{key_known}' and '{key}'"
+                )
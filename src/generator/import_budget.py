@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+# Import time budget of query-only commands, in milliseconds
+BUDGET_MS = 150
+# Number of measurements, the fastest one counts so a busy machine doesn't fail the check
+RUNS = 5
+# Heavy dependencies that query-only commands must not import
+LST_LAZY_MODULES = ["jinja2", "xmltodict", "yaml", "duckdb", "logging.config"]
+
+DIR_REPO = Path(__file__).resolve().parents[2]
+DIR_GENERATOR = Path(__file__).resolve().parent
+
+
+def measure(module: str = "json_query") -> tuple:
+    """Imports a module in a fresh interpreter with '-X importtime'
+
+    Args:
+        module (str, optional): Module to import. Defaults to "json_query".
+
+    Returns:
+        tuple: Cumulative import time of the module in milliseconds and the names of all modules it imported
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(DIR_REPO), str(DIR_GENERATOR)])
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=DIR_REPO,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like 'import time:       537 |      31934 | json_query', the last one is the module itself
+    dict_cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            dict_cumulative[name.strip()] = int(cumulative)
+    return dict_cumulative.get(module, 0) / 1000, set(dict_cumulative)
+
+
+def check(module: str = "json_query", budget_ms: float = BUDGET_MS, runs: int = RUNS) -> bool:
+    """Checks the import time of a module against the budget and that it doesn't import heavy dependencies
+
+    Args:
+        module (str, optional): Module to import. Defaults to "json_query".
+        budget_ms (float, optional): Maximum import time in milliseconds. Defaults to BUDGET_MS.
+        runs (int, optional): Number of measurements, the fastest counts. Defaults to RUNS.
+
+    Returns:
+        bool: True when the import is within budget and lazy
+    """
+    lst_measurements = [measure(module) for _ in range(runs)]
+    ms_import = min(ms for ms, _ in lst_measurements)
+    set_eager = {
+        name for name in LST_LAZY_MODULES if any(name in set_modules for _, set_modules in lst_measurements)
+    }
+    is_ok = ms_import <= budget_ms and len(set_eager) == 0
+    print(f"Importing '{module}' takes {ms_import:.1f} ms, the budget is {budget_ms} ms")
+    if len(set_eager) > 0:
+        print(f"'{module}' imports {sorted(set_eager)}, these should be imported where they are used")
+    print("OK" if is_ok else "Over budget")
+    return is_ok
+
+
+# Run Current Class
+if __name__ == "__main__":
+    # Budget in milliseconds can be given as the first argument, e.g. 'python src/generator/import_budget.py 100'
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    sys.exit(0 if check(budget_ms=budget_ms) else 1)
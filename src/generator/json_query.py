@@ -1,28 +1,166 @@
+from collections.abc import Mapping, Sequence
 import json
+import logging
 import os
 import sys
 
 sys.path.append(os.getcwd())
 
-from src.log_config.logging_config import logging
+from hash_keys import HashKeyGenerator
+from src.log_config.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+
+class ReferenceResolver:
+    """Rehydrates the references of a normalized document (see pd_document_normalizer.py) when they are accessed
+
+    Nothing is copied up front: dictionaries and lists of the document are wrapped in read-only views that resolve
+    references like {"$ref": "#/Attributes/o90"} to the object in the lookup table when an item is retrieved. Data
+    stored next to a reference takes precedence over the data of the referenced object.
+    """
+
+    def __init__(self, document: dict):
+        """Wraps a loaded normalized document
+
+        Args:
+            document (dict): The normalized document with its lookup tables
+        """
+        self._document = document
+
+    def resolve(self, value):
+        """Wraps dictionaries and lists in views that resolve references, other values are returned as is
+
+        Args:
+            value (any): Part of the document
+
+        Returns:
+            any: A ResolvedDict, a ResolvedList or the value itself
+        """
+        if isinstance(value, dict):
+            if "$ref" in value:
+                return ResolvedDict(
+                    resolver=self, data=self.target(value["$ref"]), extras=value
+                )
+            return ResolvedDict(resolver=self, data=value)
+        if isinstance(value, list):
+            return ResolvedList(resolver=self, data=value)
+        return value
+
+    def target(self, reference: str) -> dict:
+        """Looks up the object a reference refers to
+
+        Args:
+            reference (str): Reference like '#/Attributes/o90'
+
+        Returns:
+            dict: The object in the lookup table
+        """
+        _, table, id = reference.split("/", 2)
+        try:
+            return self._document[table][id]
+        except KeyError:
+            logger.error(f"Reference '{reference}' can't be resolved")
+            return {}
+
+
+class ResolvedDict(Mapping):
+    """Read-only view of a dictionary of a normalized document, resolving references on access"""
+
+    __slots__ = ("_resolver", "_data", "_extras")
+
+    def __init__(self, resolver: ReferenceResolver, data: dict, extras: dict = None):
+        self._resolver = resolver
+        self._data = data
+        self._extras = {} if extras is None else extras
+
+    def __getitem__(self, key):
+        if key in self._extras and key != "$ref":
+            return self._resolver.resolve(self._extras[key])
+        return self._resolver.resolve(self._data[key])
+
+    def __iter__(self):
+        yield from self._data
+        for key in self._extras:
+            if key != "$ref" and key not in self._data:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"ResolvedDict({dict(self)!r})"
+
+
+class ResolvedList(Sequence):
+    """Read-only view of a list of a normalized document, resolving references on access"""
+
+    __slots__ = ("_resolver", "_data")
+
+    def __init__(self, resolver: ReferenceResolver, data: list):
+        self._resolver = resolver
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResolvedList(resolver=self._resolver, data=self._data[index])
+        return self._resolver.resolve(self._data[index])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"ResolvedList({list(self)!r})"
+
+
+class ProjectedDict(Mapping):
+    """Read-only view of a dictionary that only shows the selected keys, nothing is copied"""
+
+    __slots__ = ("_data", "_fields")
+
+    def __init__(self, data: Mapping, fields: tuple):
+        self._data = data
+        self._fields = fields
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return self._data[key]
+
+    def __iter__(self):
+        return (key for key in self._fields if key in self._data)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"ProjectedDict({dict(self)!r})"
+
+
 class PDDocumentQuery:
     """Stores the models and mappings within a single PDDocument"""
 
-    def __init__(self, file_json: str):
+    def __init__(self, file_json: str, hash_algorithm: str = "md5"):
         """Retrieves a list of all models and a list of all mappings within a single PDDocument
 
         Args:
             document (PDDocument): The representation of a Power Designer logical data model
+            hash_algorithm (str, optional): Algorithm for the ID's of the MDDE exports. Defaults to "md5".
         """
         # FIXME: Add handling in case file doesn't exist
-        with open(file_json) as f:
-            self._document = json.load(f)
+        with tracer.span("Load JSON", category="stage", file=file_json):
+            with open(file_json) as f:
+                self._document = json.load(f)
+        # Normalized documents refer to their entities and attributes, these are resolved on access
+        self._resolver = None
+        if self._document.get("Format") == "normalized":
+            self._resolver = ReferenceResolver(document=self._document)
         self._lst_models = []
         self._lst_mappings = []
+        # ID's of the MDDE exports are hashes of the codes of models, entities and attributes
+        self._hash_keys = HashKeyGenerator(algorithm=hash_algorithm)
 
+    @tracer.traced(category="query")
     def get_entities(self, name_model: str = None):
         """Retrieves the given name_model's entities or all entities of models
         Args:
@@ -31,61 +169,223 @@ class PDDocumentQuery:
         Returns:
             Array: Each row represents a single entity within a model
         """
-        lst_models = self.__get_models()
-        lst_results = []
-        if name_model is None:
-            lst_results = [model["Entities"] for model in lst_models]
-        else:
-            lst_results = [
-                model["Entities"] for model in lst_models if model["Name"] == name_model
-            ]
+        lst_results = [model["Entities"] for model in self.iter_models(name_model=name_model)]
         return lst_results
 
+    def iter_models(
+        self, name_model: str = None, document_only: bool = False, where=None, fields: list = None
+    ):
+        """Generates the models
+
+        Args:
+            name_model (str, optional): Only the model with this name
+            document_only (bool, optional): Only the models of the document itself, not the models it refers to
+                with shortcuts. Defaults to False.
+            where (callable, optional): Only the models for which this function returns True
+            fields (list, optional): Only these keys of the models are shown, see select
+
+        Yields:
+            Mapping: A model
+        """
+        for model in self.__get_models():
+            if name_model is not None and model["Name"] != name_model:
+                continue
+            if document_only and not model["IsDocumentModel"]:
+                continue
+            yield from self.select([model], where=where, fields=fields)
+
+    def iter_entities(
+        self, name_model: str = None, document_only: bool = False, where=None, fields: list = None
+    ):
+        """Generates the entities of the models
+
+        Args:
+            name_model (str, optional): Only the entities of the model with this name
+            document_only (bool, optional): Only the entities of the models of the document itself. Defaults to False.
+            where (callable, optional): Only the entities for which this function returns True
+            fields (list, optional): Only these keys of the entities are shown, see select
+
+        Yields:
+            Mapping: An entity
+        """
+        for model in self.iter_models(name_model=name_model, document_only=document_only):
+            yield from self.select(model.get("Entities", []), where=where, fields=fields)
+
+    def iter_attributes(
+        self,
+        name_model: str = None,
+        code_entity: str = None,
+        document_only: bool = False,
+        where=None,
+        fields: list = None,
+    ):
+        """Generates the attributes of the entities
+
+        Args:
+            name_model (str, optional): Only the attributes of the model with this name
+            code_entity (str, optional): Only the attributes of the entity with this code
+            document_only (bool, optional): Only the attributes of the models of the document itself.
+                Defaults to False.
+            where (callable, optional): Only the attributes for which this function returns True
+            fields (list, optional): Only these keys of the attributes are shown, see select
+
+        Yields:
+            Mapping: An attribute
+        """
+        for entity in self.iter_entities(name_model=name_model, document_only=document_only):
+            if code_entity is not None and entity["Code"] != code_entity:
+                continue
+            yield from self.select(entity.get("Attributes", []), where=where, fields=fields)
+
+    def iter_relationships(self, name_model: str = None, where=None, fields: list = None):
+        """Generates the relationships between entities of the models
+
+        Args:
+            name_model (str, optional): Only the relationships of the model with this name
+            where (callable, optional): Only the relationships for which this function returns True
+            fields (list, optional): Only these keys of the relationships are shown, see select
+
+        Yields:
+            Mapping: A relationship
+        """
+        for model in self.iter_models(name_model=name_model):
+            yield from self.select(model.get("Relationships", []), where=where, fields=fields)
+
+    def iter_mappings(self, code_target: str = None, where=None, fields: list = None):
+        """Generates the mappings
+
+        Args:
+            code_target (str, optional): Only the mappings to the entity with this code
+            where (callable, optional): Only the mappings for which this function returns True
+            fields (list, optional): Only these keys of the mappings are shown, see select
+
+        Yields:
+            Mapping: A mapping
+        """
+        for mapping in self.__get_mapping():
+            if code_target is not None and mapping["EntityTarget"]["Code"] != code_target:
+                continue
+            yield from self.select([mapping], where=where, fields=fields)
+
+    def iter_attribute_mappings(
+        self, code_mapping: str = None, code_target: str = None, where=None, fields: list = None
+    ):
+        """Generates the attribute mappings of the mappings
+
+        Args:
+            code_mapping (str, optional): Only the attribute mappings of the mapping with this code
+            code_target (str, optional): Only the attribute mappings of mappings to the entity with this code
+            where (callable, optional): Only the attribute mappings for which this function returns True
+            fields (list, optional): Only these keys of the attribute mappings are shown, see select
+
+        Yields:
+            Mapping: An attribute mapping
+        """
+        for mapping in self.iter_mappings(code_target=code_target):
+            if code_mapping is not None and mapping["Code"] != code_mapping:
+                continue
+            yield from self.select(mapping.get("AttributeMapping", []), where=where, fields=fields)
+
+    def select(self, objects, where=None, fields: list = None):
+        """Filters objects and shows only some of their keys, while they are iterated
+
+        Args:
+            objects (iterable): Models, entities, attributes or other objects of the document
+            where (callable, optional): Only the objects for which this function returns True
+            fields (list, optional): Only these keys are shown, as a read-only view on the object itself
+
+        Yields:
+            Mapping: An object
+        """
+        fields = None if fields is None else tuple(fields)
+        for obj in objects:
+            if where is not None and not where(obj):
+                continue
+            yield obj if fields is None else ProjectedDict(data=obj, fields=fields)
+
     def __get_models(self):
         if len(self._lst_models) == 0:
-            self._lst_models = self._document["Models"]
+            self._lst_models = self.__resolved(self._document["Models"])
         return self._lst_models
 
     def __get_mapping(self):
         if len(self._lst_mappings) == 0:
-            self._lst_mappings = self._document["Mappings"]
+            self._lst_mappings = self.__resolved(self._document["Mappings"])
         return self._lst_mappings
 
+    def __resolved(self, value):
+        """Wraps data of a normalized document so its references are resolved on access
+
+        Args:
+            value (any): Part of the loaded document
+
+        Returns:
+            any: The data itself for documents that aren't normalized
+        """
+        if self._resolver is None:
+            return value
+        return self._resolver.resolve(value)
+
+    @tracer.traced(category="query")
     def get_MDDE_model(self) -> list:
         """Retrieves all models from lst_models and returns them in a dictionary
 
         Returns:
             lst_result (dict): Each dictionary value represents a model
         """
-        # TODO: Genereren ID's op hash
-        lst_models = self.__get_models()
-        lst_result = []
-        for model in lst_models:
-            dict_selection = {
-                "ModelID": model["TargetID"],
+        return list(self.iter_MDDE_model())
+
+    @tracer.traced(category="query")
+    def get_MDDE_entity(self) -> list:
+        """Retrieves a dictionary of all entities within the models stored in lst_models
+
+        Returns:
+            lst_results (dict): Each dictionary value represents an entity
+        """
+        return list(self.iter_MDDE_entity())
+
+    @tracer.traced(category="query")
+    def get_MDDE_attribute(self) -> list:
+        """Retrieves the attributes of all models that have IsDocumentModel = True
+
+        Returns:
+            list: Each dictionary value represents an attribute
+        """
+        return list(self.iter_MDDE_attribute())
+
+    def iter_MDDE_model(self):
+        """Generates the MDDE rows of the models
+
+        Yields:
+            dict: A model
+        """
+        lst_models = list(self.__get_models())
+        lst_ids = self._hash_keys.generate([(model["Code"],) for model in lst_models])
+        for model, id_model in zip(lst_models, lst_ids):
+            yield {
+                "ModelID": id_model,
                 "Name": model["Name"],
                 "Code": model["Name"],
                 "CreationDate": model["CreationDate"],
                 "ModificationDate": model["ModificationDate"],
             }
-            lst_result.append(dict_selection)
-        return lst_result
 
-    def get_MDDE_entity(self) -> list:
-        """Retrieves a dictionary of all entities within the models stored in lst_models
+    def iter_MDDE_entity(self):
+        """Generates the MDDE rows of the entities, the ID's are generated per model in one batch
 
-        Returns:
-            lst_results (dict): Each dictionary value represents an entity
+        Yields:
+            dict: An entity
         """
-        # TODO: Genereren ID's op hash
-        lst_results = []
-        lst_models = self.__get_models()
-        for model in lst_models:
-            lst_entities = model["Entities"]
-            for entity in lst_entities:
-                dict_selection = {
-                    "EntityID": entity["ObjectID"],
-                    "ModelID": model["TargetID"],
+        for model in self.__get_models():
+            id_model = self._hash_keys.key(model["Code"])
+            lst_entities = list(model["Entities"])
+            lst_ids = self._hash_keys.generate(
+                [(model["Code"], entity["Code"]) for entity in lst_entities]
+            )
+            for entity, id_entity in zip(lst_entities, lst_ids):
+                yield {
+                    "EntityID": id_entity,
+                    "ModelID": id_model,
                     "EntityName": entity["Name"],
                     "EntityCode": entity["Code"],
                     "EntitySchema": model[
@@ -97,27 +397,47 @@ class PDDocumentQuery:
                     "CreationDate": entity["CreationDate"],
                     "ModificationDate": entity["ModificationDate"],
                 }
-                lst_results.append(dict_selection)
-        return lst_results
 
-    def get_MDDE_attribute(self) -> list:
-        """**Not yet finished** Retrieves all the attributeID's from all models that have IsDocumentModel = True
+    def iter_MDDE_attribute(self):
+        """Generates the MDDE rows of the attributes of the models that have IsDocumentModel = True
 
-        Returns:
-            list: Each value represents the ObjectID of a single Attribute
+        The ID's are generated per entity in one batch.
+
+        Yields:
+            dict: An attribute
         """
-        # TODO: Genereren ID's op hash
-        # TODO: Complete
-        lst_results = []
-        lst_models = self.__get_models()
         # Only the attributes of the non-source model should be deployed
-        models_document = [model for model in lst_models if model["IsDocumentModel"]]
+        models_document = [model for model in self.__get_models() if model["IsDocumentModel"]]
         for model in models_document:
-            lst_entities = model["Entities"]
-            for entity in lst_entities:
-                lst_attributes = entity["Attributes"]
-                for attr in lst_attributes:
-                    dict_selection = {"AttributeID": attr["ObjectID"]}
-                    lst_results.append(dict_selection)
-
-        return lst_results
+            id_model = self._hash_keys.key(model["Code"])
+            for entity in model["Entities"]:
+                id_entity = self._hash_keys.key(model["Code"], entity["Code"])
+                lst_attributes = list(entity.get("Attributes", []))
+                lst_ids = self._hash_keys.generate(
+                    [(model["Code"], entity["Code"], attr["Code"]) for attr in lst_attributes]
+                )
+                # Attributes of the primary identifier make up the entity's primary key
+                set_primary = {
+                    attr["Code"]
+                    for identifier in entity.get("Identifiers", [])
+                    if identifier.get("IsPrimary")
+                    for attr in identifier.get("Attributes", [])
+                }
+                for attr, id_attribute in zip(lst_attributes, lst_ids):
+                    domain = attr.get("Domain", {})
+                    yield {
+                        "AttributeID": id_attribute,
+                        "EntityID": id_entity,
+                        "ModelID": id_model,
+                        "AttributeName": attr["Name"],
+                        "AttributeCode": attr["Code"],
+                        "AttributeOrder": attr.get("Order"),
+                        "DataType": attr.get("DataType"),
+                        "Length": attr.get("Length"),
+                        "Precision": attr.get("Precision"),
+                        "IsMandatory": str(attr.get("LogicalAttribute.Mandatory") == "1"),
+                        "IsPrimaryKey": str(attr["Code"] in set_primary),
+                        "DomainCode": domain.get("Code"),
+                        "CreationDate": attr.get("CreationDate"),
+                        "ModificationDate": attr.get("ModificationDate"),
+                    }
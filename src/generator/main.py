@@ -1,11 +1,15 @@
-import yaml
 from pathlib import Path
 
 from json_query import PDDocumentQuery
+from src.log_config.logging_config import setup_logging
 
 def main():
+    setup_logging()
     file_config = Path("config.yml")
     if file_config.exists():
+        # Imported on first use to keep the start-up of query-only commands fast
+        import yaml
+
         with open(file_config) as f:
             config = yaml.safe_load(f)
     else:
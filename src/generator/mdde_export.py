@@ -0,0 +1,213 @@
+import csv
+from itertools import islice
+import json
+import logging
+from pathlib import Path
+
+from src.log_config.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class MDDEExport:
+    """Writes the MDDE metadata tables of a document to CSV files, Parquet files or a DuckDB database
+
+    Rows are taken from the query's iter_MDDE_* generators and written while they are generated, so the tables are
+    never held in memory as a whole. Parquet files and DuckDB tables are loaded by DuckDB in a single bulk
+    statement from a staging file that is written in batches, instead of inserting row by row.
+
+    Example:
+        export = MDDEExport(query=PDDocumentQuery(file_json="output/Example.json"))
+        export.to_duckdb(database="output/mdde.duckdb")
+    """
+
+    # Table name as key, columns with their DuckDB types as value
+    DICT_SCHEMAS = {
+        "Model": {
+            "ModelID": "VARCHAR",
+            "Name": "VARCHAR",
+            "Code": "VARCHAR",
+            "CreationDate": "TIMESTAMP",
+            "ModificationDate": "TIMESTAMP",
+        },
+        "Entity": {
+            "EntityID": "VARCHAR",
+            "ModelID": "VARCHAR",
+            "EntityName": "VARCHAR",
+            "EntityCode": "VARCHAR",
+            "EntitySchema": "VARCHAR",
+            "EntityIsShortcut": "VARCHAR",
+            "EntityOrgID": "VARCHAR",
+            "ModelOrgID": "VARCHAR",
+            "CreationDate": "TIMESTAMP",
+            "ModificationDate": "TIMESTAMP",
+        },
+        "Attribute": {
+            "AttributeID": "VARCHAR",
+            "EntityID": "VARCHAR",
+            "ModelID": "VARCHAR",
+            "AttributeName": "VARCHAR",
+            "AttributeCode": "VARCHAR",
+            "AttributeOrder": "INTEGER",
+            "DataType": "VARCHAR",
+            "Length": "INTEGER",
+            "Precision": "INTEGER",
+            "IsMandatory": "VARCHAR",
+            "IsPrimaryKey": "VARCHAR",
+            "DomainCode": "VARCHAR",
+            "CreationDate": "TIMESTAMP",
+            "ModificationDate": "TIMESTAMP",
+        },
+    }
+
+    def __init__(self, query, batch_size: int = 10000):
+        """Sets up the export of a document
+
+        Args:
+            query (PDDocumentQuery): Query of the document to export
+            batch_size (int, optional): Number of rows written to a file at a time. Defaults to 10000.
+        """
+        self.query = query
+        self.batch_size = batch_size
+
+    def iter_rows(self, name_table: str):
+        """Generates the rows of an MDDE table
+
+        Args:
+            name_table (str): 'Model', 'Entity' or 'Attribute'
+
+        Returns:
+            generator: Rows of the table
+        """
+        dict_generators = {
+            "Model": self.query.iter_MDDE_model,
+            "Entity": self.query.iter_MDDE_entity,
+            "Attribute": self.query.iter_MDDE_attribute,
+        }
+        return dict_generators[name_table]()
+
+    def to_csv(self, folder_output: str = "output/mdde") -> dict:
+        """Writes each MDDE table to '<folder_output>/<table>.csv'
+
+        Args:
+            folder_output (str, optional): Directory of the files. Defaults to "output/mdde".
+
+        Returns:
+            dict: Number of rows per table
+        """
+        folder = Path(folder_output)
+        folder.mkdir(parents=True, exist_ok=True)
+        dict_counts = {}
+        for name_table, dict_columns in self.DICT_SCHEMAS.items():
+            with tracer.span(name_table, category="export", format="csv"):
+                with open(folder / f"{name_table}.csv", "w", encoding="utf-8", newline="") as file:
+                    writer = csv.DictWriter(file, fieldnames=list(dict_columns), extrasaction="ignore")
+                    writer.writeheader()
+                    dict_counts[name_table] = 0
+                    for lst_batch in self.__batches(self.iter_rows(name_table)):
+                        writer.writerows(lst_batch)
+                        dict_counts[name_table] += len(lst_batch)
+        logger.info(f"MDDE tables are written to '{folder}' as CSV: {dict_counts}")
+        return dict_counts
+
+    def to_parquet(self, folder_output: str = "output/mdde") -> dict:
+        """Writes each MDDE table to '<folder_output>/<table>.parquet'
+
+        Args:
+            folder_output (str, optional): Directory of the files. Defaults to "output/mdde".
+
+        Returns:
+            dict: Number of rows per table
+        """
+        # Imported on first use, only the Parquet and DuckDB exports need DuckDB
+        import duckdb
+
+        folder = Path(folder_output)
+        folder.mkdir(parents=True, exist_ok=True)
+        dict_counts = {}
+        with duckdb.connect() as con:
+            for name_table in self.DICT_SCHEMAS:
+                with tracer.span(name_table, category="export", format="parquet"):
+                    file_parquet = self.__sql_path(folder / f"{name_table}.parquet")
+                    dict_counts[name_table] = self.__load(
+                        con=con,
+                        name_table=name_table,
+                        folder_staging=folder,
+                        statement=f"COPY ({{select}}) TO '{file_parquet}' (FORMAT PARQUET)",
+                    )
+        logger.info(f"MDDE tables are written to '{folder}' as Parquet: {dict_counts}")
+        return dict_counts
+
+    def to_duckdb(self, database: str = "output/mdde.duckdb", replace: bool = True) -> dict:
+        """Loads the MDDE tables into a DuckDB database, each with one INSERT
+
+        Args:
+            database (str, optional): DuckDB database file. Defaults to "output/mdde.duckdb".
+            replace (bool, optional): Replace the tables' rows, otherwise the rows are appended. Defaults to True.
+
+        Returns:
+            dict: Number of rows per table
+        """
+        import duckdb
+
+        folder = Path(database).parent
+        folder.mkdir(parents=True, exist_ok=True)
+        dict_counts = {}
+        with duckdb.connect(database) as con:
+            for name_table, dict_columns in self.DICT_SCHEMAS.items():
+                columns = ", ".join(f'"{name}" {type}' for name, type in dict_columns.items())
+                con.execute(f'CREATE TABLE IF NOT EXISTS "{name_table}" ({columns})')
+                if replace:
+                    con.execute(f'DELETE FROM "{name_table}"')
+                with tracer.span(name_table, category="export", format="duckdb"):
+                    dict_counts[name_table] = self.__load(
+                        con=con,
+                        name_table=name_table,
+                        folder_staging=folder,
+                        statement=f'INSERT INTO "{name_table}" {{select}}',
+                    )
+        logger.info(f"MDDE tables are loaded into '{database}': {dict_counts}")
+        return dict_counts
+
+    def __load(self, con, name_table: str, folder_staging: Path, statement: str) -> int:
+        """Stages the rows of a table as newline delimited JSON and loads them with one statement
+
+        Args:
+            con (duckdb.DuckDBPyConnection): Connection that executes the statement
+            name_table (str): Name of the MDDE table
+            folder_staging (Path): Directory for the staging file
+            statement (str): SQL statement with '{select}' where the query on the staging file goes
+
+        Returns:
+            int: Number of rows loaded
+        """
+        dict_columns = self.DICT_SCHEMAS[name_table]
+        file_staging = folder_staging / f"{name_table}.jsonl"
+        encoder = json.JSONEncoder(separators=(",", ":"), default=str)
+        count_rows = 0
+        try:
+            with open(file_staging, "w", encoding="utf-8") as file:
+                for lst_batch in self.__batches(self.iter_rows(name_table)):
+                    file.writelines(
+                        encoder.encode({name: row.get(name) for name in dict_columns}) + "\n"
+                        for row in lst_batch
+                    )
+                    count_rows += len(lst_batch)
+            columns = ", ".join(f"'{name}': '{type}'" for name, type in dict_columns.items())
+            select = (
+                f"SELECT * FROM read_json('{self.__sql_path(file_staging)}', "
+                f"format = 'newline_delimited', columns = {{{columns}}})"
+            )
+            con.execute(statement.replace("{select}", select))
+        finally:
+            file_staging.unlink(missing_ok=True)
+        return count_rows
+
+    def __batches(self, rows):
+        """Splits generated rows in lists of at most batch_size rows"""
+        while lst_batch := list(islice(rows, self.batch_size)):
+            yield lst_batch
+
+    def __sql_path(self, path: Path) -> str:
+        """Path as a SQL string literal content"""
+        return path.as_posix().replace("'", "''")
@@ -0,0 +1,62 @@
+{% set format = "ff_" ~ item.FileFormat %}
+{% set columns %}
+{% for column in item.Columns %}
+    [{{column.Code}}] {{(column.TargetDataType | default({}))[implementation] | default("NVARCHAR(4000)")}}
+    {%- if not loop.last -%}
+        ,
+    {% endif %}
+{% endfor %}
+
+{% endset %}
+IF NOT EXISTS (SELECT * FROM sys.external_file_formats WHERE name = '{{format}}')
+{% if item.FileFormat == "csv" %}
+    CREATE EXTERNAL FILE FORMAT [{{format}}]
+    WITH (FORMAT_TYPE = DELIMITEDTEXT, FORMAT_OPTIONS (FIELD_TERMINATOR = ',', STRING_DELIMITER = '"', FIRST_ROW = 2, USE_TYPE_DEFAULT = FALSE));
+{% else %}
+    CREATE EXTERNAL FILE FORMAT [{{format}}]
+    WITH (FORMAT_TYPE = PARQUET, DATA_COMPRESSION = 'org.apache.hadoop.io.compress.SnappyCodec');
+{% endif %}
+
+IF NOT EXISTS (SELECT * FROM sys.external_data_sources WHERE name = '{{item.DataSource.Name}}')
+    CREATE EXTERNAL DATA SOURCE [{{item.DataSource.Name}}]
+    WITH (LOCATION = '{{item.DataSource.Location}}', TYPE = HADOOP);
+
+CREATE EXTERNAL TABLE [{{item.Schema}}].[EXT_{{item.Code}}]
+(
+{{columns}}
+)
+WITH
+(
+    LOCATION = '{{item.Path}}',
+    DATA_SOURCE = [{{item.DataSource.Name}}],
+    FILE_FORMAT = [{{format}}]
+);
+
+-- Landing table: round robin heap, loads don't hash or sort rows
+CREATE TABLE [{{item.Schema}}].[{{item.Code}}]
+(
+{{columns}}
+)
+WITH
+(
+    DISTRIBUTION = {{item.Distribution}},
+    {{item.Index}}
+);
+
+-- COPY INTO loads the files in parallel: deliver a load as a multiple of {{item.FileSplit}} files
+COPY INTO [{{item.Schema}}].[{{item.Code}}]
+({% for column in item.Columns %}[{{column.Code}}]{% if not loop.last %}, {% endif %}{% endfor %})
+FROM '{{item.Location}}/*.{{item.FileFormat}}'
+WITH
+(
+{% if item.FileFormat == "csv" %}
+    FILE_TYPE = 'CSV',
+    FIELDTERMINATOR = ',',
+    FIELDQUOTE = '"',
+    FIRSTROW = 2,
+{% else %}
+    FILE_TYPE = 'PARQUET',
+    COMPRESSION = 'Snappy',
+{% endif %}
+    CREDENTIAL = (IDENTITY = 'Managed Identity')
+);
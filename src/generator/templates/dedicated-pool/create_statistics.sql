@@ -0,0 +1,6 @@
+{% for statistic in item.Statistics %}
+CREATE STATISTICS [{{statistic.Name}}] ON [{{item.Schema}}].[{{item.Code}}] ({% for column in statistic.Columns %}[{{column.Name}}]{% if not loop.last %}, {% endif %}{% endfor %});
+{% endfor %}
+{% for index in item.Indexes %}
+CREATE NONCLUSTERED INDEX [{{index.Name}}] ON [{{item.Schema}}].[{{item.Code}}] ({% for column in index.Columns %}[{{column.Name}}]{% if not loop.last %}, {% endif %}{% endfor %});
+{% endfor %}
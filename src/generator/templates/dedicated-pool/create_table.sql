@@ -1,36 +1,25 @@
+{% set design = item.PhysicalDesign | default({"Distribution": "ROUND_ROBIN", "Index": "HEAP"}) %}
 CREATE TABLE [{{item.Schema}}].[{{item.Code}}]
 (
 {% for column in item.Columns %}
-    [{{column.Name}}] {{column.DataType}}
+    [{{column.Name}}] {{(column.TargetDataType | default({}))[implementation] | default(column.DataType)}}
     {%- if not loop.last -%}
         ,
     {% endif %}
 {% endfor %}
 
 )
-{% if item.Rowcount|int < 10000000 %}
 WITH
 (
-    DISTRIBUTION = ROUND_ROBIN,
-    HEAP
-)
-;
+{% if design.Distribution == "HASH" %}
+    DISTRIBUTION = HASH([{{design.HashColumn}}]),
+{% else %}
+    DISTRIBUTION = {{design.Distribution}},
 {% endif %}
-                            
-{% if item.Rowcount|int >= 10000000 and item.Rowcount|int < 60000000 %}
-WITH
-(
-    DISTRIBUTION = ROUND_ROBIN,
-    CLUSTERED COLUMNSTORE INDEX
-)
-;
+{% if design.Index == "CLUSTERED INDEX" %}
+    CLUSTERED INDEX ({% for column in design.IndexColumns %}[{{column}}]{% if not loop.last %}, {% endif %}{% endfor %})
+{% else %}
+    {{design.Index}}
 {% endif %}
-
-{% if item.Rowcount|int >= 60000000 %}
-WITH
-(
-    DISTRIBUTION = HASH([" & "'" & idcolumnname & "'" & "],
-    CLUSTERED COLUMNSTORE INDEX
 )
 ;
-{% endif %}
\ No newline at end of file
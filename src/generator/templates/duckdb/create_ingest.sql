@@ -0,0 +1,24 @@
+{% set files = item.Location ~ "/*." ~ item.FileFormat %}
+{% if item.FileFormat == "csv" %}
+{% set reader = "read_csv('" ~ files ~ "', header = true, union_by_name = true)" %}
+{% else %}
+{% set reader = "read_parquet('" ~ files ~ "', union_by_name = true)" %}
+{% endif %}
+CREATE OR REPLACE VIEW {{item.Schema}}.EXT_{{item.Code}} AS
+SELECT {% for column in item.Columns %}{{column.Code}}{% if not loop.last %}, {% endif %}{% endfor %}
+
+FROM {{reader}};
+
+CREATE TABLE IF NOT EXISTS {{item.Schema}}.{{item.Code}}
+(
+{% for column in item.Columns %}
+    {{column.Code}} {{(column.TargetDataType | default({}))[implementation] | default("VARCHAR")}}
+    {%- if not loop.last -%}
+        ,
+    {% endif %}
+{% endfor %}
+
+);
+
+-- COPY reads the files in parallel, per file and row group: deliver large loads as several files
+COPY {{item.Schema}}.{{item.Code}} FROM '{{files}}' ({% if item.FileFormat == "csv" %}FORMAT CSV, HEADER{% else %}FORMAT PARQUET{% endif %});
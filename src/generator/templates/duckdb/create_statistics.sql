@@ -0,0 +1,7 @@
+{# DuckDB keeps statistics of all columns itself, ANALYZE refreshes the distinct counts the join order is based on #}
+{% for index in item.Indexes %}
+CREATE INDEX IF NOT EXISTS {{index.Name}} ON {{item.Schema}}.{{item.Code}} ({% for column in index.Columns %}{{column.Code}}{% if not loop.last %}, {% endif %}{% endfor %});
+{% endfor %}
+{% if item.Statistics | length > 0 %}
+ANALYZE {{item.Schema}}.{{item.Code}};
+{% endif %}
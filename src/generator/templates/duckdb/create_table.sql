@@ -1,9 +1,10 @@
-CREATE TABLE {{schema.name}}.{{table.name}}
+CREATE TABLE {{item.Schema}}.{{item.Code}}
 (
-{% for column in columns %}
-    {{column.name}} {{column.data_type}} {% if column.nullable %} NULL {% else %} NOT NULL {% endif %}
+{% for column in item.Columns %}
+    {{column.Code}} {{(column.TargetDataType | default({}))[implementation] | default(column.DataType)}}{% if column["Column.Mandatory"] == "1" %} NOT NULL{% endif %}
     {%- if not loop.last -%}
         ,
     {% endif %}
 {% endfor %}
-);
\ No newline at end of file
+
+);
@@ -1,6 +1,3 @@
-import logging.config
-
-
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -29,5 +26,20 @@ LOGGING = {
 }
 
 
-logging.config.dictConfig(LOGGING)
+_is_configured = False
+
+
+def setup_logging():
+    """Configures logging for the application, intended to be called once by entry points
+
+    Importing this module has no side effects, so modules can import it without opening 'log.json'.
+    Calling this function more than once is harmless: only the first call configures the handlers.
+    """
+    global _is_configured
+    if _is_configured:
+        return
+    import logging.config
+
+    logging.config.dictConfig(LOGGING)
+    _is_configured = True
 
@@ -0,0 +1,217 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class _NoSpan:
+    """Stand-in for a span when tracing is disabled, so instrumented code pays almost nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def add(self, **args):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Span:
+    """A single timed region of work that is recorded as a Chrome trace 'complete' event"""
+
+    __slots__ = ("tracer", "name", "category", "args", "ts_start")
+
+    def __init__(self, tracer, name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.ts_start = 0
+
+    def __enter__(self):
+        self.ts_start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        ts_end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["Error"] = exc_type.__name__
+        self.tracer.record(
+            name=self.name,
+            category=self.category,
+            ts_start=self.ts_start,
+            ts_end=ts_end,
+            args=self.args,
+        )
+        return False
+
+    def add(self, **args):
+        """Adds arguments to the span that are only known after it started (counts, sizes)"""
+        self.args.update(args)
+
+
+class Tracer:
+    """Collects spans of extraction and rendering work and writes them as a Chrome/Perfetto trace-event file
+
+    The trace can be opened in chrome://tracing or https://ui.perfetto.dev. Each process and thread gets its
+    own track, so parallel workers, stragglers and I/O stalls are visible on one timeline.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lst_events = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts recording spans"""
+        self.enabled = True
+
+    def stop(self):
+        """Stops recording spans, already recorded spans are kept until written"""
+        self.enabled = False
+
+    def span(self, name: str, category: str = "", **args):
+        """Creates a context manager that times the code within it
+
+        Args:
+            name (str): Name shown on the span in the timeline
+            category (str): Category of the span, e.g. 'document', 'stage', 'mapping' or 'render'
+            **args: Extra information shown when selecting the span
+
+        Returns:
+            Span: The span, or a no-op stand-in when tracing is disabled
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return Span(self, name=name, category=category, args=args)
+
+    def traced(self, category: str = ""):
+        """Decorator that records a span for every call of the decorated function
+
+        Args:
+            category (str): Category of the spans
+
+        Returns:
+            Callable: The decorator
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, name=func.__qualname__, category=category, args={}):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, name: str, category: str, ts_start: int, ts_end: int, args: dict):
+        """Stores a finished span as a trace event
+
+        Args:
+            name (str): Name of the span
+            category (str): Category of the span
+            ts_start (int): Start in nanoseconds of the performance counter
+            ts_end (int): End in nanoseconds of the performance counter
+            args (dict): Extra information on the span
+        """
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": ts_start / 1000,
+            "dur": (ts_end - ts_start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": args,
+        }
+        with self._lock:
+            self._lst_events.append(event)
+
+    def drain(self) -> list:
+        """Removes and returns the events recorded by the current process
+
+        Worker processes use this to send their events back to the parent process, which adds them
+        with 'extend'. Events inherited from a forked parent are left alone.
+
+        Returns:
+            list: Trace events of this process
+        """
+        pid = os.getpid()
+        with self._lock:
+            lst_own = [event for event in self._lst_events if event["pid"] == pid]
+            self._lst_events = [event for event in self._lst_events if event["pid"] != pid]
+        return lst_own
+
+    def extend(self, lst_events: list):
+        """Adds events recorded elsewhere (e.g. in a worker process)
+
+        Args:
+            lst_events (list): Trace events
+        """
+        with self._lock:
+            self._lst_events.extend(lst_events)
+
+    def init_worker(self, enabled: bool):
+        """Initializer for worker processes so they trace when the parent process does
+
+        Args:
+            enabled (bool): Whether the parent process is tracing
+        """
+        self.enabled = enabled
+        # Events copied from a forked parent process are sent by the parent itself
+        with self._lock:
+            self._lst_events = []
+
+    def __reduce__(self):
+        # Pickled as the module's tracer, so its methods can be the initializers of spawned worker processes
+        return "tracer"
+
+    def _after_fork(self):
+        """Gives a forked child process a new lock, the parent's lock may have been held by one of its other threads"""
+        self._lock = threading.Lock()
+
+    def write(self, file_trace: str):
+        """Writes all recorded events to a trace-event JSON file
+
+        Args:
+            file_trace (str): Path of the trace file
+        """
+        with self._lock:
+            lst_events = list(self._lst_events)
+        lst_metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "main" if pid == os.getpid() else f"worker {pid}"},
+            }
+            for pid in sorted({event["pid"] for event in lst_events})
+        ]
+        path = Path(file_trace)
+        Path(path.parent).mkdir(parents=True, exist_ok=True)
+        with open(file_trace, "w", encoding="utf-8") as file:
+            json.dump(
+                {"traceEvents": lst_metadata + lst_events, "displayTimeUnit": "ms"},
+                file,
+                default=str,
+            )
+        logger.info(f"Trace with {len(lst_events)} spans is written to '{file_trace}'")
+
+
+tracer = Tracer()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=tracer._after_fork)
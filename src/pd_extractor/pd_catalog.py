@@ -0,0 +1,392 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.log_config.tracing import tracer
+
+if TYPE_CHECKING:
+    # Only for annotations, pd_documents imports the catalog
+    from pd_documents import PDDocument
+
+logger = logging.getLogger(__name__)
+
+
+class ModelCatalog:
+    """The models of all Power Designer documents in a folder, with shortcuts resolved across the documents
+
+    A document refers to entities of other documents with shortcuts: stubs in its external models with only the
+    entity's name, code and TargetID. The catalog replaces each stub by the entity of the document that owns it (the
+    entity whose ObjectID is the TargetID), so an entity and its attributes are held once in memory, whichever
+    document refers to it, and lineage can be followed from one document into the other.
+
+    The catalog remembers the modification time and size of every document; refresh() only extracts the documents
+    that were added or changed and points the shortcuts to the entities of the changed documents again.
+
+    When the documents are streamed (like in a PDDocuments run), index_targets() only keeps the entities shortcuts
+    refer to, and each document's shortcuts are resolved with resolve_document() when it comes by.
+
+    Example:
+        catalog = ModelCatalog(folder_pd="input")
+        entity = catalog.find("22222222-0000-0000-0000-000000000010")
+        catalog.refresh()
+    """
+
+    def __init__(self, folder_pd: str = None, include_mappings: bool = True, workers: int = None):
+        """Loads all documents of the folder
+
+        Args:
+            folder_pd (str, optional): Folder with Power Designer documents (.ldm, .pdm). Without a folder the
+                catalog starts empty, e.g. to index the shortcut targets of a folder with index_targets().
+            include_mappings (bool, optional): Whether the documents' mappings are extracted. Defaults to True.
+            workers (int, optional): Number of worker processes that extract documents. Defaults to the number of
+                CPU's.
+        """
+        self.folder_pd = None if folder_pd is None else Path(folder_pd)
+        self.include_mappings = include_mappings
+        self.workers = workers or os.cpu_count() or 1
+        # File name as key, the extracted document as value
+        self.dict_documents = {}
+        # File name as key, (modification time, size) of the file when it was loaded as value
+        self.dict_signatures = {}
+        # ObjectID as key, (file name, entity or attribute) of the object's owning document as value
+        self.dict_objects = {}
+        # File name as key, list of (entities of an external model, position, TargetID) of the shortcuts as value
+        self.dict_shortcuts = {}
+        # File name as key, a dict with the document's Id of shortcut entities and attributes as key and their
+        # TargetID as value, for following the document's mappings into other documents
+        self.dict_targets = {}
+        if self.folder_pd is not None:
+            self.refresh()
+
+    def index_targets(self, folder_pd: str, lst_collectors: list = None) -> int:
+        """Indexes the entities the shortcuts of a folder's documents refer to, without keeping the documents
+
+        A pass before the documents are streamed: only the entities and external models of the logical models are
+        extracted (they own the entities and hold the shortcuts), and a worker only sends back the entities and the
+        TargetIDs of the shortcuts. The entities no shortcut refers to are dropped at the end.
+
+        Collectors get the joins of the logical models' relationships and mappings, which are in other documents
+        than the tables of the physical models they count for. Relationships and mappings are only extracted when
+        collectors are given; a worker sends back only what's joined on, and it's dropped once it's collected.
+
+        Args:
+            folder_pd (str): Folder with Power Designer documents
+            lst_collectors (list, optional): Objects with add_models and add_mappings, like JoinStatistics
+
+        Returns:
+            int: Number of indexed entities
+        """
+        lst_collectors = lst_collectors or []
+        lst_files = sorted(Path(folder_pd).glob("*.ldm"))
+        set_targets = set()
+        with tracer.span("Catalog index", category="stage", documents=len(lst_files)):
+            iter_targets = self.__map(
+                partial(ModelCatalog._targets, joins=len(lst_collectors) > 0), lst_files
+            )
+            for file_pd, targets in zip(lst_files, iter_targets):
+                if targets is None:
+                    continue
+                lst_entities, lst_target_ids, lst_models, lst_mappings = targets
+                for collector in lst_collectors:
+                    collector.add_models(lst_models=lst_models)
+                    collector.add_mappings(lst_mappings=lst_mappings)
+                for entity in lst_entities:
+                    self.__index(file_pd.name, entity)
+                    for attribute in entity.get("Attributes", []):
+                        self.__index(file_pd.name, attribute)
+                set_targets.update(lst_target_ids)
+            set_keep = set()
+            for target_id in set_targets:
+                if target_id not in self.dict_objects:
+                    continue
+                set_keep.add(target_id)
+                set_keep.update(
+                    attribute["ObjectID"]
+                    for attribute in self.dict_objects[target_id][1].get("Attributes", [])
+                    if "ObjectID" in attribute
+                )
+            self.dict_objects = {
+                object_id: item for object_id, item in self.dict_objects.items() if object_id in set_keep
+            }
+        count_entities = len(set_targets & set_keep)
+        logger.info(
+            f"Indexed {count_entities} entities shortcuts refer to, {len(set_targets) - count_entities} are outside "
+            f"'{folder_pd}'"
+        )
+        return count_entities
+
+    def resolve_document(self, document: "PDDocument") -> int:
+        """Replaces the shortcut stubs of a document by the entities they refer to, the document isn't added
+
+        Args:
+            document (PDDocument): Extracted document
+
+        Returns:
+            int: Number of resolved shortcuts
+        """
+        count_resolved = 0
+        for model in document.lst_models:
+            if model.get("IsDocumentModel", True):
+                continue
+            lst_entities = model.get("Entities", [])
+            for position, entity in enumerate(lst_entities):
+                if entity.get("TargetID") in self.dict_objects:
+                    lst_entities[position] = self.dict_objects[entity["TargetID"]][1]
+                    count_resolved += 1
+        return count_resolved
+
+    def refresh(self) -> dict:
+        """Extracts the documents that were added or changed since the last load and forgets removed documents
+
+        Returns:
+            dict: Names of the files that were 'Added', 'Changed' and 'Removed'
+        """
+        if self.folder_pd is None:
+            return {"Added": [], "Changed": [], "Removed": []}
+        dict_files = {file.name: file for file in sorted(self.folder_pd.glob("*.*dm"))}
+        dict_changes = {"Added": [], "Changed": [], "Removed": []}
+        for name_file in list(self.dict_documents):
+            if name_file not in dict_files:
+                dict_changes["Removed"].append(name_file)
+        lst_load = []
+        for name_file, file_pd in dict_files.items():
+            signature = self.__signature(file_pd)
+            if name_file not in self.dict_signatures:
+                dict_changes["Added"].append(name_file)
+            elif self.dict_signatures[name_file] != signature:
+                dict_changes["Changed"].append(name_file)
+            else:
+                continue
+            self.dict_signatures[name_file] = signature
+            lst_load.append(file_pd)
+        if len(lst_load) == 0 and len(dict_changes["Removed"]) == 0:
+            return dict_changes
+        with tracer.span("Catalog refresh", category="stage", documents=len(lst_load)):
+            for name_file in dict_changes["Removed"] + dict_changes["Changed"]:
+                self.__forget(name_file)
+            for name_file in dict_changes["Removed"]:
+                self.dict_signatures.pop(name_file)
+            iter_documents = self.__map(
+                partial(ModelCatalog._load, include_mappings=self.include_mappings), lst_load
+            )
+            for file_pd, document in zip(lst_load, iter_documents):
+                name_file = file_pd.name
+                if document is None:
+                    # Tried again on the next refresh
+                    self.dict_signatures.pop(name_file)
+                    continue
+                self.dict_documents[name_file] = document
+                self.__register(name_file, document)
+            # Shortcuts of all documents are resolved again, they can refer to the changed documents
+            self.__resolve_shortcuts()
+        logger.info(f"Catalog of '{self.folder_pd}' is refreshed: {dict_changes}")
+        return dict_changes
+
+    def find(self, object_id: str) -> dict:
+        """Looks up an entity or attribute in the document that owns it
+
+        Args:
+            object_id (str): ObjectID of the entity or attribute, which is the TargetID of its shortcuts
+
+        Returns:
+            dict: The entity or attribute, None when no document of the catalog owns it
+        """
+        if object_id not in self.dict_objects:
+            return None
+        return self.dict_objects[object_id][1]
+
+    def owner(self, object_id: str) -> str:
+        """The file name of the document that owns an entity or attribute
+
+        Args:
+            object_id (str): ObjectID of the entity or attribute
+
+        Returns:
+            str: File name of the document, None when no document of the catalog owns it
+        """
+        if object_id not in self.dict_objects:
+            return None
+        return self.dict_objects[object_id][0]
+
+    def resolve(self, name_file: str, id: str) -> dict:
+        """Looks up the entity or attribute a shortcut of a document refers to, e.g. the source of a mapping
+
+        Args:
+            name_file (str): File name of the document with the shortcut
+            id (str): The document's Id of the shortcut entity or attribute, e.g. 'o31'
+
+        Returns:
+            dict: The entity or attribute in its own document, None when it isn't a shortcut to a document of the
+                catalog
+        """
+        target_id = self.dict_targets.get(name_file, {}).get(id)
+        return None if target_id is None else self.find(target_id)
+
+    def models(self) -> list:
+        """All models of all documents, the external models contain the resolved entities
+
+        Returns:
+            list: The extracted models
+        """
+        return [model for document in self.dict_documents.values() for model in document.lst_models]
+
+    def unresolved(self) -> list:
+        """The shortcuts whose entity isn't owned by any document of the catalog
+
+        Returns:
+            list: Dicts with the document's file name, the shortcut's Code and its TargetID
+        """
+        return [
+            {"Document": name_file, "Code": lst_entities[position].get("Code"), "TargetID": target_id}
+            for name_file, lst_shortcuts in self.dict_shortcuts.items()
+            for lst_entities, position, target_id in lst_shortcuts
+            if target_id not in self.dict_objects
+        ]
+
+    def __signature(self, file_pd: Path) -> tuple:
+        stat = file_pd.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def __map(self, function, lst_files: list):
+        """Applies a function to documents, in worker processes when there's more than one document
+
+        Yields:
+            The results in the order of the documents, each is released by the catalog once it's processed
+        """
+        workers = min(self.workers, len(lst_files))
+        if workers <= 1:
+            for file_pd in lst_files:
+                yield function(file_pd)
+            return
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            # Not forked: the catalog can be refreshed while other threads (like a pipeline's) are running
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=tracer.init_worker,
+            initargs=(tracer.enabled,),
+        ) as executor:
+            for result, lst_events in executor.map(partial(ModelCatalog._in_worker, function), lst_files):
+                tracer.extend(lst_events)
+                yield result
+
+    @staticmethod
+    def _in_worker(function, file_pd: Path) -> tuple:
+        """Applies a function to a document in a worker process
+
+        Returns:
+            tuple: The result and the trace events of the worker
+        """
+        return function(file_pd), tracer.drain()
+
+    @staticmethod
+    def _load(file_pd: Path, include_mappings: bool) -> "PDDocument":
+        """Extracts a document, None when it fails"""
+        # Imported here, pd_documents uses the catalog to resolve the shortcuts of the documents it renders
+        from pd_documents import PDDocument
+
+        try:
+            return PDDocument(file_pd, include_mappings=include_mappings)
+        except Exception as e:
+            logger.error(f"Document '{file_pd}' can't be loaded in the catalog: {e!r}")
+            return None
+
+    @staticmethod
+    def _targets(file_pd: Path, joins: bool = False) -> tuple:
+        """Extracts the entities a logical model owns and the TargetIDs of its shortcuts, None when it fails
+
+        With joins, the models' relationships and the join conditions of the mappings are extracted as well.
+        """
+        from pd_documents import PDDocument
+
+        types = ["Entities", "ModelsExternal"] + (["Relationships"] if joins else [])
+        try:
+            document = PDDocument(file_pd, types=types, include_mappings=joins)
+        except Exception as e:
+            logger.error(f"Document '{file_pd}' can't be indexed in the catalog: {e!r}")
+            return None
+        lst_entities = []
+        lst_target_ids = []
+        lst_models = []
+        for model in document.lst_models:
+            if model.get("IsDocumentModel", True):
+                lst_entities.extend(model.get("Entities", []))
+                if len(model.get("Relationships", [])) > 0:
+                    lst_models.append({"Relationships": model["Relationships"]})
+            else:
+                lst_target_ids.extend(
+                    entity["TargetID"] for entity in model.get("Entities", []) if "TargetID" in entity
+                )
+        lst_mappings = [
+            {
+                "Code": mapping["Code"],
+                "Compositions": [
+                    {"JoinConditions": composition.get("JoinConditions", [])}
+                    for composition in mapping.get("Compositions", [])
+                ],
+            }
+            for mapping in document.lst_mappings
+        ]
+        return lst_entities, lst_target_ids, lst_models, lst_mappings
+
+    def __register(self, name_file: str, document: "PDDocument"):
+        """Adds the entities and attributes a document owns to the index and records its shortcuts"""
+        lst_shortcuts = []
+        for model in document.lst_models:
+            lst_entities = model.get("Entities", [])
+            if model.get("IsDocumentModel", True):
+                for entity in lst_entities:
+                    self.__index(name_file, entity)
+                    for attribute in entity.get("Attributes", []):
+                        self.__index(name_file, attribute)
+            else:
+                lst_shortcuts.extend(
+                    (lst_entities, position, entity["TargetID"])
+                    for position, entity in enumerate(lst_entities)
+                    if "TargetID" in entity
+                )
+        dict_targets = {}
+        for lst_entities, position, target_id in lst_shortcuts:
+            entity = lst_entities[position]
+            dict_targets[entity["Id"]] = target_id
+            for attribute in entity.get("Attributes", []):
+                if "TargetID" in attribute:
+                    dict_targets[attribute["Id"]] = attribute["TargetID"]
+        self.dict_shortcuts[name_file] = lst_shortcuts
+        self.dict_targets[name_file] = dict_targets
+
+    def __index(self, name_file: str, obj: dict):
+        if "ObjectID" not in obj:
+            return
+        if obj["ObjectID"] in self.dict_objects and self.dict_objects[obj["ObjectID"]][0] != name_file:
+            logger.warning(
+                f"'{obj.get('Code')}' ({obj['ObjectID']}) is in '{self.dict_objects[obj['ObjectID']][0]}' "
+                f"and '{name_file}', the one of '{name_file}' is used"
+            )
+        self.dict_objects[obj["ObjectID"]] = (name_file, obj)
+
+    def __forget(self, name_file: str):
+        """Removes a document with the objects it owns; shortcuts to them keep the last known entity"""
+        self.dict_documents.pop(name_file, None)
+        self.dict_shortcuts.pop(name_file, None)
+        self.dict_targets.pop(name_file, None)
+        for object_id in [
+            object_id for object_id, (owner, _) in self.dict_objects.items() if owner == name_file
+        ]:
+            del self.dict_objects[object_id]
+
+    def __resolve_shortcuts(self):
+        """Replaces shortcut stubs by the entities of the documents that own them"""
+        count_resolved = 0
+        for lst_shortcuts in self.dict_shortcuts.values():
+            for lst_entities, position, target_id in lst_shortcuts:
+                if target_id in self.dict_objects:
+                    lst_entities[position] = self.dict_objects[target_id][1]
+                    count_resolved += 1
+        lst_unresolved = self.unresolved()
+        logger.debug(
+            f"Resolved {count_resolved} shortcuts, {len(lst_unresolved)} refer to documents outside the catalog"
+        )
@@ -0,0 +1,246 @@
+import logging
+from pathlib import Path
+
+from src.log_config.tracing import tracer
+from pd_json_writer import DocumentEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogExport:
+    """Exports the tables, columns, domains, views and procedures of physical models as Parquet files
+
+    Each kind of object gets its own directory with a Parquet file per document, so exporting a document again only
+    replaces that document's files. The schema of the files is fixed (see DICT_SCHEMAS), also for documents without
+    objects of a kind, so all files of a kind can be queried together with DuckDB:
+
+        SELECT DataType, COUNT(*) FROM read_parquet('output/catalog/columns/*.parquet') GROUP BY DataType
+    """
+
+    DICT_SCHEMAS = {
+        "tables": {
+            "Document": "VARCHAR",
+            "ModelCode": "VARCHAR",
+            "Id": "VARCHAR",
+            "ObjectID": "VARCHAR",
+            "Name": "VARCHAR",
+            "Code": "VARCHAR",
+            "Rowcount": "BIGINT",
+            "ColumnCount": "INTEGER",
+            "CreationDate": "TIMESTAMP",
+            "Creator": "VARCHAR",
+            "ModificationDate": "TIMESTAMP",
+            "Modifier": "VARCHAR",
+        },
+        "columns": {
+            "Document": "VARCHAR",
+            "ModelCode": "VARCHAR",
+            "TableId": "VARCHAR",
+            "TableCode": "VARCHAR",
+            "Id": "VARCHAR",
+            "ObjectID": "VARCHAR",
+            "Name": "VARCHAR",
+            "Code": "VARCHAR",
+            "Order": "INTEGER",
+            "DataType": "VARCHAR",
+            "Length": "INTEGER",
+            "Precision": "INTEGER",
+            "IsMandatory": "BOOLEAN",
+            "DomainId": "VARCHAR",
+            "Comment": "VARCHAR",
+            "CreationDate": "TIMESTAMP",
+            "ModificationDate": "TIMESTAMP",
+        },
+        "domains": {
+            "Document": "VARCHAR",
+            "Id": "VARCHAR",
+            "Name": "VARCHAR",
+            "Code": "VARCHAR",
+            "DataType": "VARCHAR",
+            "Length": "INTEGER",
+            "Precision": "INTEGER",
+        },
+        "views": {
+            "Document": "VARCHAR",
+            "ModelCode": "VARCHAR",
+            "Id": "VARCHAR",
+            "ObjectID": "VARCHAR",
+            "Name": "VARCHAR",
+            "Code": "VARCHAR",
+            "SQLQuery": "VARCHAR",
+            "CreationDate": "TIMESTAMP",
+            "ModificationDate": "TIMESTAMP",
+        },
+        "procedures": {
+            "Document": "VARCHAR",
+            "ModelCode": "VARCHAR",
+            "Id": "VARCHAR",
+            "ObjectID": "VARCHAR",
+            "Name": "VARCHAR",
+            "Code": "VARCHAR",
+            "Schema": "VARCHAR",
+            "BeginScript": "VARCHAR",
+            "CreationDate": "TIMESTAMP",
+            "ModificationDate": "TIMESTAMP",
+        },
+    }
+
+    def __init__(self, folder_output: str = "output/catalog"):
+        """Sets the directory the Parquet files are written to
+
+        Args:
+            folder_output (str, optional): Directory of the catalog. Defaults to "output/catalog".
+        """
+        self.folder_output = Path(folder_output)
+
+    def export(self, name_document: str, lst_models: list) -> dict:
+        """Writes the objects of the physical models of a document, replacing an earlier export of the document
+
+        Args:
+            name_document (str): Name of the document, used for the file names, e.g. the file name without extension
+            lst_models (list): Extracted models of the document
+
+        Returns:
+            dict: Number of rows written per kind of object
+        """
+        # Imported on first use, only the catalog export needs DuckDB here
+        import duckdb
+
+        dict_rows = self.__rows(name_document=name_document, lst_models=lst_models)
+        dict_counts = {}
+        with tracer.span("Catalog export", category="stage", document=name_document):
+            with duckdb.connect() as con:
+                for kind, lst_rows in dict_rows.items():
+                    dict_counts[kind] = self.__write(
+                        con=con,
+                        kind=kind,
+                        name_document=name_document,
+                        lst_rows=lst_rows,
+                    )
+        logger.info(f"Catalog of '{name_document}' is written to '{self.folder_output}': {dict_counts}")
+        return dict_counts
+
+    def connect(self, database: str = ":memory:"):
+        """Opens a DuckDB connection with a view per kind of object over all exported documents
+
+        Args:
+            database (str, optional): DuckDB database to open. Defaults to an in-memory database.
+
+        Returns:
+            duckdb.DuckDBPyConnection: Connection with the views 'tables', 'columns', 'domains', 'views' and 'procedures'
+        """
+        import duckdb
+
+        con = duckdb.connect(database)
+        for kind in self.DICT_SCHEMAS:
+            folder_kind = self.folder_output / kind
+            if not any(folder_kind.glob("*.parquet")):
+                logger.warning(f"No exported {kind} found in '{folder_kind}'")
+                continue
+            con.execute(
+                f"CREATE OR REPLACE VIEW {kind} AS "
+                f"SELECT * FROM read_parquet('{self.__sql_path(folder_kind / '*.parquet')}')"
+            )
+        return con
+
+    def __write(self, con, kind: str, name_document: str, lst_rows: list) -> int:
+        """Writes the rows of a kind of object to the document's Parquet file
+
+        The rows are staged as newline delimited JSON and read by DuckDB with the fixed schema, which is far faster
+        than passing Python values to DuckDB one by one.
+
+        Args:
+            con (duckdb.DuckDBPyConnection): Connection used for the conversion
+            kind (str): Kind of object, a key of DICT_SCHEMAS
+            name_document (str): Name of the document
+            lst_rows (list): Rows with the values of the schema's columns
+
+        Returns:
+            int: Number of rows written
+        """
+        folder_kind = self.folder_output / kind
+        folder_kind.mkdir(parents=True, exist_ok=True)
+        file_parquet = folder_kind / f"{name_document}.parquet"
+        file_staging = folder_kind / f"{name_document}.jsonl"
+        encoder = DocumentEncoder(separators=(",", ":"))
+        with open(file_staging, "w", encoding="utf-8") as file:
+            for row in lst_rows:
+                file.write(encoder.encode(row))
+                file.write("\n")
+        columns = ", ".join(
+            f"'{name}': '{type}'" for name, type in self.DICT_SCHEMAS[kind].items()
+        )
+        try:
+            con.execute(
+                f"COPY (SELECT * FROM read_json('{self.__sql_path(file_staging)}', "
+                f"format = 'newline_delimited', columns = {{{columns}}})) "
+                f"TO '{self.__sql_path(file_parquet)}' (FORMAT PARQUET)"
+            )
+        finally:
+            file_staging.unlink()
+        return len(lst_rows)
+
+    def __sql_path(self, path: Path) -> str:
+        """Path as a SQL string literal content"""
+        return path.as_posix().replace("'", "''")
+
+    def __rows(self, name_document: str, lst_models: list) -> dict:
+        """Flattens the objects of the models into rows
+
+        Args:
+            name_document (str): Name of the document
+            lst_models (list): Extracted models of the document
+
+        Returns:
+            dict: Per kind of object a list of rows, each with the columns of the kind's schema
+        """
+        dict_rows = {kind: [] for kind in self.DICT_SCHEMAS}
+        dict_domains = {}
+        for model in lst_models:
+            dict_model = {"Document": name_document, "ModelCode": model.get("Code")}
+            for table in model.get("Tables", []):
+                lst_columns = table.get("Columns", [])
+                self.__append(
+                    dict_rows,
+                    "tables",
+                    {**table, **dict_model, "ColumnCount": len(lst_columns)},
+                )
+                for column in lst_columns:
+                    domain = column.get("Domain", {})
+                    if "Id" in domain:
+                        dict_domains[domain["Id"]] = domain
+                    row = {
+                        **column,
+                        **dict_model,
+                        "TableId": table["Id"],
+                        "TableCode": table["Code"],
+                        "Length": self.__integer(column.get("Length")),
+                        "Precision": self.__integer(column.get("Precision")),
+                        "IsMandatory": column.get("Column.Mandatory") == "1",
+                        "DomainId": domain.get("Id"),
+                    }
+                    self.__append(dict_rows, "columns", row)
+            for view in model.get("Views", []):
+                self.__append(dict_rows, "views", {**view, **dict_model})
+            for procedure in model.get("Procedures", []):
+                self.__append(dict_rows, "procedures", {**procedure, **dict_model})
+        for domain in dict_domains.values():
+            row = {
+                **domain,
+                "Document": name_document,
+                "Length": self.__integer(domain.get("Length")),
+                "Precision": self.__integer(domain.get("Precision")),
+            }
+            self.__append(dict_rows, "domains", row)
+        return dict_rows
+
+    def __append(self, dict_rows: dict, kind: str, row: dict):
+        """Adds a row with only the columns of the kind's schema, columns missing in the row get None"""
+        dict_rows[kind].append({name: row.get(name) for name in self.DICT_SCHEMAS[kind]})
+
+    def __integer(self, value) -> int:
+        """Converts Power Designer's textual numbers, None for values that are missing or not a number"""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,180 @@
+from functools import lru_cache
+import json
+import logging
+from pathlib import Path
+import re
+
+from src.log_config.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# SQL style types, like 'nvarchar(50)', 'decimal(18,2)' or 'nvarchar(max)'
+REGEX_TYPE_SQL = re.compile(
+    r"^\s*([A-Za-z][\w ]*?)\s*\(\s*(\d+|max)\s*(?:,\s*(\d+)\s*)?\)\s*$", re.IGNORECASE
+)
+# Power Designer logical types, like 'VA50', 'DC18,2' or 'I'
+REGEX_TYPE_PD = re.compile(r"^\s*([A-Za-z]+)(\d+)?(?:,(\d+))?\s*$")
+
+
+@lru_cache(maxsize=None)
+def parse_datatype(datatype: str) -> tuple:
+    """Splits a datatype into its base type, length and precision
+
+    Args:
+        datatype (str): Power Designer logical type (e.g. 'VA50', 'DC18,2') or SQL type (e.g. 'nvarchar(50)')
+
+    Returns:
+        tuple: Upper case base type, length and precision; length and precision are None when absent. A length of
+            'max' is returned as 'MAX'.
+    """
+    for regex in [REGEX_TYPE_SQL, REGEX_TYPE_PD]:
+        match = regex.match(datatype)
+        if match is not None:
+            base, length, precision = match.groups()
+            if length is not None:
+                length = "MAX" if length.lower() == "max" else int(length)
+            if precision is not None:
+                precision = int(precision)
+            return (base.upper(), length, precision)
+    return (datatype.strip().upper(), None, None)
+
+
+class DatatypeTranslator:
+    """Translates the datatypes of attributes and columns to the datatypes of the target implementations
+
+    Each implementation has a 'datatypes.json' in its template directory. Keys are either a complete datatype (e.g.
+    'VA50') or a base type (e.g. 'VA'), values are the target's datatype in which '{length}' and '{precision}' are
+    filled from the source datatype, e.g. "DC": "DECIMAL({length},{precision})". Complete datatypes take precedence
+    over base types. Datatypes without a translation are passed as they are.
+
+    A source datatype without a length leaves '({length})' out of the target's datatype. Where the target reads that
+    as a length of 1 (e.g. a bare VARCHAR on SQL Server), 'WithoutLength' in 'datatypes.json' gives the datatype for
+    base types without a length instead, e.g. "WithoutLength": {"VA": "VARCHAR(8000)"}.
+    """
+
+    # Key in 'datatypes.json' of the translations of base types without a length
+    KEY_WITHOUT_LENGTH = "WITHOUTLENGTH"
+
+    def __init__(self, dir_templates: str = "templates", implementations: list = None):
+        """Loads the datatype tables of the implementations
+
+        Args:
+            dir_templates (str, optional): Directory with a template directory per implementation. Defaults to "templates".
+            implementations (list, optional): Implementations to translate for. Defaults to all implementations
+                with a 'datatypes.json'.
+        """
+        self.dir_templates = Path(dir_templates)
+        if implementations is None:
+            implementations = sorted(
+                file.parent.name for file in self.dir_templates.glob("*/datatypes.json")
+            )
+        self.dict_tables = {
+            implementation: self.__load_table(implementation)
+            for implementation in implementations
+        }
+        # Translations of base types without a length per implementation, kept apart from the datatype table
+        self.dict_without_length = {
+            implementation: {
+                key.upper(): value for key, value in dict_table.pop(self.KEY_WITHOUT_LENGTH, {}).items()
+            }
+            for implementation, dict_table in self.dict_tables.items()
+        }
+        # Translations per implementation, each datatype is only translated once per run
+        self.dict_translated = {implementation: {} for implementation in implementations}
+
+    def __load_table(self, implementation: str) -> dict:
+        """Loads the datatype table of an implementation, with upper case keys
+
+        Args:
+            implementation (str): Name of the implementation, e.g. 'dedicated-pool'
+
+        Returns:
+            dict: Source datatypes or base types as key, target datatypes as value
+        """
+        file_datatypes = self.dir_templates / implementation / "datatypes.json"
+        if not file_datatypes.exists():
+            logger.warning(
+                f"No datatypes for '{implementation}' in '{file_datatypes}', datatypes are passed as they are"
+            )
+            return {}
+        with open(file_datatypes, encoding="utf-8") as file:
+            dict_table = json.load(file)
+        return {key.upper().replace(" ", ""): value for key, value in dict_table.items()}
+
+    def translate(self, datatype: str, implementation: str) -> str:
+        """Translates a datatype for an implementation
+
+        Args:
+            datatype (str): Source datatype, e.g. 'VA50' or 'nvarchar(50)'
+            implementation (str): Name of the implementation
+
+        Returns:
+            str: The implementation's datatype
+        """
+        dict_translated = self.dict_translated[implementation]
+        if datatype not in dict_translated:
+            dict_translated[datatype] = self.__translate(datatype, implementation)
+        return dict_translated[datatype]
+
+    def __translate(self, datatype: str, implementation: str) -> str:
+        """Looks up the datatype, or its base type, in the implementation's table and fills in length and precision"""
+        dict_table = self.dict_tables[implementation]
+        key = datatype.upper().replace(" ", "")
+        base, length, precision = parse_datatype(datatype)
+        dict_without_length = self.dict_without_length[implementation]
+        if length is None and base in dict_without_length:
+            return dict_without_length[base]
+        if key in dict_table:
+            pattern = dict_table[key]
+        elif base in dict_table:
+            pattern = dict_table[base]
+        else:
+            logger.warning(
+                f"No translation of datatype '{datatype}' for '{implementation}', it is used as is"
+            )
+            return datatype
+        # Leave out the parts of the pattern the source datatype has no value for
+        if precision is None:
+            pattern = pattern.replace(",{precision}", "")
+        if length is None:
+            pattern = re.sub(r"\(\{length\}[^)]*\)", "", pattern)
+        return pattern.format(length=length, precision=precision)
+
+    def translate_models(self, lst_models: list) -> int:
+        """Adds 'TargetDataType' to all attributes and columns of the models, with the datatype per implementation
+
+        The datatype of an attribute or column is its own, or else its domain's datatype.
+
+        Args:
+            lst_models (list): Extracted models
+
+        Returns:
+            int: Number of distinct datatypes translated
+        """
+        with tracer.span("Translate datatypes", category="stage"):
+            lst_items = []
+            for model in lst_models:
+                for entity in model.get("Entities", []):
+                    lst_items.extend(entity.get("Attributes", []))
+                for table in model.get("Tables", []):
+                    lst_items.extend(table.get("Columns", []))
+            lst_datatypes = [
+                item.get("DataType", item.get("Domain", {}).get("DataType"))
+                for item in lst_items
+            ]
+            # Translations are shared by all attributes and columns with the same datatype
+            dict_targets = {
+                datatype: {
+                    implementation: self.translate(datatype, implementation)
+                    for implementation in self.dict_tables
+                }
+                for datatype in set(lst_datatypes)
+                if datatype is not None
+            }
+            for item, datatype in zip(lst_items, lst_datatypes):
+                if datatype is not None:
+                    item["TargetDataType"] = dict_targets[datatype]
+        logger.debug(
+            f"Translated {len(dict_targets)} datatypes of {len(lst_items)} attributes and columns"
+        )
+        return len(dict_targets)
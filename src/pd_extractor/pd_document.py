@@ -1,15 +1,14 @@
 import datetime
 import json
+import logging
 from pathlib import Path
 import os
 import sys
 
-import xmltodict
-
 if __name__ == "__main__":
     sys.path.append(os.getcwd())
 
-from src.log_config.logging_config import logging
+from src.log_config.logging_config import setup_logging
 from pd_extractor import ObjectExtractor
 
 logger = logging.getLogger(__name__)
@@ -77,6 +76,8 @@ class PDDocument:
             dict: The Power Designer data converted to a dictionary
         """
         # Function not yet used, but candidate for reading XML file
+        import xmltodict
+
         with open(file_pd_ldm) as fd:
             doc = fd.read()
         dict_data = xmltodict.parse(doc)
@@ -167,6 +168,7 @@ class PDDocument:
 
 
 if __name__ == "__main__":
+    setup_logging()
     file_model = "input/Example_CL_LDM.ldm"  # "input/ExampleDWH.ldm"
     file_document_output = "output/Example_CL_LDM_new.json"  # "output/ExampleDWH.json"
     document = PDDocument(file_pd_ldm=file_model)
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+
+from src.log_config.tracing import tracer
+from pd_document_scanner import DocumentScanner
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentIndex:
+    """Index of the byte offsets of the top-level objects of a Power Designer document
+
+    The index is stored next to the document as a sidecar file, so single objects (like one mapping or entity) can be
+    parsed straight from the memory mapped document without parsing the document as a whole. The index is rebuilt
+    when the hash of the document differs from the hash the index was built for.
+    """
+
+    LST_TAGS = [
+        "o:Entity",
+        "o:Shortcut",
+        "o:Relationship",
+        "o:DefaultObjectMapping",
+        "o:Table",
+        "o:View",
+        "o:Procedure",
+    ]
+
+    def __init__(self, file_pd: str, file_index: str = None, verify: bool = False):
+        """Opens the document and loads its index, building the index if it is missing or outdated
+
+        Args:
+            file_pd (str): Power Designer document (.ldm or .pdm)
+            file_index (str, optional): Path of the sidecar index. Defaults to the document's path with '.idx.json' added.
+            verify (bool, optional): Always compare the document's hash, instead of only when its size or modification
+                time changed. Defaults to False.
+        """
+        self.file_pd = Path(file_pd)
+        self.file_index = (
+            Path(str(file_pd) + ".idx.json") if file_index is None else Path(file_index)
+        )
+        self._file = open(self.file_pd, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.lst_objects = self.__load(verify=verify)
+        if self.lst_objects is None:
+            self.lst_objects = self.__build()
+        self.dict_ids = {entry["Id"]: entry for entry in self.lst_objects}
+        self.dict_codes = {}
+        for entry in self.lst_objects:
+            self.dict_codes.setdefault(entry["Code"], []).append(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """Releases the memory map and the document file"""
+        self._mmap.close()
+        self._file.close()
+
+    def get(self, key: str, tag: str = None) -> dict:
+        """Parses a single object of the document
+
+        Args:
+            key (str): The object's Id (e.g. 'o10') or Code (e.g. 'COUNTRY')
+            tag (str, optional): Object tag to choose between objects sharing a Code, e.g. 'o:Entity'
+
+        Returns:
+            dict: The object as xmltodict would have parsed it, None if the object is not in the index
+        """
+        import xmltodict
+
+        entry = self.entry(key=key, tag=tag)
+        if entry is None:
+            logger.warning(f"No object '{key}' in the index of '{self.file_pd}'")
+            return None
+        with tracer.span(key, category="index", tag=entry["Tag"]):
+            dict_object = xmltodict.parse(self._mmap[entry["Start"] : entry["End"]])
+        return dict_object[entry["Tag"]]
+
+    def entry(self, key: str, tag: str = None) -> dict:
+        """Looks up the index entry of an object
+
+        Args:
+            key (str): The object's Id or Code
+            tag (str, optional): Object tag to choose between objects sharing a Code
+
+        Returns:
+            dict: Tag, Id, Code, Name and byte offsets of the object, None if the object is not in the index
+        """
+        lst_entries = [self.dict_ids[key]] if key in self.dict_ids else self.dict_codes.get(key, [])
+        lst_entries = [entry for entry in lst_entries if tag is None or entry["Tag"] == tag]
+        if len(lst_entries) > 1:
+            logger.warning(
+                f"Code '{key}' is used by {len(lst_entries)} objects, the first one is used"
+            )
+        return lst_entries[0] if len(lst_entries) > 0 else None
+
+    def __file_hash(self) -> str:
+        """Hash of the document's content
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        return hashlib.sha256(self._mmap).hexdigest()
+
+    def __load(self, verify: bool) -> list:
+        """Loads the sidecar index if it belongs to the document as it is now
+
+        Args:
+            verify (bool): Compare hashes even when size and modification time are unchanged
+
+        Returns:
+            list: Index entries, None when the index is missing or outdated
+        """
+        if not self.file_index.exists():
+            return None
+        with open(self.file_index, encoding="utf-8") as file:
+            dict_index = json.load(file)
+        stat = os.stat(self.file_pd)
+        is_unchanged = (
+            dict_index.get("Size") == stat.st_size
+            and dict_index.get("ModificationTime") == stat.st_mtime_ns
+        )
+        if is_unchanged and not verify:
+            return dict_index["Objects"]
+        if dict_index.get("Hash") == self.__file_hash():
+            return dict_index["Objects"]
+        logger.info(f"Index '{self.file_index}' is outdated and will be rebuilt")
+        return None
+
+    def __build(self) -> list:
+        """Scans the document for its top-level objects and writes the sidecar index
+
+        Returns:
+            list: Index entries
+        """
+        with tracer.span("Build index", category="index", file=str(self.file_pd)):
+            scanner = DocumentScanner(self._mmap)
+            lst_objects = []
+            for start, end in scanner.collections().values():
+                for tag, id, start_object, end_object in scanner.objects(start, end):
+                    if tag not in self.LST_TAGS:
+                        continue
+                    header = scanner.object_header(start_object, end_object)
+                    lst_objects.append(
+                        {
+                            "Tag": tag,
+                            "Id": id,
+                            "Code": header.get("Code"),
+                            "Name": header.get("Name"),
+                            "Start": start_object,
+                            "End": end_object,
+                        }
+                    )
+            stat = os.stat(self.file_pd)
+            dict_index = {
+                "Hash": self.__file_hash(),
+                "Size": stat.st_size,
+                "ModificationTime": stat.st_mtime_ns,
+                "Objects": lst_objects,
+            }
+            with open(self.file_index, "w", encoding="utf-8") as file:
+                json.dump(dict_index, file)
+        logger.info(f"Index of {len(lst_objects)} objects written to '{self.file_index}'")
+        return lst_objects
@@ -0,0 +1,227 @@
+import logging
+
+from src.log_config.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentNormalizer:
+    """Turns extracted models and mappings into a normalized form without duplicated entity and attribute data
+
+    Relationships embed complete entities and identifiers, and mappings embed attribute data in every attribute map
+    and join condition. In the normalized form domains, entities, attributes and identifiers are stored once in
+    lookup tables keyed by their Id, and every place that embedded them holds a reference like
+    {"$ref": "#/Attributes/o90"}. Data that is specific to the place of the reference (like an 'EntityAlias' in a
+    mapping) is kept next to the reference. The resolver in json_query.py rehydrates the references on access.
+    """
+
+    # Keys of embedded objects (or lists of them) and the lookup table the objects are referenced from
+    DICT_REFERENCE_KEYS = {
+        "Entity": "Entities",
+        "Entity1": "Entities",
+        "Entity2": "Entities",
+        "EntityTarget": "Entities",
+        "EntitiesSource": "Entities",
+        "AttributeTarget": "Attributes",
+        "AttributesSource": "Attributes",
+        "AttributeParent": "Attributes",
+        "AttributeChild": "Attributes",
+        "Entity1Attribute": "Attributes",
+        "Entity2Attribute": "Attributes",
+        "Identifiers": "Identifiers",
+        "Domain": "Domains",
+    }
+
+    def __init__(self):
+        self.dict_tables = {}
+        self._set_complete = set()
+
+    def normalize(self, lst_models: list, lst_mappings: list) -> dict:
+        """Creates the normalized document, the models and mappings passed are left unchanged
+
+        Args:
+            lst_models (list): Extracted models
+            lst_mappings (list): Extracted mappings
+
+        Returns:
+            dict: Normalized document with lookup tables, models and mappings
+        """
+        self.register_models(lst_models=lst_models)
+        dict_document = {"Format": "normalized"}
+        dict_document.update(self.dict_tables)
+        dict_document["Models"] = [self.model(model) for model in lst_models]
+        dict_document["Mappings"] = [self.mapping(mapping) for mapping in lst_mappings]
+        return dict_document
+
+    def register_models(self, lst_models: list):
+        """Fills the lookup tables with the domains, entities, attributes and identifiers of the models
+
+        Args:
+            lst_models (list): Extracted models
+        """
+        self.dict_tables = {"Domains": {}, "Entities": {}, "Attributes": {}, "Identifiers": {}}
+        # Objects stored as a whole, references to them don't need to keep any data of their own
+        self._set_complete = set()
+        with tracer.span("Normalize", category="stage"):
+            for model in lst_models:
+                self.__register_model(model)
+        logger.debug(
+            "Normalized "
+            + ", ".join(f"{len(table)} {name}" for name, table in self.dict_tables.items())
+        )
+
+    def model(self, model: dict) -> dict:
+        """Normalizes a model of which the objects are registered
+
+        Args:
+            model (dict): Extracted model
+
+        Returns:
+            dict: Copy of the model, referring to its entities
+        """
+        model_new = {key: value for key, value in model.items() if key != "Entities"}
+        if "Entities" in model:
+            model_new["Entities"] = [
+                self.__reference(table="Entities", obj=entity)
+                for entity in model["Entities"]
+            ]
+        if "Relationships" in model:
+            model_new["Relationships"] = self.__walk(model["Relationships"])
+        return model_new
+
+    def mapping(self, mapping: dict) -> dict:
+        """Normalizes a mapping, the models it refers to must be registered
+
+        Args:
+            mapping (dict): Extracted mapping
+
+        Returns:
+            dict: Copy of the mapping, referring to entities and attributes
+        """
+        return self.__walk(mapping)
+
+    def __register_model(self, model: dict):
+        """Adds the model's entities with their attributes, identifiers and domains to the lookup tables
+
+        Entities and attributes get the identifying data of the model (and entity) they belong to, like
+        mappings have for them.
+
+        Args:
+            model (dict): Extracted model
+        """
+        dict_model = {
+            "IdModel": model.get("Id"),
+            "NameModel": model.get("Name"),
+            "CodeModel": model.get("Code"),
+        }
+        for entity in model.get("Entities", []):
+            self._set_complete.add(id(entity))
+            entry_entity = {
+                key: value
+                for key, value in entity.items()
+                if key not in ["Attributes", "Identifiers"]
+            }
+            entry_entity.update(dict_model)
+            dict_attr_codes = {}
+            lst_attr_refs = []
+            for attr in entity.get("Attributes", []):
+                self._set_complete.add(id(attr))
+                entry_attr = dict(attr)
+                if "Domain" in attr:
+                    entry_attr["Domain"] = self.__register_domain(attr["Domain"])
+                entry_attr.update(dict_model)
+                entry_attr.update(
+                    {
+                        "IdEntity": entity["Id"],
+                        "NameEntity": entity["Name"],
+                        "CodeEntity": entity["Code"],
+                    }
+                )
+                self.dict_tables["Attributes"][attr["Id"]] = entry_attr
+                dict_attr_codes[attr["Code"]] = attr["Id"]
+                lst_attr_refs.append({"$ref": f"#/Attributes/{attr['Id']}"})
+            entry_entity["Attributes"] = lst_attr_refs
+            if "Identifiers" in entity:
+                entry_entity["Identifiers"] = [
+                    self.__register_identifier(identifier, dict_attr_codes)
+                    for identifier in entity["Identifiers"]
+                ]
+            self.dict_tables["Entities"][entity["Id"]] = entry_entity
+
+    def __register_domain(self, domain: dict) -> dict:
+        """Adds a domain to the lookup table
+
+        Args:
+            domain (dict): Domain data of an attribute
+
+        Returns:
+            dict: Reference to the domain
+        """
+        if "Id" not in domain:
+            return domain
+        self._set_complete.add(id(domain))
+        self.dict_tables["Domains"].setdefault(domain["Id"], domain)
+        return {"$ref": f"#/Domains/{domain['Id']}"}
+
+    def __register_identifier(self, identifier: dict, dict_attr_codes: dict) -> dict:
+        """Adds an identifier to the lookup table, its attributes are found by Code within the entity
+
+        Args:
+            identifier (dict): Identifier of an entity
+            dict_attr_codes (dict): The entity's attribute Ids by their Code
+
+        Returns:
+            dict: Reference to the identifier
+        """
+        self._set_complete.add(id(identifier))
+        entry = dict(identifier)
+        if "Attributes" in identifier:
+            entry["Attributes"] = [
+                {"$ref": f"#/Attributes/{dict_attr_codes[attr['Code']]}"}
+                if attr.get("Code") in dict_attr_codes
+                else attr
+                for attr in identifier["Attributes"]
+            ]
+        self.dict_tables["Identifiers"][identifier["Id"]] = entry
+        return {"$ref": f"#/Identifiers/{identifier['Id']}"}
+
+    def __walk(self, value, key: str = None):
+        """Copies data while replacing embedded entities, attributes, identifiers and domains by references
+
+        Args:
+            value (any): Data to copy
+            key (str, optional): The key the data was found under
+
+        Returns:
+            any: The copy with references
+        """
+        if isinstance(value, list):
+            return [self.__walk(item, key) for item in value]
+        if isinstance(value, dict):
+            if key in self.DICT_REFERENCE_KEYS:
+                table = self.DICT_REFERENCE_KEYS[key]
+                if value.get("Id") in self.dict_tables[table]:
+                    return self.__reference(table=table, obj=value)
+            return {key_item: self.__walk(item, key_item) for key_item, item in value.items()}
+        return value
+
+    def __reference(self, table: str, obj: dict) -> dict:
+        """Creates a reference to an object in a lookup table
+
+        Args:
+            table (str): Name of the lookup table
+            obj (dict): Embedded object, the object itself or a selection of its data
+
+        Returns:
+            dict: The reference, with the object's data that differs from the lookup table
+        """
+        reference = {"$ref": f"#/{table}/{obj['Id']}"}
+        if id(obj) in self._set_complete:
+            return reference
+        entry = self.dict_tables[table][obj["Id"]]
+        for key, value in obj.items():
+            if isinstance(value, (dict, list)):
+                continue
+            if key not in entry or entry[key] != value:
+                reference[key] = value
+        return reference
@@ -1,12 +1,10 @@
 import datetime
 import json
+import logging
 import os
 from pathlib import Path
 
-import xmltodict
-from jinja2 import Environment, FileSystemLoader
-
-from src.log_config.logging_config import logging
+from src.log_config.logging_config import setup_logging
 from pd_extractor_pdm import PDMObjectExtractor
 
 logger = logging.getLogger(__name__)
@@ -60,6 +58,8 @@ class PDDocumentPDM:
             dict: The Power Designer data converted to a dictionary
         """
         # Function not yet used, but candidate for reading XML file
+        import xmltodict
+
         with open(file_pd_pdm) as fd:
             doc = fd.read()
         dict_data = xmltodict.parse(doc)
@@ -123,6 +123,8 @@ class PDDocumentPDMQuery:
          type_template (str): The type of templates your want to use to implement your models
             dict_object (dect): The object that describes the object for the template
         """
+        from jinja2 import Environment, FileSystemLoader
+
         # Loading templates
         dest_type = "dedicated-pool"
         dir_template = "templates/" + dest_type + "/"
@@ -170,6 +172,7 @@ class PDDocumentPDMQuery:
                 logger.info(f"Written Table DDL {file_output}")
 
 if __name__ == "__main__":
+    setup_logging()
     folder_models = "input/"  # "input"
     PDDocuments(folder_pd=folder_models)
     print("Done")
@@ -0,0 +1,145 @@
+import logging
+import re
+from xml.sax.saxutils import unescape
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentScanner:
+    """Finds the byte regions of collections and objects in a Power Designer document without parsing it
+
+    Power Designer writes one element per line, collections ('c:') never have attributes and object definitions
+    ('o:') always start with an 'Id' attribute, while references to objects use a 'Ref' attribute. This makes it
+    possible to find the boundaries of collections and objects with plain byte searches, so parts of a document can
+    be skipped or parsed on their own.
+    """
+
+    _regex_collection = re.compile(rb"<(/?)c:([\w.]+)(/?)>")
+    _regex_object = re.compile(rb'<o:([\w.]+) Id="([^"]+)">')
+    _regex_attribute = re.compile(rb"<a:([\w.]+)>([^<]*)</a:")
+
+    def __init__(self, data: bytes):
+        """Scans the (memory mapped) content of a Power Designer document
+
+        Args:
+            data (bytes): The content of the document, bytes or a memory mapped file
+        """
+        self.data = data
+
+    def collections(self) -> dict:
+        """Retrieves the regions of the collections that belong to the document's model
+
+        Returns:
+            dict: The collection name (e.g. 'c:Entities') as key, the start and end offset as value
+        """
+        dict_regions = {}
+        pos = self.data.find(b"<c:Children>")
+        if pos == -1:
+            logger.error("Document has no 'c:Children' to find the model collections in")
+            return dict_regions
+        pos = pos + len(b"<c:Children>")
+        while True:
+            match = self._regex_collection.search(self.data, pos)
+            if match is None or match.group(1) == b"/":
+                # Closing the root object's children ends the model
+                break
+            if match.group(3) == b"/":
+                # Empty collection
+                pos = match.end()
+                continue
+            name = match.group(2)
+            end = self.__region_end(
+                tag_open=b"<c:" + name + b">",
+                tag_close=b"</c:" + name + b">",
+                pos=match.end(),
+            )
+            dict_regions["c:" + name.decode()] = (match.start(), end)
+            pos = end
+        return dict_regions
+
+    def objects(self, start: int, end: int) -> list:
+        """Retrieves the regions of the objects directly within a region, mostly a collection
+
+        Args:
+            start (int): Start offset of the region
+            end (int): End offset of the region
+
+        Returns:
+            list: Tuples of the object tag (e.g. 'o:Entity'), Id, start and end offset
+        """
+        lst_objects = []
+        pos = start
+        while True:
+            match = self._regex_object.search(self.data, pos, end)
+            if match is None:
+                break
+            tag = match.group(1)
+            end_object = self.__region_end(
+                tag_open=b"<o:" + tag + b' Id="',
+                tag_close=b"</o:" + tag + b">",
+                pos=match.end(),
+            )
+            lst_objects.append(
+                ("o:" + tag.decode(), match.group(2).decode(), match.start(), end_object)
+            )
+            pos = end_object
+        return lst_objects
+
+    def object_header(self, start: int, end: int) -> dict:
+        """Retrieves the attributes of an object that precede its collections, like ObjectID, Code and ModificationDate
+
+        Args:
+            start (int): Start offset of the object
+            end (int): End offset of the object
+
+        Returns:
+            dict: Attribute names (without the 'a:' prefix) and their values
+        """
+        end_header = self.data.find(b"<c:", start, end)
+        end_header = end if end_header == -1 else end_header
+        return {
+            match.group(1).decode(): unescape(match.group(2).decode("utf-8"))
+            for match in self._regex_attribute.finditer(self.data, start, end_header)
+        }
+
+    def without(self, lst_regions: list) -> bytes:
+        """Returns the document content with the given regions left out
+
+        Args:
+            lst_regions (list): Start and end offsets of the regions to leave out
+
+        Returns:
+            bytes: The remaining content
+        """
+        lst_parts = []
+        pos = 0
+        for start, end in sorted(lst_regions):
+            lst_parts.append(self.data[pos:start])
+            pos = end
+        lst_parts.append(self.data[pos:])
+        return b"".join(lst_parts)
+
+    def __region_end(self, tag_open: bytes, tag_close: bytes, pos: int) -> int:
+        """Finds the end of an element, taking nested elements with the same tag into account
+
+        Args:
+            tag_open (bytes): Start of the opening tag of the element
+            tag_close (bytes): The closing tag of the element
+            pos (int): Offset just after the opening tag
+
+        Returns:
+            int: Offset just after the matching closing tag
+        """
+        depth = 1
+        while depth > 0:
+            idx_close = self.data.find(tag_close, pos)
+            if idx_close == -1:
+                raise ValueError(f"No closing tag '{tag_close.decode()}' found")
+            # Nested elements with the same tag that open before this closing tag (mmap has no count)
+            idx_open = self.data.find(tag_open, pos, idx_close)
+            while idx_open != -1:
+                depth += 1
+                idx_open = self.data.find(tag_open, idx_open + len(tag_open), idx_close)
+            depth -= 1
+            pos = idx_close + len(tag_close)
+        return pos
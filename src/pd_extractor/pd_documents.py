@@ -1,104 +1,652 @@
-import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import logging
+import multiprocessing
+import os
 from pathlib import Path
 
-import xmltodict
-from jinja2 import Environment, FileSystemLoader
-
+from pd_document_normalizer import DocumentNormalizer
+from pd_datatypes import DatatypeTranslator
+from pd_document_scanner import DocumentScanner
+from pd_domain_resolver import DomainResolver
+from pd_json_writer import JSONStreamWriter
+from pd_catalog import ModelCatalog
+from pd_memory import MemoryBudget
+from pd_object_filter import ObjectFilter
+from pd_ingest_design import IngestDesign
+from pd_physical_design import JoinStatistics, PhysicalDesign
+from pd_statistics_advisor import StatisticsAdvisor
+from pd_pipeline import Pipeline, Stage
+from pd_relationship_graph import RelationshipGraph
+from pd_string_interner import StringInterner
+from pd_template_bundle import TemplateBundle
+from pd_template_renderer import RenderExecutor, TemplateRenderer
 from pd_transform_model_internal import TransformModelInternal
 from pd_transform_models_external import TransformModelsExternal
 from pd_transform_mappings import TransformMappings
 from pd_transform_model_physical import TransformModelPhysical
 
-from src.log_config.logging_config import logging
+from src.log_config.logging_config import setup_logging
+from src.log_config.tracing import tracer
 #from pd_extractor_pdm import PDMObjectExtractor
 
 logger = logging.getLogger(__name__)
 
+# Object types that can be selected for extraction per kind of document, with the collections
+# of the Power Designer document that are needed to extract them
+DICT_TYPE_COLLECTIONS = {
+    ".ldm": {
+        "Entities": ["c:Domains", "c:Entities"],
+        "Relationships": ["c:Domains", "c:Entities", "c:Relationships"],
+        "ModelsExternal": ["c:Entities", "c:TargetModels"],
+    },
+    ".pdm": {
+        "Tables": ["c:Domains", "c:Tables"],
+        "References": ["c:Domains", "c:Tables", "c:References"],
+        "Views": ["c:Views"],
+        "Procedures": ["c:Procedures"],
+    },
+}
+# Collections and the object type in them that can be filtered with an ObjectFilter
+DICT_FILTER_OBJECTS = {"c:Entities": "o:Entity", "c:Tables": "o:Table"}
+# Collections that are parsed in their own worker process when a document is parsed in parallel
+LST_PARALLEL_COLLECTIONS = [
+    "c:Domains",
+    "c:Entities",
+    "c:Relationships",
+    "c:Mappings",
+    "c:TargetModels",
+    "c:Tables",
+    "c:Views",
+    "c:Procedures",
+    "c:References",
+]
+# Mappings are enriched with the entities and attributes of the internal and external models
+LST_MAPPING_TYPES = ["Entities", "ModelsExternal"]
+LST_MAPPING_COLLECTIONS = ["c:Domains", "c:Entities", "c:TargetModels", "c:Mappings"]
+
 class PDDocuments:
     """Represents Power Designer model files"""
 
-    def __init__(self, folder_pd: str):
+    def __init__(
+        self,
+        folder_pd: str,
+        implementations: list = None,
+        file_trace: str = None,
+        workers: int = None,
+        memory_limit_mb: int = None,
+        render_workers: int = 1,
+        dir_bundles: str = None,
+        physical_design: dict = None,
+        statistics: dict = None,
+        ingest: dict = None,
+    ):
         """Extracts data from a JSON-ed version of a Power Designer document and turns it into an object representation
 
+        The documents go through a pipeline of stages (read, extract, render and write) that run at the same time,
+        so reading and writing files overlaps with parsing and rendering other documents. Before that the entities
+        the shortcuts of external models refer to are indexed (see ModelCatalog.index_targets), so the render stage
+        resolves the shortcuts of each document to the entities of the documents that own them.
+
         Args:
             folder_pd (str): JSON version of a Power Designer document (.pdm)
+            implementations (list, optional): Implementations to create DDL's for from a single extraction,
+                e.g. ["dedicated-pool", "duckdb"]. Defaults to ["dedicated-pool"].
+            file_trace (str, optional): When given, a Chrome/Perfetto trace of the run is written to this file
+            workers (int, optional): Number of worker processes that parse documents. Defaults to the number of CPU's.
+            memory_limit_mb (int, optional): Maximum memory (RSS) in MB of a worker while it extracts a document.
+                Documents that exceed it are reported and skipped, the other documents are processed.
+            render_workers (int, optional): Number of worker processes that render the objects of a document.
+                Defaults to 1, rendering in the render stage itself.
+            dir_bundles (str, optional): Directory with precompiled templates (see TemplateBundle).
+            physical_design (dict, optional): Rowcount thresholds for the distribution and index of tables, see
+                PhysicalDesign.DICT_THRESHOLDS.
+            statistics (dict, optional): Options of the derived statistics and indexes of tables, see
+                StatisticsAdvisor.
+            ingest (dict, optional): Location and format of the files loaded into the landing tables of external
+                models, see IngestDesign.DICT_OPTIONS.
         """
+        if file_trace is not None:
+            tracer.start()
+        self.implementations = implementations
+        self.render_workers = render_workers
+        self.dir_bundles = dir_bundles
+        self.physical_design = physical_design
+        self.statistics = statistics
+        self.ingest = ingest
         lst_files = []
         importfiles = Path(folder_pd)
         importfiles.iterdir()
         importfiles.glob("*.*dm")
         lst_files = list(importfiles.glob("*.*dm"))
-        for file_pd in lst_files:
-            document = PDDocument(file_pd)
-            PDDocumentQuery(document=document)
+        workers = workers or os.cpu_count() or 1
+        # Shortcuts of external models are replaced by the entities of the documents that own them, so their
+        # attributes have the datatypes of the source when they are translated and rendered
+        # Hash columns, statistics and indexes of tables are derived from the joins of the logical models'
+        # relationships and mappings too
+        self.join_statistics = JoinStatistics()
+        self.statistics_advisor = StatisticsAdvisor(**(statistics or {}))
+        self.catalog = ModelCatalog(workers=workers)
+        self.catalog.index_targets(
+            folder_pd=folder_pd, lst_collectors=[self.join_statistics, self.statistics_advisor]
+        )
+        self.pipeline = Pipeline(
+            [
+                Stage("Read", PDDocuments.read, workers=2),
+                Stage(
+                    "Extract",
+                    partial(PDDocuments.extract, memory_limit_mb=memory_limit_mb),
+                    workers=max(1, min(workers, len(lst_files))),
+                    processes=True,
+                ),
+                Stage("Render", self.render),
+                Stage("Write", PDDocumentQuery.write_files, workers=2),
+            ]
+        )
+        self.pipeline.run(lst_files)
+        if file_trace is not None:
+            tracer.write(file_trace=file_trace)
         print("")
 
+    @staticmethod
+    def read(file_pd: Path) -> tuple:
+        """Pipeline stage: reads a document
+
+        Args:
+            file_pd (Path): Power Designer document
+
+        Returns:
+            tuple: The path and the content of the document
+        """
+        with tracer.span(file_pd.name, category="read"):
+            with open(file_pd, "rb") as fd:
+                data = fd.read()
+        return file_pd, data
+
+    @staticmethod
+    def extract(item: tuple, memory_limit_mb: int = None) -> "PDDocument":
+        """Pipeline stage: parses a document and extracts its models, in a worker process
+
+        Args:
+            item (tuple): The path and the content of the document
+            memory_limit_mb (int, optional): Maximum memory (RSS) in MB while the document is extracted
+
+        Returns:
+            PDDocument: The document with its models
+        """
+        file_pd, data = item
+        with tracer.span(file_pd.name, category="document"):
+            # DDL generation doesn't use mappings
+            document = PDDocument(
+                file_pd, include_mappings=False, data=data, memory_limit_mb=memory_limit_mb
+            )
+        return document
+
+    def render(self, document: "PDDocument") -> list:
+        """Pipeline stage: renders the DDL's of a document
+
+        Args:
+            document (PDDocument): The document with its models
+
+        Returns:
+            list: Tuples of the output file path and the rendered DDL
+        """
+        self.catalog.resolve_document(document)
+        # Logical models have no tables, their own joins are already in the folder's
+        is_physical = Path(document.file_pd).suffix == ".pdm"
+        query = PDDocumentQuery(
+            document=document,
+            implementations=self.implementations,
+            write=False,
+            render_workers=self.render_workers,
+            dir_bundles=self.dir_bundles,
+            physical_design=self.physical_design,
+            statistics=self.statistics,
+            ingest=self.ingest,
+            join_statistics=self.join_statistics if is_physical else None,
+            statistics_advisor=self.statistics_advisor if is_physical else None,
+        )
+        return query.lst_files
+
 class PDDocument:
     """Represents Power Designer logical data model file"""
 
-    def __init__(self, file_pd: str):
+    def __init__(
+        self,
+        file_pd: str,
+        types: list = None,
+        include_mappings: bool = True,
+        object_filter: ObjectFilter = None,
+        parallel_parse: bool = False,
+        stream_mappings: bool = False,
+        data: bytes = None,
+        memory_limit_mb: int = None,
+        intern_strings: bool = True,
+    ):
         """Extracts data from (Logical) Model Power Designer document and turns it into an object representation
 
+        Only the selected object types are extracted, the parts of the document that are not needed for them
+        are skipped before parsing. The parsed XML is released as soon as the models and mappings are extracted,
+        only the extracted data is kept.
+
         Args:
             file_pd (str): Power Designer data model document (.*dm)
+            types (list, optional): Object types to extract, e.g. ["Tables"] or ["Entities", "Relationships"].
+                All object types are extracted when omitted, see DICT_TYPE_COLLECTIONS for the available types.
+            include_mappings (bool, optional): Whether mappings are extracted (logical models only). Defaults to True.
+            object_filter (ObjectFilter, optional): Criteria for the entities or tables to extract. Relationships
+                and mappings are only kept when all entities and attributes they refer to are kept.
+            parallel_parse (bool, optional): Parse the document's major collections (entities, mappings, tables, etc.)
+                in separate worker processes, which pays off for large documents. Defaults to False.
+            stream_mappings (bool, optional): Extract the mappings only while they are consumed by iter_mappings or
+                write_result, so they are never in memory all at once. Defaults to False.
+            data (bytes, optional): Content of the document when it is already read, the file is not read again.
+            memory_limit_mb (int, optional): Maximum memory (RSS) in MB while the document is extracted, a
+                MemoryBudgetExceeded error is raised after the extraction step in which it is exceeded. The peak
+                memory is always reported.
+            intern_strings (bool, optional): Let identical keys and values of the parsed XML share one string
+                object, which saves memory for documents with many repeated values. Defaults to True.
         """
         self.file_pd = file_pd
-        # Extracting data from the file
-        self.content = self.read_file_model(file_pd=file_pd)
-        logger.debug(f"Start model extraction voor bestand '{file_pd}'.")
-        extractor = ObjectExtractor(pd_content=self.content)
-        self.lst_models = extractor.models()
-        self.lst_mappings = []
-
-    def read_file_model(self, file_pd: str) -> dict:
+        self.types = types
+        self.include_mappings = include_mappings
+        self.object_filter = object_filter
+        self.parallel_parse = parallel_parse
+        self.intern_strings = intern_strings
+        self.memory_peak_mb = None
+        with MemoryBudget(name=Path(file_pd).name, limit_mb=memory_limit_mb) as budget:
+            # Extracting data from the file
+            with tracer.span("Read file", category="stage", file=str(file_pd)):
+                self.content = self.read_file_model(file_pd=file_pd, data=data)
+            budget.check("Read file")
+            logger.debug(f"Start model extraction voor bestand '{file_pd}'.")
+            with tracer.span("Extract models", category="stage"):
+                extractor = ObjectExtractor(
+                    pd_content=self.content,
+                    types=types,
+                    include_mappings=include_mappings,
+                    object_filter=object_filter,
+                )
+                self.lst_models = extractor.models()
+            budget.check("Extract models")
+            self.dict_domain_report = extractor.domain_report()
+            if len(self.dict_domain_report["Issues"]) > 0:
+                logger.warning(
+                    f"{len(self.dict_domain_report['Issues'])} domain references of '{file_pd}' can't be resolved"
+                )
+            self.lst_mappings = []
+            self._iter_mappings = None
+            if extractor.has_mappings():
+                if stream_mappings:
+                    self._iter_mappings = extractor.iter_mappings(
+                        dict_entities=self.__all_entities(),
+                        dict_attributes=self.__all_attributes(),
+                    )
+                else:
+                    self.lst_mappings = extractor.mappings(
+                        dict_entities=self.__all_entities(),
+                        dict_attributes=self.__all_attributes(),
+                    )
+                budget.check("Mappings")
+            # Extracted data doesn't refer to the parsed XML, streamed mappings release it when they're done
+            self.content = None
+            del extractor
+        self.memory_peak_mb = budget.peak_mb
+
+    def iter_mappings(self):
+        """Yields the document's mappings, streamed mappings are extracted while they are consumed (only once)
+
+        Yields:
+            dict: A mapping enriched with entity and attribute data
+        """
+        if self._iter_mappings is None:
+            yield from self.lst_mappings
+        else:
+            # The generator holds the parsed XML until the last mapping is extracted
+            iter_mappings = self._iter_mappings
+            self._iter_mappings = None
+            yield from iter_mappings
+
+    def read_file_model(self, file_pd: str, data: bytes = None) -> dict:
         """Reading the XML Power Designer ldm file into a dictionary
 
         Args:
             file_xml (str): The path to a XML file
+            data (bytes, optional): Content of the file when it is already read
 
         Returns:
             dict: The Power Designer data converted to a dictionary
         """
-        # Function not yet used, but candidate for reading XML file
+        # Imported on first use, commands that only query JSON don't need the XML parser
+        import xmltodict
+
         model_extension = Path(file_pd).suffix
-        with open(file_pd) as fd:
-            doc = fd.read()
-        dict_data = xmltodict.parse(doc)
+        if data is None:
+            with open(file_pd, "rb") as fd:
+                doc = fd.read()
+        else:
+            doc = data
+        # Leave out the collections that are not needed for the selected object types
+        lst_unused = ObjectExtractor.collections_unused(
+            extension=model_extension,
+            types=self.types,
+            include_mappings=self.include_mappings,
+        )
+        if len(lst_unused) > 0 or self.object_filter is not None:
+            with tracer.span("Skip collections", category="stage"):
+                scanner = DocumentScanner(doc)
+                dict_regions = scanner.collections()
+                lst_regions = [
+                    dict_regions[name] for name in lst_unused if name in dict_regions
+                ]
+                if self.object_filter is not None:
+                    lst_regions = lst_regions + self.__regions_filtered(
+                        scanner=scanner, dict_regions=dict_regions, lst_unused=lst_unused
+                    )
+                doc = scanner.without(lst_regions)
+            logger.debug(f"Collections skipped for '{file_pd}': {lst_unused}")
+        interner = StringInterner() if self.intern_strings else None
+        with tracer.span("Parse XML", category="stage", size=len(doc)):
+            if self.parallel_parse:
+                dict_data = self.__parse_parallel(doc=doc, interner=interner)
+            else:
+                dict_data = xmltodict.parse(
+                    doc, postprocessor=None if interner is None else interner.postprocessor
+                )
+        if interner is not None:
+            interner.report(name=Path(file_pd).name)
         dict_data["Model"]["o:RootObject"]["c:Children"]["o:Model"]["a:ModelExtension"] = model_extension
         dict_data = dict_data["Model"]["o:RootObject"]["c:Children"]["o:Model"]
 
         return dict_data
 
-    def __serialize_datetime(self, obj):
-        """Retrieves a datetime and formats it to ISO-format
+    def __parse_parallel(self, doc: bytes, interner: StringInterner = None) -> dict:
+        """Parses the major collections of a document in worker processes and stitches them into the document
+
+        Args:
+            doc (bytes): Content of the Power Designer document
+            interner (StringInterner, optional): Interner for the strings of the document, workers intern the
+                strings of their collection with their own interner
+
+        Returns:
+            dict: The Power Designer data converted to a dictionary, the same as parsing the document as a whole
+        """
+        import xmltodict
+
+        postprocessor = None if interner is None else interner.postprocessor
+        scanner = DocumentScanner(doc)
+        dict_regions = scanner.collections()
+        lst_names = [name for name in LST_PARALLEL_COLLECTIONS if name in dict_regions]
+        if len(lst_names) == 0:
+            return xmltodict.parse(doc, postprocessor=postprocessor)
+        # The document without the major collections is parsed while the workers parse the collections
+        doc_skeleton = scanner.without([dict_regions[name] for name in lst_names])
+        with ProcessPoolExecutor(
+            max_workers=min(len(lst_names), os.cpu_count() or 1),
+            # Not forked: the memory budget's sampler thread (and the pipeline's threads) are running
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=tracer.init_worker,
+            initargs=(tracer.enabled,),
+        ) as executor:
+            dict_futures = {
+                name: executor.submit(
+                    PDDocument.parse_collection,
+                    name,
+                    doc[dict_regions[name][0] : dict_regions[name][1]],
+                    interner is not None,
+                )
+                for name in lst_names
+            }
+            dict_data = xmltodict.parse(doc_skeleton, postprocessor=postprocessor)
+            dict_model = dict_data["Model"]["o:RootObject"]["c:Children"]["o:Model"]
+            for name, future in dict_futures.items():
+                content, lst_events = future.result()
+                tracer.extend(lst_events)
+                dict_model[name] = content
+        logger.debug(f"Collections parsed in parallel: {lst_names}")
+        return dict_data
+
+    @staticmethod
+    def parse_collection(name: str, data: bytes, intern_strings: bool = False) -> tuple:
+        """Parses a single collection of a document, used by worker processes
+
+        Interned strings stay shared when the content is sent back, pickle writes a shared object only once.
 
         Args:
-            obj (any): Object to be formatted into the correct ISO date format if possible
+            name (str): Name of the collection, e.g. 'c:Entities'
+            data (bytes): The collection's XML
+            intern_strings (bool, optional): Let identical strings of the collection share one object
 
         Returns:
-            Datetime: Formatted in ISO-format
+            tuple: The parsed collection content and the trace events of the worker
         """
+        import xmltodict
 
-        if isinstance(obj, datetime.datetime):
-            return obj.isoformat()
-        raise TypeError("Type not serializable")
+        postprocessor = StringInterner().postprocessor if intern_strings else None
+        with tracer.span(name, category="parse", size=len(data)):
+            content = xmltodict.parse(data, postprocessor=postprocessor)[name]
+        return content, tracer.drain()
+
+    def __regions_filtered(
+        self, scanner: DocumentScanner, dict_regions: dict, lst_unused: list
+    ) -> list:
+        """Finds the entities and tables that don't meet the criteria of the object filter
+
+        Args:
+            scanner (DocumentScanner): Scanner of the document content
+            dict_regions (dict): Regions of the model's collections
+            lst_unused (list): Collections that are skipped already
+
+        Returns:
+            list: Start and end offsets of the objects to skip
+        """
+        lst_regions = []
+        for name, tag in DICT_FILTER_OBJECTS.items():
+            if name not in dict_regions or name in lst_unused:
+                continue
+            start, end = dict_regions[name]
+            for tag_object, id, start_object, end_object in scanner.objects(start, end):
+                if tag_object != tag:
+                    continue
+                header = scanner.object_header(start_object, end_object)
+                if not self.object_filter.matches(header):
+                    lst_regions.append((start_object, end_object))
+        logger.debug(f"Objects skipped by the filter: {len(lst_regions)}")
+        return lst_regions
+
+    def __all_entities(self) -> dict:
+        """Retrieves all entities regardless of the model they belong to
+
+        Returns:
+            dict: Each dictionary value represents an entity, the key is the internal ID
+        """
+        dict_result = {}
+        for model in self.lst_models:
+            lst_entities = model.get("Entities", [])
+            for entity in lst_entities:
+                dict_result[entity["Id"]] = {
+                    "Id": entity["Id"],
+                    "Name": entity["Name"],
+                    "Code": entity["Code"],
+                    "IdModel": model["Id"],
+                    "NameModel": model["Name"],
+                    "CodeModel": model["Code"],
+                    "IsDocumentModel": not model["IsDocumentModel"],
+                }
+        return dict_result
+
+    def __all_attributes(self) -> dict:
+        """Retrieves all attributes regardless of the model or entity they belong to
+
+        Returns:
+            dict: Each dictionary value represents an attribute, the key is the internal ID
+        """
+        dict_result = {}
+        for model in self.lst_models:
+            lst_entities = model.get("Entities", [])
+            for entity in lst_entities:
+                if "Attributes" in entity:
+                    lst_attributes = entity["Attributes"]
+                    for attr in lst_attributes:
+                        dict_result[attr["Id"]] = {
+                            "Id": attr["Id"],
+                            "Name": attr["Name"],
+                            "Code": attr["Code"],
+                            "IdModel": model["Id"],
+                            "NameModel": model["Name"],
+                            "CodeModel": model["Code"],
+                            "IsDocumentModel": not model["IsDocumentModel"],
+                            "IdEntity": entity["Id"],
+                            "NameEntity": entity["Name"],
+                            "CodeEntity": entity["Code"],
+                        }
+        return dict_result
+
+    def write_result(
+        self, file_output: str, normalized: bool = False, compact: bool = False
+    ):
+        """Writes a json document with all the extracted models and mappings
+
+        The models and mappings are written one at a time, streamed mappings are extracted while being written.
+
+        Args:
+            file_output (str): The file path to which the output will be stored
+            normalized (bool, optional): Store domains, entities, attributes and identifiers once in lookup tables
+                and refer to them elsewhere, instead of repeating their data. Defaults to False.
+            compact (bool, optional): Write without indentation and whitespace. Defaults to False.
+        """
+        with tracer.span("Write JSON", category="stage", file=file_output):
+            with JSONStreamWriter(file_output=file_output, compact=compact) as writer:
+                if normalized:
+                    normalizer = DocumentNormalizer()
+                    normalizer.register_models(lst_models=self.lst_models)
+                    writer.write_value("Format", "normalized")
+                    for name, table in normalizer.dict_tables.items():
+                        writer.write_value(name, table)
+                    writer.write_items(
+                        "Models", (normalizer.model(model) for model in self.lst_models)
+                    )
+                    writer.write_items(
+                        "Mappings",
+                        (normalizer.mapping(mapping) for mapping in self.iter_mappings()),
+                    )
+                else:
+                    writer.write_items("Models", self.lst_models)
+                    writer.write_items("Mappings", self.iter_mappings())
+        logger.debug(f"Document output is written to '{file_output}'")
 
 class ObjectExtractor:
     """Collection of functions used to extract the relevant objects from a Power Designer logical data model document"""
 
-    def __init__(self, pd_content):
+    def __init__(
+        self,
+        pd_content,
+        types: list = None,
+        include_mappings: bool = True,
+        object_filter: ObjectFilter = None,
+    ):
+        """Prepares the extraction of the selected object types
+
+        Args:
+            pd_content (dict): The Power Designer document's model data
+            types (list, optional): Object types to extract, all object types when omitted
+            include_mappings (bool, optional): Whether mappings are extracted. Defaults to True.
+            object_filter (ObjectFilter, optional): The filter used to leave out entities and tables, which makes
+                the extractor leave out relationships and mappings that refer to them
+        """
         self.content = pd_content
+        self.is_filtered = object_filter is not None
         extenstion = self.content["a:ModelExtension"]
+        self.types = self.types_selected(
+            extension=extenstion, types=types, include_mappings=include_mappings
+        )
+        self.include_mappings = include_mappings and extenstion == ".ldm"
+        for type_object in set(types or []) - self.types:
+            logger.warning(
+                f"Unknown object type '{type_object}' for '{extenstion}' documents is ignored"
+            )
+        self.dict_domains = {}
         if extenstion == ".pdm":
             self.transform_model_physical = TransformModelPhysical()
-            self.dict_domains = self.__domains()
+            if "Tables" in self.types:
+                self.dict_domains = self.__domains()
         elif extenstion == ".ldm":
             self.transform_model_internal = TransformModelInternal()
             self.transform_models_external = TransformModelsExternal()
             self.transform_mappings = TransformMappings()
-            self.dict_domains = self.__domains()
+            if "Entities" in self.types:
+                self.dict_domains = self.__domains()
         else:
              logger.error(f"No extractor for extention: '{extenstion}'")
+        # Domain data is selected once and shared by all attributes or columns
+        self.domain_resolver = DomainResolver(dict_domains=self.dict_domains)
+
+    @staticmethod
+    def types_selected(extension: str, types: list, include_mappings: bool) -> set:
+        """Determines the object types that need extraction, including the ones the selected types depend on
+
+        Args:
+            extension (str): Extension of the Power Designer document ('.ldm' or '.pdm')
+            types (list): Selected object types, all object types if None
+            include_mappings (bool): Whether mappings are extracted
+
+        Returns:
+            set: Object types to extract
+        """
+        dict_types = DICT_TYPE_COLLECTIONS.get(extension, {})
+        if types is None:
+            set_types = set(dict_types)
+        else:
+            set_types = {type_object for type_object in types if type_object in dict_types}
+        if "Relationships" in set_types:
+            set_types.add("Entities")
+        if "References" in set_types:
+            set_types.add("Tables")
+        if include_mappings and extension == ".ldm":
+            set_types.update(LST_MAPPING_TYPES)
+        return set_types
+
+    @staticmethod
+    def collections_unused(extension: str, types: list, include_mappings: bool) -> list:
+        """Determines which collections of a document can be skipped for the selected object types
+
+        Args:
+            extension (str): Extension of the Power Designer document ('.ldm' or '.pdm')
+            types (list): Selected object types, all object types if None
+            include_mappings (bool): Whether mappings are extracted
+
+        Returns:
+            list: Names of the collections that are not needed, like 'c:Mappings'
+        """
+        dict_types = DICT_TYPE_COLLECTIONS.get(extension, {})
+        set_types = ObjectExtractor.types_selected(
+            extension=extension, types=types, include_mappings=include_mappings
+        )
+        set_known = {name for lst_names in dict_types.values() for name in lst_names}
+        set_needed = {
+            name for type_object in set_types for name in dict_types[type_object]
+        }
+        if extension == ".ldm":
+            set_known.update(LST_MAPPING_COLLECTIONS)
+            if include_mappings:
+                set_needed.update(LST_MAPPING_COLLECTIONS)
+        return sorted(set_known - set_needed)
+
+    def domain_report(self) -> dict:
+        """Validation report of the domain references of the extracted attributes or columns
+
+        Returns:
+            dict: Unresolved domain references and unused domains
+        """
+        return self.domain_resolver.report()
+
+    def has_mappings(self) -> bool:
+        """Whether mappings are part of the extraction
+
+        Returns:
+            bool: True when the document is a logical model and mappings are included
+        """
+        return self.include_mappings
 
     def models(self) -> list:
         """Retrieves all models and their corresponding objects used in the PowerDesigner document
@@ -114,11 +662,14 @@ class ObjectExtractor:
             dict_model_physical = self.__models_physical()
         elif extenstion == ".ldm":
             dict_model_internal = self.__model_internal()
-            lst_models_external = self.__models_external()
+            if "ModelsExternal" in self.types:
+                lst_models_external = self.__models_external()
         else:
              logger.error(f"No model for extention: '{extenstion}'")
         # Combine models
-        lst_models = lst_models_external + [dict_model_internal] + [dict_model_physical]
+        lst_models = lst_models_external + [
+            model for model in [dict_model_internal, dict_model_physical] if len(model) > 0
+        ]
         return lst_models
 
     def __model_internal(self) -> dict:
@@ -127,13 +678,19 @@ class ObjectExtractor:
         Returns:
             dict: All the model's data
         """
-        model = self.transform_model_internal.model(content=self.content)
+        with tracer.span("Model internal", category="stage"):
+            model = self.transform_model_internal.model(content=self.content)
+        if "Entities" not in self.types:
+            return model
         # Model add entity data
-        lst_entity = self.__entities_internal()
+        with tracer.span("Entities", category="stage"):
+            lst_entity = self.__entities_internal()
         if isinstance(lst_entity, dict):
             lst_entity = [lst_entity]
         model["Entities"] = lst_entity
-        model["Relationships"] = self.__relationships(lst_entity=lst_entity)
+        if "Relationships" in self.types:
+            with tracer.span("Relationships", category="stage"):
+                model["Relationships"] = self.__relationships(lst_entity=lst_entity)
         return model
 
     def __models_physical(self) -> dict:
@@ -142,11 +699,21 @@ class ObjectExtractor:
         Returns:
             dict: All the model's data
         """
-        model = self.transform_model_physical.model(content=self.content)
+        with tracer.span("Model physical", category="stage"):
+            model = self.transform_model_physical.model(content=self.content)
         # Model add table data
-        model["Tables"] = self.__tables()
-        model["Views"] = self.__views()
-        model["Procedures"] = self.__procs()
+        if "Tables" in self.types:
+            with tracer.span("Tables", category="stage"):
+                model["Tables"] = self.__tables()
+        if "References" in self.types:
+            with tracer.span("References", category="stage"):
+                model["References"] = self.__references(lst_tables=model["Tables"])
+        if "Views" in self.types:
+            with tracer.span("Views", category="stage"):
+                model["Views"] = self.__views()
+        if "Procedures" in self.types:
+            with tracer.span("Procedures", category="stage"):
+                model["Procedures"] = self.__procs()
         return model
 
     def __models_external(self) -> list:
@@ -158,12 +725,13 @@ class ObjectExtractor:
         """
         # The models will be derived by looking up the TargetModels associated with the entity shortcuts
         # External entity (shortcut) data
-        dict_entities = self.__entities_external()
-        # Retain 'TargetModels' have references to entities
-        lst_target_model = self.content["c:TargetModels"]["o:TargetModel"]
-        lst_models = self.transform_models_external.models(
-            lst_models=lst_target_model, dict_entities=dict_entities
-        )
+        with tracer.span("Models external", category="stage"):
+            dict_entities = self.__entities_external()
+            # Retain 'TargetModels' have references to entities
+            lst_target_model = self.content["c:TargetModels"]["o:TargetModel"]
+            lst_models = self.transform_models_external.models(
+                lst_models=lst_target_model, dict_entities=dict_entities
+            )
         return lst_models
 
     def __entities_internal(self) -> list:
@@ -172,8 +740,10 @@ class ObjectExtractor:
         Returns:
             list: Entities
         """
-        lst_entity = self.content["c:Entities"]["o:Entity"]
-        self.transform_model_internal.entities(lst_entity, dict_domains=self.dict_domains)
+        lst_entity = self.__collection_objects(name="c:Entities", tag="o:Entity")
+        self.transform_model_internal.entities(
+            lst_entity, domain_resolver=self.domain_resolver
+        )
         return lst_entity
 
     def __entities_external(self) -> dict:
@@ -200,11 +770,49 @@ class ObjectExtractor:
             dict: A dict of Tables, where each key contains data on an Table and their columns as a value
         """
         # Model table data
-        lst_table = self.content["c:Tables"]["o:Table"]
-        self.transform_model_physical.tables(lst_table, dict_domains=self.dict_domains)
+        lst_table = self.__collection_objects(name="c:Tables", tag="o:Table")
+        self.transform_model_physical.tables(
+            lst_table, domain_resolver=self.domain_resolver
+        )
         return lst_table
 
+    def __references(self, lst_tables: list) -> list:
+        """Retrieve the References (foreign keys) between the Tables of the model
+
+        Args:
+            lst_tables (list): The extracted tables, references to tables left out by the object filter are
+                left out as well
+
+        Returns:
+            list: References with their parent and child tables and the columns they join on
+        """
+        lst_references = self.__collection_objects(name="c:References", tag="o:Reference")
+        return self.transform_model_physical.references(
+            lst_references=lst_references, lst_tables=lst_tables
+        )
+
+    def __collection_objects(self, name: str, tag: str) -> list:
+        """Retrieves the objects of a collection as a list, also when the filter left one or no objects
+
+        Args:
+            name (str): Name of the collection, e.g. 'c:Entities'
+            tag (str): Tag of the objects, e.g. 'o:Entity'
+
+        Returns:
+            list: The objects
+        """
+        collection = self.content.get(name) or {}
+        lst_objects = collection.get(tag, [])
+        if isinstance(lst_objects, dict):
+            lst_objects = [lst_objects]
+            collection[tag] = lst_objects
+        return lst_objects
+
     def __domains(self) -> dict:
+        with tracer.span("Domains", category="stage"):
+            return self.__domains_transform()
+
+    def __domains_transform(self) -> dict:
         dict_domains = {}
         if "c:Domains" in self.content:
             extenstion = self.content["a:ModelExtension"]
@@ -223,11 +831,39 @@ class ObjectExtractor:
         lst_relationships = []
         if "c:Relationships" in self.content:
             lst_pd_relationships = self.content["c:Relationships"]["o:Relationship"]
+            if self.is_filtered:
+                lst_pd_relationships = self.__relationships_kept(
+                    lst_relationships=lst_pd_relationships, lst_entity=lst_entity
+                )
             lst_relationships = self.transform_model_internal.relationships(
                 lst_relationships=lst_pd_relationships, lst_entity=lst_entity
             )
         return lst_relationships
 
+    def __relationships_kept(self, lst_relationships: list, lst_entity: list) -> list:
+        """Leaves out the relationships that refer to entities left out by the object filter
+
+        Args:
+            lst_relationships (list): Power Designer items describing a relationship between entities
+            lst_entity (list): The entities that are kept
+
+        Returns:
+            list: Relationships between kept entities
+        """
+        if isinstance(lst_relationships, dict):
+            lst_relationships = [lst_relationships]
+        set_entities = {entity["Id"] for entity in lst_entity}
+        lst_kept = [
+            relationship
+            for relationship in lst_relationships
+            if relationship["c:Object1"]["o:Entity"]["@Ref"] in set_entities
+            and relationship["c:Object2"]["o:Entity"]["@Ref"] in set_entities
+        ]
+        logger.debug(
+            f"Relationships left out by the filter: {len(lst_relationships) - len(lst_kept)}"
+        )
+        return lst_kept
+
     def __views(self) -> list:
         """Retrieve the Views of the model
 
@@ -261,87 +897,341 @@ class ObjectExtractor:
             logger.warning(f"In het model '{modelname}' zijn geen Procedures opgenomen.")
         return lst_procs
 
-    def mappings(self, dict_entities: list, dict_attributes: list) -> list:
-        lst_mappings = self.content["c:Mappings"]["o:DefaultObjectMapping"]
-        lst_mappings = self.transform_mappings.mappings(
+    def mappings(self, dict_entities: dict, dict_attributes: dict) -> list:
+        """Retrieves all mappings of the document, enriched with entity and attribute data
+
+        Args:
+            dict_entities (dict): All entities in the document (internal and external)
+            dict_attributes (dict): All attributes in the document (internal and external)
+
+        Returns:
+            list: The mappings
+        """
+        with tracer.span("Mappings", category="stage"):
+            lst_mappings = list(
+                self.iter_mappings(
+                    dict_entities=dict_entities, dict_attributes=dict_attributes
+                )
+            )
+        return lst_mappings
+
+    def iter_mappings(self, dict_entities: dict, dict_attributes: dict):
+        """Extracts the mappings one at a time, the mappings are taken out of the document's content
+
+        Args:
+            dict_entities (dict): All entities in the document (internal and external)
+            dict_attributes (dict): All attributes in the document (internal and external)
+
+        Yields:
+            dict: A mapping enriched with entity and attribute data
+        """
+        if "c:Mappings" not in self.content:
+            return
+        # Taken out of the content so a mapping is released once its consumer is done with it
+        lst_mappings = self.content.pop("c:Mappings")["o:DefaultObjectMapping"]
+        if isinstance(lst_mappings, dict):
+            lst_mappings = [lst_mappings]
+        if self.is_filtered:
+            lst_mappings = [
+                mapping
+                for mapping in lst_mappings
+                if self.__references_resolve(
+                    content=mapping,
+                    dict_entities=dict_entities,
+                    dict_attributes=dict_attributes,
+                )
+            ]
+        yield from self.transform_mappings.iter_mappings(
             lst_mappings=lst_mappings,
             dict_entities=dict_entities,
             dict_attributes=dict_attributes,
         )
-        return lst_mappings
+
+    def __references_resolve(
+        self, content, dict_entities: dict, dict_attributes: dict
+    ) -> bool:
+        """Checks whether all entities and attributes referred to in a part of the document are extracted
+
+        Args:
+            content (Union[dict, list]): Power Designer document data, e.g. a mapping
+            dict_entities (dict): All extracted entities
+            dict_attributes (dict): All extracted attributes
+
+        Returns:
+            bool: True if all references can be resolved
+        """
+        if isinstance(content, list):
+            return all(
+                self.__references_resolve(item, dict_entities, dict_attributes)
+                for item in content
+            )
+        if not isinstance(content, dict):
+            return True
+        for key, value in content.items():
+            if key in ["o:Entity", "o:EntityAttribute"]:
+                lst_refs = value if isinstance(value, list) else [value]
+                dict_lookup = dict_entities if key == "o:Entity" else dict_attributes
+                if any(
+                    "@Ref" in ref and ref["@Ref"] not in dict_lookup for ref in lst_refs
+                ):
+                    return False
+            elif not self.__references_resolve(value, dict_entities, dict_attributes):
+                return False
+        return True
 
 class PDDocumentQuery:
     """Stores the models and mappings within a single PDDocument"""
 
-    def __init__(self, document: PDDocument):
+    # Template per type of object in a model, only templates that exist for an implementation are rendered
+    DICT_TEMPLATES = {
+        "Tables": "create_table.sql",
+        "Views": "create_view.sql",
+        "Procedures": "create_procedure.sql",
+        "Statistics": "create_statistics.sql",
+        "Ingest": "create_ingest.sql",
+    }
+    TEMPLATE_SCHEMA = "create_schema.sql"
+
+    def __init__(
+        self,
+        document: PDDocument,
+        implementations: list = None,
+        write: bool = True,
+        render_workers: int = 1,
+        chunk_size: int = 64,
+        dir_bundles: str = None,
+        physical_design: dict = None,
+        statistics: dict = None,
+        lst_mappings: list = None,
+        ingest: dict = None,
+        join_statistics: JoinStatistics = None,
+        statistics_advisor: StatisticsAdvisor = None,
+    ):
         """Retrieves a list of all models and a list of all mappings within a single PDDocument
 
         Args:
             document (PDDocument): The representation of a Power Designer logical data model
+            implementations (list, optional): Implementations to create DDL's for, each is a directory of templates
+                in 'templates/'. Defaults to ["dedicated-pool"].
+            write (bool, optional): Write the DDL's right away. When False the rendered DDL's are kept in
+                lst_files, to be written with write_files. Defaults to True.
+            render_workers (int, optional): Number of worker processes that render the objects of an
+                implementation, for documents with thousands of objects. Defaults to 1, rendering in this process.
+            chunk_size (int, optional): Number of objects a render worker renders per request. Defaults to 64.
+            dir_bundles (str, optional): Directory with precompiled templates (see TemplateBundle), used for the
+                implementations whose bundle matches their templates.
+            physical_design (dict, optional): Rowcount thresholds for the distribution and index of tables, see
+                PhysicalDesign.DICT_THRESHOLDS.
+            statistics (dict, optional): Options of the statistics and indexes derived for tables (like
+                'foreign_key_indexes'), see StatisticsAdvisor.
+            lst_mappings (list, optional): Mappings of other documents, e.g. the logical models of the tables,
+                whose join conditions count for the tables' hash columns and statistics as well
+            ingest (dict, optional): Location and format of the files loaded into the landing tables of external
+                models, see IngestDesign.DICT_OPTIONS.
+            join_statistics (JoinStatistics, optional): Joins of other documents, like the relationships and
+                mappings of the logical models of a folder; the document's own joins are added to a copy.
+            statistics_advisor (StatisticsAdvisor, optional): Joined and filtered columns of other documents, like
+                join_statistics; its options are used instead of 'statistics'.
         """
         self.lst_models = document.lst_models
-        # self.document = document
-        # Create DDL's
-        # self.write_ddl("proc", document.dict_procs)
-        # self.write_ddl("view", document.dict_views)
-        # self.write_ddl("view", document.lst_models["Views"])
-        self.write_ddl()
+        self.implementations = (
+            ["dedicated-pool"] if implementations is None else implementations
+        )
+        self.render_executor = RenderExecutor(workers=render_workers, chunk_size=chunk_size)
+        self.bundle = (
+            None if dir_bundles is None else TemplateBundle(dir_templates="templates", dir_bundles=dir_bundles)
+        )
+        self.lst_files = []
+        # Objects that failed to render, and timing per implementation and template
+        self.lst_render_errors = []
+        self.dict_render_stats = {}
+        # Hash columns of tables are chosen on how often they're joined in relationships and mappings, of the
+        # document itself and of other documents (join_statistics)
+        self.join_statistics = JoinStatistics() if join_statistics is None else join_statistics.copy()
+        self.join_statistics.add_models(lst_models=document.lst_models)
+        self.join_statistics.add_mappings(lst_mappings=document.lst_mappings)
+        # Statistics and indexes are derived from the same relationships and mappings
+        self.statistics_advisor = (
+            StatisticsAdvisor(**(statistics or {})) if statistics_advisor is None else statistics_advisor.copy()
+        )
+        self.statistics_advisor.add_models(lst_models=document.lst_models)
+        self.statistics_advisor.add_mappings(lst_mappings=document.lst_mappings)
+        if lst_mappings is not None:
+            self.join_statistics.add_mappings(lst_mappings=lst_mappings)
+            self.statistics_advisor.add_mappings(lst_mappings=lst_mappings)
+        self.thresholds_design = physical_design
+        self.options_ingest = ingest
+        if write:
+            self.write_ddl()
+        else:
+            self.lst_files = self.render_ddl()
 
     def write_ddl(self):
         """
-        Creates the DDL's
+        Creates the DDL's for all implementations
+        """
+        self.lst_files = self.render_ddl()
+        self.write_files(self.lst_files)
+
+    def render_ddl(self) -> list:
+        """Renders the DDL's for all implementations
+
+        The models are prepared once and are only read while rendering, so the implementations are rendered in
+        parallel, each with its own template environment and output directory 'output/<implementation>/'.
+
+        Returns:
+            list: Tuples of the output file path and the rendered DDL
+        """
+        # Prepared once for all implementations: the schema of objects and datatypes for all implementations
+        for model in self.lst_models:
+            for type_object in self.DICT_TEMPLATES:
+                for object in model.get(type_object, []):
+                    object["Schema"] = model["Code"]
+        # Datatypes are translated once for all columns, instead of per column in the templates
+        translator = DatatypeTranslator(
+            dir_templates="templates", implementations=self.implementations
+        )
+        translator.translate_models(lst_models=self.lst_models)
+        if any("Tables" in model for model in self.lst_models):
+            PhysicalDesign(
+                thresholds=self.thresholds_design, join_statistics=self.join_statistics
+            ).apply(lst_models=self.lst_models)
+            self.statistics_advisor.apply(lst_models=self.lst_models)
+        # Source systems (external models) get landing tables and bulk loads
+        IngestDesign(options=self.options_ingest).apply(lst_models=self.lst_models)
+        # Join paths between entities are searched on one graph, shared by the implementations' templates
+        self.relationship_graph = RelationshipGraph(lst_models=self.lst_models)
+        lst_files = []
+        with ThreadPoolExecutor(max_workers=len(self.implementations)) as executor:
+            dict_futures = {
+                implementation: executor.submit(self.__render_implementation, implementation)
+                for implementation in self.implementations
+            }
+            for implementation, future in dict_futures.items():
+                lst_files_implementation = future.result()
+                logger.info(
+                    f"Rendered {len(lst_files_implementation)} DDL's for '{implementation}'"
+                )
+                lst_files.extend(lst_files_implementation)
+        return lst_files
+
+    def __render_implementation(self, implementation: str) -> list:
+        """Renders the DDL's of all models for one implementation
+
+        Objects that fail to render are logged and collected in lst_render_errors, the other objects are written.
 
         Args:
-         type_template (str): The type of templates your want to use to implement your models
-            dict_object (dect): The object that describes the object for the template
-        """
-        # Loading templates
-        dest_type = "dedicated-pool"
-        dir_template = "templates/" + dest_type + "/"
-        environment = Environment(
-            loader=FileSystemLoader(dir_template), trim_blocks=True, lstrip_blocks=True
+            implementation (str): Name of the implementation, the directory of its templates
+
+        Returns:
+            list: Tuples of the output file path and the rendered DDL, in the order of the models and their objects
+        """
+        renderer = TemplateRenderer(
+            implementation=implementation,
+            dict_templates=self.DICT_TEMPLATES,
+            lst_models=self.lst_models,
+            relationship_graph=self.relationship_graph,
+            bundle=self.bundle,
         )
-        self.dict_templates = {
-            "schema": environment.get_template("create_schema.sql"),
-            "Tables": environment.get_template("create_table.sql"),
-            "Views": environment.get_template("create_view.sql"),
-            "Procedures": environment.get_template("create_procedure.sql"),
+        template_schema = None
+        if self.TEMPLATE_SCHEMA in renderer.environment.list_templates():
+            template_schema = renderer.environment.get_template(self.TEMPLATE_SCHEMA)
+        lst_tasks = renderer.tasks()
+        with tracer.span("Render DDL", category="stage", implementation=implementation):
+            lst_results = self.render_executor.run(renderer=renderer, lst_tasks=lst_tasks)
+        lst_files = []
+        dir_implementation = "output/" + implementation + "/"
+        if template_schema is not None:
+            for model in self.lst_models:
+                dir_schema = dir_implementation + model["Code"] + "/"
+                content = template_schema.render(
+                    schema={"name": model["Code"]}, implementation=implementation
+                )
+                lst_files.append((dir_schema + model["Code"] + ".sql", content))
+        dict_stats = {}
+        for (type_object, i_model, i_object), (content, error, seconds) in zip(lst_tasks, lst_results):
+            model = self.lst_models[i_model]
+            object = model[type_object][i_object]
+            stats = dict_stats.setdefault(
+                self.DICT_TEMPLATES[type_object],
+                {"Count": 0, "Errors": 0, "Seconds": 0.0, "SecondsMax": 0.0},
+            )
+            stats["Count"] += 1
+            stats["Seconds"] += seconds
+            stats["SecondsMax"] = max(stats["SecondsMax"], seconds)
+            if error is not None:
+                stats["Errors"] += 1
+                self.lst_render_errors.append(
+                    {
+                        "Implementation": implementation,
+                        "Type": type_object,
+                        "Model": model["Code"],
+                        "Code": object["Code"],
+                        "Error": error,
+                    }
+                )
+                logger.error(
+                    f"Rendering {type_object} '{object['Code']}' for '{implementation}' failed: {error}"
+                )
+                continue
+            file_output = (
+                dir_implementation + model["Code"] + "/" + type_object + "/" + object["Code"] + ".sql"
+            )
+            lst_files.append((file_output, content))
+        self.dict_render_stats[implementation] = dict_stats
+        logger.debug(f"Render timing for '{implementation}': {dict_stats}")
+        return lst_files
 
-        }
-        self.__generate_ddl()
+    @staticmethod
+    def write_files(lst_files: list) -> int:
+        """Writes rendered DDL's, creating their directories when needed
 
-    def __generate_ddl(self):
-        self.lst_template_objects = []
-        for model in self.lst_models:
-            for type_object, template in self.dict_templates.items():
-                if type_object in model:
-                    lst_objects = model[type_object]
-                    for i, object in enumerate(lst_objects):
-                        object["Schema"] = model["Code"]
-                        lst_objects[i] = object
-                    self.lst_template_objects.append(
-                        {"type": type_object, "template": template, "objects": lst_objects})
-                else:
-                    logger.warning(f"Object for '{type_object}' does not exist in the model.")
-
-            self.__write_ddl()
-        return self.lst_template_objects
-
-    def __write_ddl(self):
-        for type in self.lst_template_objects:
-            for object in type["objects"]:
-                #print(type["type"])
-                dir_output = "output/" + object["Schema"] + "/" + type["type"] + "/"
-                directory = Path(dir_output)
-                #directory.rmdir()
-                directory.mkdir(parents=True, exist_ok=True)
-                content = self.dict_templates[type["type"]].render(item=object)
-                file_output = dir_output + object["Code"] + ".sql"
+        Args:
+            lst_files (list): Tuples of the output file path and the rendered DDL
+
+        Returns:
+            int: Number of files written
+        """
+        set_dirs = set()
+        for file_output, content in lst_files:
+            dir_output = Path(file_output).parent
+            if dir_output not in set_dirs:
+                dir_output.mkdir(parents=True, exist_ok=True)
+                set_dirs.add(dir_output)
+            with tracer.span(dir_output.name, category="write", file=file_output):
                 with open(file_output, mode="w", encoding="utf-8") as file_ddl:
                     file_ddl.write(content)
-                logger.info(f"Written Table DDL {file_output}")
+            logger.info(f"Written DDL {file_output}")
+        return len(lst_files)
+
 # Run Current Class
 if __name__ == "__main__":
+    setup_logging()
     folder_models = "input/"  # "input"
-    PDDocuments(folder_pd=folder_models)
+    implementations = None
+    dir_bundles = None
+    physical_design = None
+    statistics = None
+    ingest = None
+    file_config = Path("config.yml")
+    if file_config.exists():
+        import yaml
+
+        with open(file_config) as f:
+            config = yaml.safe_load(f)
+        implementations = config.get("templates")
+        if isinstance(implementations, str):
+            implementations = [implementations]
+        dir_bundles = config.get("template_bundles")
+        physical_design = config.get("physical_design")
+        statistics = config.get("statistics")
+        ingest = config.get("ingest")
+    PDDocuments(
+        folder_pd=folder_models,
+        implementations=implementations,
+        dir_bundles=dir_bundles,
+        physical_design=physical_design,
+        statistics=statistics,
+        ingest=ingest,
+    )  # file_trace="output/trace.json"
     print("Done")
@@ -0,0 +1,82 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DomainResolver:
+    """Resolves the domain references of attributes (LDM) and columns (PDM) to shared domain data
+
+    The domain data that is added to attributes and columns is selected once per domain, all attributes and columns
+    with the same domain refer to the same dict. References that can't be resolved are collected in a report
+    instead of stopping the extraction.
+    """
+
+    KEYS_DOMAIN = ["Id", "Name", "Code", "DataType", "Length", "Precision"]
+    # Object tags a 'c:Domain' reference can have, logical and physical domains
+    LST_TAGS_DOMAIN = ["o:Domain", "o:PhysicalDomain"]
+
+    def __init__(self, dict_domains: dict):
+        """Selects the data of each domain that is added to attributes and columns
+
+        Args:
+            dict_domains (dict): Domains of the document with their Id as key
+        """
+        self.dict_domains = {
+            id: {key: domain[key] for key in self.KEYS_DOMAIN if key in domain}
+            for id, domain in dict_domains.items()
+        }
+        self.set_used = set()
+        self.lst_issues = []
+
+    def resolve(self, obj: dict, type_object: str) -> dict:
+        """Replaces the domain reference of an attribute or column by the domain's data
+
+        Args:
+            obj (dict): Attribute or column with a 'c:Domain' reference
+            type_object (str): Kind of object for the report, e.g. 'Attribute' or 'Column'
+
+        Returns:
+            dict: The same object, with 'Domain' when the reference could be resolved
+        """
+        if "c:Domain" not in obj:
+            return obj
+        reference = obj.pop("c:Domain") or {}
+        id_domain = None
+        for tag in self.LST_TAGS_DOMAIN:
+            if tag in reference:
+                id_domain = reference[tag].get("@Ref")
+                break
+        if id_domain is None:
+            self.__issue(obj, type_object, id_domain, "Domain reference has no known object type")
+        elif id_domain not in self.dict_domains:
+            self.__issue(obj, type_object, id_domain, "Domain is not part of the document")
+        else:
+            obj["Domain"] = self.dict_domains[id_domain]
+            self.set_used.add(id_domain)
+        return obj
+
+    def report(self) -> dict:
+        """Validation report of the domain references
+
+        Returns:
+            dict: The issues with references that couldn't be resolved, and the Ids of domains that aren't used
+        """
+        return {
+            "Issues": self.lst_issues,
+            "DomainsUnused": sorted(set(self.dict_domains) - self.set_used),
+        }
+
+    def __issue(self, obj: dict, type_object: str, id_domain: str, issue: str):
+        """Adds an unresolved reference to the report"""
+        self.lst_issues.append(
+            {
+                "Type": type_object,
+                "Id": obj.get("Id"),
+                "Code": obj.get("Code"),
+                "DomainId": id_domain,
+                "Issue": issue,
+            }
+        )
+        logger.warning(
+            f"{type_object} '{obj.get('Code')}' ({obj.get('Id')}): {issue} ({id_domain})"
+        )
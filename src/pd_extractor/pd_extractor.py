@@ -1,6 +1,5 @@
 import logging
 
-import src.log_config.logging_config as logging_config
 from pd_transform_model_internal import TransformModelInternal
 from pd_transform_models_external import TransformModelsExternal
 from pd_transform_mappings import TransformMappings
@@ -1,10 +1,10 @@
+import logging
 import os
 import sys
 
 if __name__ == "__main__":
     sys.path.append(os.getcwd())
 
-from src.log_config.logging_config import logging
 from pd_transform_pdm import TransformModels, TransformProcedures, TransformViews
 
 
@@ -0,0 +1,124 @@
+import logging
+
+from src.log_config.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class IngestDesign:
+    """Prepares the landing tables and bulk loads of the entities of external (source) models
+
+    External models are the source systems feeding the models of a document; their entities are shortcuts. Each
+    entity gets a landing table with the columns of its attributes, which the implementations' 'create_ingest.sql'
+    templates turn into external tables, file formats and COPY INTO statements (dedicated pool) or read_parquet
+    views and COPY statements (DuckDB). The files of an entity are expected in '<location>/<model>/<entity>/', the
+    location is the external data source of a dedicated pool.
+
+    Landing tables are distributed round robin as heaps: loads don't have to hash rows to distributions or sort
+    them into an index, so they're as fast as possible. Loads run in parallel over files, so 'file_split' is the
+    number of files (a multiple of it) a load should be delivered in, e.g. the 60 distributions of a dedicated pool.
+
+    Shortcut attributes only have a datatype when the shortcut is resolved to its entity, as PDDocuments does for
+    the documents of its folder (see ModelCatalog); columns without one get the templates' default datatype. Each
+    external model gets 'Ingest', for the templates:
+
+        {"Code": "CUSTOMER", "Schema": "CRM", "Columns": [{"Name": ..., "Code": ..., "TargetDataType": {...}}],
+         "Location": "landing/CRM/CUSTOMER", "Path": "/CRM/CUSTOMER/", "FileFormat": "parquet",
+         "DataSource": {"Name": "landing", "Location": "landing"}, "Distribution": "ROUND_ROBIN", "Index": "HEAP",
+         "FileSplit": 60}
+    """
+
+    # Defaults of the options, 'ingest' in config.yml overrides them
+    DICT_OPTIONS = {
+        "location": "landing",
+        "data_source": "landing",
+        "file_format": "parquet",
+        "file_split": 60,
+    }
+    LST_FILE_FORMATS = ["parquet", "csv"]
+
+    def __init__(self, options: dict = None):
+        """Sets the options
+
+        Args:
+            options (dict, optional): Values that override DICT_OPTIONS
+        """
+        self.options = {**self.DICT_OPTIONS, **(options or {})}
+        unknown = set(self.options) - set(self.DICT_OPTIONS)
+        if len(unknown) > 0:
+            logger.warning(f"Unknown ingest options {sorted(unknown)} are ignored")
+        if self.options["file_format"] not in self.LST_FILE_FORMATS:
+            logger.warning(
+                f"File format '{self.options['file_format']}' isn't one of {self.LST_FILE_FORMATS}, "
+                f"'{self.DICT_OPTIONS['file_format']}' is used"
+            )
+            self.options["file_format"] = self.DICT_OPTIONS["file_format"]
+
+    def apply(self, lst_models: list) -> int:
+        """Adds 'Ingest' to the models: the landing tables of the entities of external models
+
+        Args:
+            lst_models (list): Extracted models, with translated datatypes
+
+        Returns:
+            int: Number of landing tables
+        """
+        count_tables = 0
+        count_untyped = 0
+        with tracer.span("Ingest design", category="stage"):
+            for model in lst_models:
+                if model.get("IsDocumentModel", True):
+                    model["Ingest"] = []
+                    continue
+                model["Ingest"] = [
+                    self.landing_table(entity=entity, code_model=model["Code"])
+                    for entity in model.get("Entities", [])
+                ]
+                count_tables += len(model["Ingest"])
+                count_untyped += sum(
+                    "TargetDataType" not in column
+                    for table in model["Ingest"]
+                    for column in table["Columns"]
+                )
+        if count_untyped > 0:
+            logger.warning(
+                f"{count_untyped} landing columns have no datatype and get the default of the templates, "
+                "add the documents that own the external entities to use the source datatypes"
+            )
+        logger.info(f"Designed {count_tables} landing tables of external models")
+        return count_tables
+
+    def landing_table(self, entity: dict, code_model: str) -> dict:
+        """The landing table of an external entity
+
+        Args:
+            entity (dict): Entity of an external model (a shortcut, or the entity it's resolved to)
+            code_model (str): Code of the external model, the schema of the landing table
+
+        Returns:
+            dict: Landing table with its columns, the location and format of its files and its distribution
+        """
+        lst_columns = []
+        for attribute in sorted(entity.get("Attributes", []), key=lambda item: item.get("Order", 0)):
+            column = {item: attribute[item] for item in ["Id", "Name", "Code", "Order"] if item in attribute}
+            datatype = attribute.get("DataType", attribute.get("Domain", {}).get("DataType"))
+            if datatype is not None:
+                column["DataType"] = datatype
+            if "TargetDataType" in attribute:
+                column["TargetDataType"] = attribute["TargetDataType"]
+            lst_columns.append(column)
+        location = self.options["location"].rstrip("/")
+        return {
+            "Id": entity["Id"],
+            "Name": entity["Name"],
+            "Code": entity["Code"],
+            "Schema": code_model,
+            "Columns": lst_columns,
+            "Location": f"{location}/{code_model}/{entity['Code']}",
+            "Path": f"/{code_model}/{entity['Code']}/",
+            "FileFormat": self.options["file_format"],
+            "DataSource": {"Name": self.options["data_source"], "Location": location},
+            "Distribution": "ROUND_ROBIN",
+            "Index": "HEAP",
+            "FileSplit": self.options["file_split"],
+        }
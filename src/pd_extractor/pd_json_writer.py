@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentEncoder(json.JSONEncoder):
+    """JSON encoder for extracted Power Designer data
+
+    The transforms convert creation and modification dates to ISO-format strings, so extracted data only has JSON
+    types. A value of another type is a bug in a transform, which is raised with the type in the message.
+    """
+
+    def default(self, obj):
+        raise TypeError(
+            f"Object of type {type(obj).__name__} isn't JSON serializable, transforms should convert it to a JSON type"
+        )
+
+
+class JSONStreamWriter:
+    """Writes a JSON document one item at a time, so the document never has to be in memory as a whole
+
+    The top-level of the document is an object. Values are written with write_value, lists with write_items, which
+    consumes an iterable (like a generator of mappings) and writes each item as soon as it is produced. The output
+    is the same as json.dump with the same indentation would give for the complete document.
+
+    The document is written to a temporary file next to the output, which replaces the output when the writer is
+    left without an error; when writing fails the temporary file is removed and an earlier output is kept.
+
+    Example:
+        with JSONStreamWriter(file_output) as writer:
+            writer.write_items("Models", lst_models)
+            writer.write_items("Mappings", document.iter_mappings())
+    """
+
+    def __init__(self, file_output: str, compact: bool = False):
+        """Prepares writing to a file, which is opened when the writer is used as a context manager
+
+        Args:
+            file_output (str): The file path to which the output will be stored
+            compact (bool, optional): Leave out indentation and whitespace. Defaults to False (indented by 4).
+        """
+        self.file_output = file_output
+        self.compact = compact
+        if compact:
+            self._encoder = DocumentEncoder(separators=(",", ":"))
+            self._newline = ""
+            self._indent = ""
+            self._separator = ":"
+        else:
+            self._encoder = DocumentEncoder(indent=4)
+            self._newline = "\n"
+            self._indent = " " * 4
+            self._separator = ": "
+        self._file = None
+        self._is_first_key = True
+        self.count_items = 0
+
+    def __enter__(self):
+        path = Path(self.file_output)
+        Path(path.parent).mkdir(parents=True, exist_ok=True)
+        self._file_temp = path.with_name(path.name + ".tmp")
+        self._file = open(self._file_temp, "w", encoding="utf-8")
+        self._file.write("{")
+        self._is_first_key = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                if not self._is_first_key:
+                    self._file.write(self._newline)
+                self._file.write("}")
+        finally:
+            self._file.close()
+            self._file = None
+        if exc_type is None:
+            os.replace(self._file_temp, self.file_output)
+        else:
+            self._file_temp.unlink(missing_ok=True)
+            logger.error(f"Writing '{self.file_output}' failed, the output is left as it was")
+        return False
+
+    def write_value(self, key: str, value):
+        """Writes a key of the top-level object with its value as a whole
+
+        Args:
+            key (str): Key in the top-level object
+            value (any): Value that can be serialized to JSON
+        """
+        self.__write_key(key)
+        self.__write_encoded(value, depth=1)
+
+    def write_items(self, key: str, items) -> int:
+        """Writes a key of the top-level object with a list that is written item by item
+
+        Args:
+            key (str): Key in the top-level object
+            items (iterable): Items of the list, e.g. a generator; items are not kept after they are written
+
+        Returns:
+            int: Number of items written
+        """
+        self.__write_key(key)
+        count = 0
+        for item in items:
+            self._file.write("[" if count == 0 else ",")
+            self._file.write(self._newline + self._indent * 2)
+            self.__write_encoded(item, depth=2)
+            count += 1
+        if count == 0:
+            self._file.write("[]")
+        else:
+            self._file.write(self._newline + self._indent + "]")
+        self.count_items += count
+        return count
+
+    def __write_key(self, key: str):
+        """Writes the separator from the previous key and the key itself"""
+        if not self._is_first_key:
+            self._file.write(",")
+        self._is_first_key = False
+        self._file.write(self._newline + self._indent)
+        self._file.write(json.dumps(key) + self._separator)
+
+    def __write_encoded(self, value, depth: int):
+        """Writes a value, indenting its lines to the depth it has in the document
+
+        Strings in JSON have escaped newlines, so every newline in the encoded value starts a new line of the layout.
+        """
+        for chunk in self._encoder.iterencode(value):
+            if self._newline and "\n" in chunk:
+                chunk = chunk.replace("\n", "\n" + self._indent * depth)
+            self._file.write(chunk)
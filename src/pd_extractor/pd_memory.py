@@ -0,0 +1,154 @@
+import ctypes
+import logging
+import os
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:
+    # Windows has no resource module, its memory counters are read with GetProcessMemoryInfo
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised when the memory in use exceeds the budget of a document"""
+
+
+class MemoryBudget:
+    """Watches the resident memory (RSS) of the process while a document is processed
+
+    A background thread samples the RSS, so the peak between the moments the memory is checked is seen as well.
+    When a limit is set, check() raises MemoryBudgetExceeded once the peak went over it, so a document that doesn't
+    fit is stopped instead of taking the whole batch down. The budget is enforced after each step (where check() is
+    called), not during it: a single step, like parsing the XML, that needs more memory than the machine has still
+    runs out of memory. The sampler logs a warning as soon as the limit is passed.
+
+    Example:
+        with MemoryBudget(name="Example.ldm", limit_mb=2048) as budget:
+            content = parse(...)
+            budget.check("Parse XML")
+    """
+
+    _page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    def __init__(self, name: str, limit_mb: int = None, interval: float = 0.05):
+        """Sets up the budget, sampling starts when it is entered as a context manager
+
+        Args:
+            name (str): Name of what is watched, e.g. the document's file name, used in reports
+            limit_mb (int, optional): Maximum RSS in MB. Without a limit the peak is only reported.
+            interval (float, optional): Seconds between samples. Defaults to 0.05.
+        """
+        self.name = name
+        self.limit_mb = limit_mb
+        self.interval = interval
+        self.start_mb = 0.0
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start_mb = self.rss_mb()
+        self.peak_mb = self.start_mb
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.__sample, name=f"memory-{self.name}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        self.__update(self.rss_mb())
+        logger.info(
+            f"Memory of '{self.name}': peak {self.peak_mb:.0f} MB, "
+            f"{self.peak_mb - self.start_mb:.0f} MB more than at the start"
+        )
+        return False
+
+    @classmethod
+    def rss_mb(cls) -> float:
+        """Current resident memory of the process
+
+        Returns:
+            float: RSS in MB; on Windows the working set, on other systems without /proc the peak RSS of the
+                process, and 0.0 when the memory can't be read
+        """
+        try:
+            with open("/proc/self/statm") as file:
+                return int(file.read().split()[1]) * cls._page_size / 2**20
+        except OSError:
+            pass
+        if resource is not None:
+            # ru_maxrss is in bytes on macOS, in kilobytes on Linux and the BSD's
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maxrss / 2**20 if sys.platform == "darwin" else maxrss / 2**10
+        if sys.platform == "win32":
+            return cls.__rss_windows()
+        return 0.0
+
+    @staticmethod
+    def __rss_windows() -> float:
+        """Working set of the process in MB, read with GetProcessMemoryInfo"""
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32 = ctypes.WinDLL("kernel32")
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        get_info = getattr(kernel32, "K32GetProcessMemoryInfo", None) or ctypes.WinDLL(
+            "psapi"
+        ).GetProcessMemoryInfo
+        get_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+        if not get_info(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return 0.0
+        return counters.WorkingSetSize / 2**20
+
+    def check(self, stage: str):
+        """Checks the peak memory against the limit
+
+        Args:
+            stage (str): Name of the work done since the last check, used in the error
+
+        Raises:
+            MemoryBudgetExceeded: When the peak went over the limit
+        """
+        self.__update(self.rss_mb())
+        if self.limit_mb is not None and self.peak_mb > self.limit_mb:
+            raise MemoryBudgetExceeded(
+                f"Memory of '{self.name}' went up to {self.peak_mb:.0f} MB during '{stage}', "
+                f"the budget is {self.limit_mb} MB"
+            )
+
+    def __update(self, rss_mb: float):
+        if rss_mb > self.peak_mb:
+            self.peak_mb = rss_mb
+
+    def __sample(self):
+        is_reported = False
+        while not self._stop.wait(self.interval):
+            self.__update(self.rss_mb())
+            if not is_reported and self.limit_mb is not None and self.peak_mb > self.limit_mb:
+                logger.warning(
+                    f"Memory of '{self.name}' went over the budget of {self.limit_mb} MB "
+                    f"({self.peak_mb:.0f} MB), it is stopped after the current step"
+                )
+                is_reported = True
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectFilter:
+    """Criteria to select a subset of the entities or tables of a Power Designer document
+
+    The criteria are checked against the attributes at the start of an object's XML, so objects that don't match
+    can be skipped before the document is parsed. An object must meet all criteria that are given.
+    """
+
+    def __init__(
+        self,
+        codes: list = None,
+        object_ids: list = None,
+        modified_since: datetime = None,
+    ):
+        """Sets the criteria of the filter, criteria left out don't restrict the selection
+
+        Args:
+            codes (list, optional): Glob patterns the object's Code should match, e.g. ["DIM_*", "FACT_SALES"]
+            object_ids (list, optional): ObjectIDs (GUIDs) of the objects to keep
+            modified_since (datetime, optional): Keep objects that were modified at or after this moment, a
+                datetime without a timezone is taken as local time
+        """
+        self.codes = None if codes is None else [code.upper() for code in codes]
+        self.object_ids = None if object_ids is None else {id.upper() for id in object_ids}
+        # Timestamps in documents are UTC, an aware moment can be compared to them regardless of its timezone
+        self.modified_since = None if modified_since is None else modified_since.astimezone()
+
+    def matches(self, header: dict) -> bool:
+        """Checks whether an object meets the criteria
+
+        Args:
+            header (dict): The object's attributes without prefix, like 'Code', 'ObjectID' and 'ModificationDate'
+
+        Returns:
+            bool: True if the object should be kept
+        """
+        if self.codes is not None:
+            code = header.get("Code", "").upper()
+            if not any(fnmatchcase(code, pattern) for pattern in self.codes):
+                return False
+        if self.object_ids is not None:
+            if header.get("ObjectID", "").upper() not in self.object_ids:
+                return False
+        if self.modified_since is not None:
+            if "ModificationDate" not in header:
+                return False
+            modified = datetime.fromtimestamp(int(header["ModificationDate"]), tz=timezone.utc)
+            if modified < self.modified_since:
+                return False
+        return True
@@ -0,0 +1,254 @@
+import logging
+
+from src.log_config.tracing import tracer
+from pd_datatypes import parse_datatype
+
+logger = logging.getLogger(__name__)
+
+
+class JoinStatistics:
+    """Counts how often columns (attributes) are used to join their table (entity) to others
+
+    Joins are taken from the join conditions of mappings and from the joins of relationships and references
+    (foreign keys between tables). Tables and entities are matched on their Code, so the joins of a logical model's
+    mappings count for the tables of a physical model with the same codes.
+    """
+
+    def __init__(self):
+        # Table/entity Code as key, a dict with column/attribute Code as key and number of joins as value
+        self.dict_counts = {}
+
+    def add_models(self, lst_models: list):
+        """Counts the joins of the models' relationships and references
+
+        Args:
+            lst_models (list): Extracted models
+        """
+        for model in lst_models:
+            for reference in model.get("References", []):
+                for join in reference.get("Joins", []):
+                    self.__add(reference["ParentTable"]["Code"], join["ParentColumn"]["Code"])
+                    self.__add(reference["ChildTable"]["Code"], join["ChildColumn"]["Code"])
+            for relationship in model.get("Relationships", []):
+                for join in relationship.get("Joins", []):
+                    for key_entity, key_attribute in [
+                        ("Entity1", "Entity1Attribute"),
+                        ("Entity2", "Entity2Attribute"),
+                    ]:
+                        if key_entity in relationship and key_attribute in join:
+                            self.__add(relationship[key_entity]["Code"], join[key_attribute]["Code"])
+
+    def add_mappings(self, lst_mappings: list):
+        """Counts the join conditions of the mappings' compositions
+
+        Args:
+            lst_mappings (list): Extracted mappings
+        """
+        for mapping in lst_mappings:
+            for composition in mapping.get("Compositions", []):
+                lst_conditions = composition.get("JoinConditions", [])
+                if isinstance(lst_conditions, dict):
+                    lst_conditions = [lst_conditions]
+                for condition in lst_conditions:
+                    if not isinstance(condition, dict):
+                        continue
+                    components = condition.get("JoinConditionComponents", {})
+                    for key in ["AttributeParent", "AttributeChild"]:
+                        attribute = components.get(key)
+                        if attribute is not None and "CodeEntity" in attribute:
+                            self.__add(attribute["CodeEntity"], attribute["Code"])
+
+    def copy(self) -> "JoinStatistics":
+        """A copy the joins of a single document can be added to, without counting them for other documents
+
+        Returns:
+            JoinStatistics: The copy
+        """
+        join_statistics = JoinStatistics()
+        join_statistics.dict_counts = {
+            code_table: dict(dict_columns) for code_table, dict_columns in self.dict_counts.items()
+        }
+        return join_statistics
+
+    def counts(self, code_table: str) -> dict:
+        """Number of joins per column of a table
+
+        Args:
+            code_table (str): Code of the table
+
+        Returns:
+            dict: Column Code as key, number of joins as value
+        """
+        return self.dict_counts.get(code_table, {})
+
+    def __add(self, code_table: str, code_column: str):
+        dict_columns = self.dict_counts.setdefault(code_table, {})
+        dict_columns[code_column] = dict_columns.get(code_column, 0) + 1
+
+
+class PhysicalDesign:
+    """Decides the distribution and index of tables from their estimated rowcount
+
+    Following the guidance for dedicated SQL pools:
+
+    * Small tables (up to 'replicate_max_rows') are replicated to every compute node, so joins with them don't move
+      data; when they have a primary key they get a clustered index on it, otherwise a heap.
+    * Large tables (from 'hash_min_rows') are hash distributed on the column they are joined on most, preferring
+      mandatory primary key columns. Without a suitable column they are distributed round robin.
+    * Other tables are distributed round robin.
+    * Tables from 'columnstore_min_rows' get a clustered columnstore index, which needs about a million rows per
+      distribution to compress well; smaller tables that aren't replicated are heaps.
+
+    The thresholds must have replicate_max_rows < columnstore_min_rows <= hash_min_rows, otherwise the defaults are
+    used. Tables without a rowcount (0) are distributed round robin as heaps. The decision is added to each table as
+    'PhysicalDesign', for the templates:
+
+        {"Distribution": "HASH", "HashColumn": "CustomerID", "Index": "CLUSTERED COLUMNSTORE INDEX",
+         "IndexColumns": [], "Reason": "..."}
+    """
+
+    # Defaults of the thresholds, 'physical_design' in config.yml overrides them
+    DICT_THRESHOLDS = {
+        "replicate_max_rows": 2000000,
+        "columnstore_min_rows": 10000000,
+        "hash_min_rows": 60000000,
+    }
+    # Base datatypes (SQL and Power Designer) that make bad hash columns: few distinct values, or skewed towards
+    # the most recent values
+    SET_TYPES_NO_HASH = {
+        "DATE", "TIME", "DATETIME", "DATETIME2", "DATETIMEOFFSET", "SMALLDATETIME", "TIMESTAMP", "BIT", "BOOLEAN",
+        "D", "T", "DT", "TS", "BL",
+    }
+
+    def __init__(self, thresholds: dict = None, join_statistics: JoinStatistics = None):
+        """Sets the thresholds
+
+        Args:
+            thresholds (dict, optional): Values that override DICT_THRESHOLDS
+            join_statistics (JoinStatistics, optional): Join counts of the columns, for choosing hash columns
+        """
+        self.thresholds = {**self.DICT_THRESHOLDS, **(thresholds or {})}
+        unknown = set(self.thresholds) - set(self.DICT_THRESHOLDS)
+        if len(unknown) > 0:
+            logger.warning(f"Unknown physical design thresholds {sorted(unknown)} are ignored")
+        # A replicated table must stay below the columnstore threshold, or its clustered index on the primary key
+        # would be replaced by a columnstore index; hash distributed tables are always large enough for one
+        if not (
+            self.thresholds["replicate_max_rows"]
+            < self.thresholds["columnstore_min_rows"]
+            <= self.thresholds["hash_min_rows"]
+        ):
+            logger.warning(
+                f"Physical design thresholds {self.thresholds} should have replicate_max_rows < "
+                f"columnstore_min_rows <= hash_min_rows, the defaults {self.DICT_THRESHOLDS} are used"
+            )
+            self.thresholds = dict(self.DICT_THRESHOLDS)
+        self.join_statistics = join_statistics or JoinStatistics()
+
+    def apply(self, lst_models: list) -> dict:
+        """Decides the physical design of all tables of the models
+
+        Args:
+            lst_models (list): Extracted models
+
+        Returns:
+            dict: Number of tables per distribution
+        """
+        dict_counts = {}
+        with tracer.span("Physical design", category="stage"):
+            for model in lst_models:
+                for table in model.get("Tables", []):
+                    table["PhysicalDesign"] = self.design(table)
+                    distribution = table["PhysicalDesign"]["Distribution"]
+                    dict_counts[distribution] = dict_counts.get(distribution, 0) + 1
+        logger.info(f"Physical design of tables: {dict_counts}")
+        return dict_counts
+
+    def design(self, table: dict) -> dict:
+        """Decides the distribution and index of a table
+
+        Args:
+            table (dict): Table with its Rowcount, Columns and PrimaryKey
+
+        Returns:
+            dict: Distribution, HashColumn, Index, IndexColumns and the Reason for the decision
+        """
+        rowcount = self.__rowcount(table)
+        lst_primary = [column["Name"] for column in (table.get("PrimaryKey") or {}).get("Columns", [])]
+        design = {
+            "Distribution": "ROUND_ROBIN",
+            "HashColumn": None,
+            "Index": "HEAP",
+            "IndexColumns": [],
+            "Reason": None,
+        }
+        if rowcount == 0:
+            design["Reason"] = "No rowcount"
+        elif rowcount <= self.thresholds["replicate_max_rows"]:
+            design["Distribution"] = "REPLICATE"
+            design["Reason"] = f"{rowcount} rows, at most {self.thresholds['replicate_max_rows']}"
+            if len(lst_primary) > 0:
+                design["Index"] = "CLUSTERED INDEX"
+                design["IndexColumns"] = lst_primary
+        elif rowcount >= self.thresholds["hash_min_rows"]:
+            column = self.hash_column(table)
+            if column is None:
+                design["Reason"] = f"{rowcount} rows, but no suitable hash column"
+                logger.warning(
+                    f"Table '{table['Code']}' has {rowcount} rows but no column to hash distribute on"
+                )
+            else:
+                design["Distribution"] = "HASH"
+                design["HashColumn"] = column["Name"]
+                design["Reason"] = f"{rowcount} rows, at least {self.thresholds['hash_min_rows']}"
+        else:
+            design["Reason"] = f"{rowcount} rows"
+        if rowcount >= self.thresholds["columnstore_min_rows"]:
+            design["Index"] = "CLUSTERED COLUMNSTORE INDEX"
+            design["IndexColumns"] = []
+        return design
+
+    def hash_column(self, table: dict) -> dict:
+        """Picks the column to hash distribute a table on
+
+        Columns are ranked on the number of joins they're used in, then on being part of the primary key and on
+        being mandatory; columns with datatypes that distribute badly are left out.
+
+        Args:
+            table (dict): Table with Columns and PrimaryKey
+
+        Returns:
+            dict: The column, None when no column is suitable
+        """
+        dict_joins = self.join_statistics.counts(table["Code"])
+        set_primary = {column["Id"] for column in (table.get("PrimaryKey") or {}).get("Columns", [])}
+        lst_candidates = [
+            column
+            for column in table.get("Columns", [])
+            if self.__hashable(column)
+            and (column["Code"] in dict_joins or column["Id"] in set_primary)
+        ]
+        if len(lst_candidates) == 0:
+            return None
+        return max(
+            lst_candidates,
+            key=lambda column: (
+                dict_joins.get(column["Code"], 0),
+                column["Id"] in set_primary,
+                column.get("Column.Mandatory") == "1",
+                -column.get("Order", 0),
+            ),
+        )
+
+    def __hashable(self, column: dict) -> bool:
+        if not column.get("DataType"):
+            return True
+        base, _, _ = parse_datatype(column["DataType"])
+        return base not in self.SET_TYPES_NO_HASH
+
+    def __rowcount(self, table: dict) -> int:
+        try:
+            return int(table.get("Rowcount") or 0)
+        except (TypeError, ValueError):
+            logger.warning(f"Rowcount '{table.get('Rowcount')}' of table '{table.get('Code')}' isn't a number")
+            return 0
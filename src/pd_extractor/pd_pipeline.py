@@ -0,0 +1,242 @@
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+
+from src.log_config.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the items for a worker of a stage
+_END = object()
+
+
+class Stage:
+    """A step of a pipeline, executed by its own workers on the items the previous step produced"""
+
+    def __init__(self, name: str, function, workers: int = 1, processes: bool = False):
+        """Describes the stage
+
+        Args:
+            name (str): Name of the stage, used in metrics and traces
+            function (callable): Turns an item into the item for the next stage. For process stages the function
+                and its items must be picklable (module level functions or static methods); worker processes are
+                started fresh (spawned), not forked from the threaded pipeline.
+            workers (int, optional): Number of items processed at the same time. Defaults to 1.
+            processes (bool, optional): Run the function in worker processes instead of threads, for CPU bound
+                work like parsing. Defaults to False.
+        """
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.processes = processes
+
+
+class StageMetrics:
+    """Counters of a stage, updated by its workers while the pipeline runs"""
+
+    def __init__(self):
+        self.count_processed = 0
+        self.count_errors = 0
+        self.seconds_busy = 0.0
+        self.depth_max = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, is_error: bool, depth: int):
+        """Records a processed item and the depth of the stage's input queue at the time it was taken"""
+        with self._lock:
+            self.count_processed += 1
+            self.count_errors += int(is_error)
+            self.seconds_busy += seconds
+            self.depth_max = max(self.depth_max, depth)
+
+
+class Pipeline:
+    """Runs items through stages that are connected by bounded queues
+
+    Every stage works on its own items at the same time as the other stages, so reading the next file overlaps with
+    parsing the current one and writing the previous one. The queues between the stages hold at most 'queue_size'
+    items: a stage that is ahead waits for the next stage to catch up, which keeps the number of items in memory
+    bounded.
+
+    Example:
+        pipeline = Pipeline([Stage("Read", read, workers=2), Stage("Parse", parse, workers=4, processes=True)])
+        lst_results = pipeline.run(lst_files)
+        pipeline.metrics()
+    """
+
+    def __init__(self, lst_stages: list, queue_size: int = 2):
+        """Sets up the stages and their queues
+
+        Args:
+            lst_stages (list): Stages in the order items pass through them
+            queue_size (int, optional): Maximum number of items waiting in front of a stage. Defaults to 2.
+        """
+        self.lst_stages = lst_stages
+        self.queue_size = queue_size
+        self.lst_queues = []
+        self.dict_metrics = {}
+        self.seconds_elapsed = 0.0
+
+    def run(self, items) -> list:
+        """Runs the items through all stages
+
+        Items that fail in a stage are logged and left out, the other items go on.
+
+        Args:
+            items (iterable): Input of the first stage
+
+        Returns:
+            list: Output of the last stage, in the order the items were finished
+        """
+        self.lst_queues = [
+            queue.Queue(maxsize=self.queue_size) for _ in self.lst_stages
+        ]
+        self.dict_metrics = {stage.name: StageMetrics() for stage in self.lst_stages}
+        lst_results = []
+        lock_results = threading.Lock()
+        lst_executors = [
+            ProcessPoolExecutor(
+                max_workers=stage.workers,
+                # Forking while the threads of the other stages run could copy their locks while they're held
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=tracer.init_worker,
+                initargs=(tracer.enabled,),
+            )
+            if stage.processes
+            else None
+            for stage in self.lst_stages
+        ]
+        time_start = time.perf_counter()
+        lst_threads = []
+        for i, stage in enumerate(self.lst_stages):
+            # The last worker of a stage to finish tells the workers of the next stage there's nothing more
+            dict_active = {"count": stage.workers, "lock": threading.Lock()}
+            for j in range(stage.workers):
+                thread = threading.Thread(
+                    target=self.__work,
+                    name=f"{stage.name}-{j}",
+                    args=(i, lst_executors[i], dict_active, lst_results, lock_results),
+                    daemon=True,
+                )
+                thread.start()
+                lst_threads.append(thread)
+        try:
+            for item in items:
+                self.lst_queues[0].put(item)
+            for _ in range(self.lst_stages[0].workers):
+                self.lst_queues[0].put(_END)
+            for thread in lst_threads:
+                thread.join()
+        finally:
+            for executor in lst_executors:
+                if executor is not None:
+                    executor.shutdown()
+        self.seconds_elapsed = time.perf_counter() - time_start
+        logger.info(f"Pipeline finished in {self.seconds_elapsed:.2f}s: {self.metrics()}")
+        return lst_results
+
+    def queue_depths(self) -> dict:
+        """The number of items waiting in front of each stage, while the pipeline runs
+
+        Returns:
+            dict: Stage name as key, number of waiting items as value
+        """
+        return {
+            stage.name: queue_stage.qsize()
+            for stage, queue_stage in zip(self.lst_stages, self.lst_queues)
+        }
+
+    def metrics(self) -> dict:
+        """Metrics per stage of the last run
+
+        Returns:
+            dict: Stage name as key, a dict with the number of items processed, errors, busy seconds (summed over the
+                workers), the maximum queue depth and the throughput in items per second as value
+        """
+        dict_result = {}
+        for name, metrics in self.dict_metrics.items():
+            dict_result[name] = {
+                "Processed": metrics.count_processed,
+                "Errors": metrics.count_errors,
+                "SecondsBusy": round(metrics.seconds_busy, 3),
+                "QueueDepthMax": metrics.depth_max,
+                "Throughput": round(metrics.count_processed / self.seconds_elapsed, 3)
+                if self.seconds_elapsed > 0
+                else None,
+            }
+        return dict_result
+
+    def __work(
+        self,
+        i: int,
+        executor: ProcessPoolExecutor,
+        dict_active: dict,
+        lst_results: list,
+        lock_results: threading.Lock,
+    ):
+        """Worker of a stage: takes items from the stage's queue and puts the results in the next stage's queue
+
+        Args:
+            i (int): Position of the stage
+            executor (ProcessPoolExecutor): Pool of a process stage, None for thread stages
+            dict_active (dict): Number of workers of the stage that are still running, with its lock
+            lst_results (list): Results of the last stage
+            lock_results (threading.Lock): Lock for the results
+        """
+        stage = self.lst_stages[i]
+        metrics = self.dict_metrics[stage.name]
+        queue_in = self.lst_queues[i]
+        is_last = i == len(self.lst_stages) - 1
+        while True:
+            depth = queue_in.qsize()
+            item = queue_in.get()
+            if item is _END:
+                break
+            time_start = time.perf_counter()
+            is_error = False
+            try:
+                with tracer.span(stage.name, category="pipeline"):
+                    if executor is None:
+                        result = stage.function(item)
+                    else:
+                        result, lst_events = executor.submit(
+                            _run_traced, stage.function, item
+                        ).result()
+                        tracer.extend(lst_events)
+            except Exception as e:
+                is_error = True
+                logger.error(f"Stage '{stage.name}' failed on an item: {e!r}")
+            metrics.add(
+                seconds=time.perf_counter() - time_start, is_error=is_error, depth=depth
+            )
+            if is_error:
+                continue
+            # Blocks while the next stage is behind, which holds back this stage as well
+            if is_last:
+                with lock_results:
+                    lst_results.append(result)
+            else:
+                self.lst_queues[i + 1].put(result)
+        with dict_active["lock"]:
+            dict_active["count"] -= 1
+            is_finished = dict_active["count"] == 0
+        if is_finished and not is_last:
+            for _ in range(self.lst_stages[i + 1].workers):
+                self.lst_queues[i + 1].put(_END)
+
+
+def _run_traced(function, item) -> tuple:
+    """Runs a stage function in a worker process and hands over the spans recorded for it
+
+    Args:
+        function (callable): The stage's function
+        item (any): The item to process
+
+    Returns:
+        tuple: The function's result and the recorded trace events
+    """
+    result = function(item)
+    return result, tracer.drain()
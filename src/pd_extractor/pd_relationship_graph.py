@@ -0,0 +1,198 @@
+from collections import deque
+import logging
+
+from src.log_config.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class RelationshipGraph:
+    """Graph of the entities of the models with their relationships as edges, to find how entities can be joined
+
+    The graph is built once from the extracted models and answers are memoized, so templates can ask for join paths
+    for every object they render. A path is a list of steps, each step joins the entity reached so far to the next:
+
+        {
+            "Relationship": <relationship>,
+            "EntityFrom": <entity>,
+            "EntityTo": <entity>,
+            "Joins": [{"AttributeFrom": <attribute>, "AttributeTo": <attribute>}, ...],
+        }
+
+    The entities, attributes and relationships in the steps are the extracted objects themselves; paths are shared
+    between calls and should not be changed.
+    """
+
+    def __init__(self, lst_models: list):
+        """Builds the graph from the relationships of the models
+
+        Args:
+            lst_models (list): Extracted models
+        """
+        self.dict_entities = {}
+        self.dict_codes = {}
+        # Entity Id as key, list of (entity Id, step) of the relationships of the entity as value
+        self.dict_edges = {}
+        self.dict_cache = {}
+        with tracer.span("Relationship graph", category="stage"):
+            for model in lst_models:
+                for entity in model.get("Entities", []):
+                    self.dict_entities[entity["Id"]] = entity
+                    self.dict_codes.setdefault(entity["Code"], []).append(entity["Id"])
+            for model in lst_models:
+                for relationship in model.get("Relationships", []):
+                    self.__add_relationship(relationship)
+        logger.debug(
+            f"Relationship graph with {len(self.dict_entities)} entities and "
+            f"{sum(len(edges) for edges in self.dict_edges.values()) // 2} relationships"
+        )
+
+    def __add_relationship(self, relationship: dict):
+        """Adds a relationship as an edge in both directions
+
+        Args:
+            relationship (dict): Extracted relationship with Entity1, Entity2 and Joins
+        """
+        if "Entity1" not in relationship or "Entity2" not in relationship:
+            logger.warning(f"Relationship '{relationship.get('Code')}' misses an entity")
+            return
+        entity1 = relationship["Entity1"]
+        entity2 = relationship["Entity2"]
+        lst_joins = relationship.get("Joins", [])
+        step_forward = {
+            "Relationship": relationship,
+            "EntityFrom": entity1,
+            "EntityTo": entity2,
+            "Joins": [
+                {"AttributeFrom": join.get("Entity1Attribute"), "AttributeTo": join.get("Entity2Attribute")}
+                for join in lst_joins
+            ],
+        }
+        step_backward = {
+            "Relationship": relationship,
+            "EntityFrom": entity2,
+            "EntityTo": entity1,
+            "Joins": [
+                {"AttributeFrom": join.get("Entity2Attribute"), "AttributeTo": join.get("Entity1Attribute")}
+                for join in lst_joins
+            ],
+        }
+        self.dict_edges.setdefault(entity1["Id"], []).append((entity2["Id"], step_forward))
+        self.dict_edges.setdefault(entity2["Id"], []).append((entity1["Id"], step_backward))
+
+    def register(self, environment):
+        """Makes the path searches available to the templates of a Jinja environment
+
+        Templates can use 'join_path(source, target)' and 'join_paths(source, target)', where source and target are
+        entities, entity Ids or entity Codes.
+
+        Args:
+            environment (jinja2.Environment): Template environment
+        """
+        environment.globals["join_path"] = self.join_path
+        environment.globals["join_paths"] = self.join_paths
+
+    def join_path(self, source, target, max_depth: int = 4) -> list:
+        """Finds a shortest join path between two entities
+
+        Args:
+            source (Union[dict, str]): Entity, entity Id or entity Code to start from
+            target (Union[dict, str]): Entity, entity Id or entity Code to reach
+            max_depth (int, optional): Maximum number of relationships in the path. Defaults to 4.
+
+        Returns:
+            list: Steps of the path, empty when source and target are the same entity, None when there is no path
+        """
+        id_source = self.__entity_id(source)
+        id_target = self.__entity_id(target)
+        if id_source is None or id_target is None:
+            return None
+        key = ("shortest", id_source, id_target, max_depth)
+        if key not in self.dict_cache:
+            self.dict_cache[key] = self.__shortest(id_source, id_target, max_depth)
+        return self.dict_cache[key]
+
+    def join_paths(self, source, target, max_depth: int = 4) -> list:
+        """Finds all join paths between two entities that don't visit an entity twice
+
+        Args:
+            source (Union[dict, str]): Entity, entity Id or entity Code to start from
+            target (Union[dict, str]): Entity, entity Id or entity Code to reach
+            max_depth (int, optional): Maximum number of relationships in a path. Defaults to 4.
+
+        Returns:
+            list: Paths ordered from short to long, each a list of steps
+        """
+        id_source = self.__entity_id(source)
+        id_target = self.__entity_id(target)
+        if id_source is None or id_target is None:
+            return []
+        key = ("all", id_source, id_target, max_depth)
+        if key not in self.dict_cache:
+            lst_paths = []
+            self.__simple_paths(id_source, id_target, max_depth, [], {id_source}, lst_paths)
+            self.dict_cache[key] = sorted(lst_paths, key=len)
+        return self.dict_cache[key]
+
+    def __entity_id(self, entity) -> str:
+        """Looks up the Id of an entity given as entity, Id or Code
+
+        Returns:
+            str: The entity's Id, None if the entity is not in the graph
+        """
+        if isinstance(entity, dict):
+            entity = entity.get("Id")
+        if entity in self.dict_entities:
+            return entity
+        lst_ids = self.dict_codes.get(entity, [])
+        if len(lst_ids) == 0:
+            logger.warning(f"Entity '{entity}' is not part of the relationship graph")
+            return None
+        if len(lst_ids) > 1:
+            logger.warning(f"Code '{entity}' is used by {len(lst_ids)} entities, the first one is used")
+        return lst_ids[0]
+
+    def __shortest(self, id_source: str, id_target: str, max_depth: int) -> list:
+        """Breadth first search for a path with the fewest relationships"""
+        if id_source == id_target:
+            return []
+        dict_previous = {id_source: None}
+        queue_ids = deque([(id_source, 0)])
+        while queue_ids:
+            id_entity, depth = queue_ids.popleft()
+            if depth == max_depth:
+                continue
+            for id_next, step in self.dict_edges.get(id_entity, []):
+                if id_next in dict_previous:
+                    continue
+                dict_previous[id_next] = (id_entity, step)
+                if id_next == id_target:
+                    lst_steps = []
+                    while dict_previous[id_next] is not None:
+                        id_next, step = dict_previous[id_next]
+                        lst_steps.append(step)
+                    return lst_steps[::-1]
+                queue_ids.append((id_next, depth + 1))
+        return None
+
+    def __simple_paths(
+        self,
+        id_entity: str,
+        id_target: str,
+        max_depth: int,
+        lst_steps: list,
+        set_visited: set,
+        lst_paths: list,
+    ):
+        """Depth first search collecting every path that doesn't visit an entity twice"""
+        if len(lst_steps) == max_depth:
+            return
+        for id_next, step in self.dict_edges.get(id_entity, []):
+            if id_next == id_target:
+                lst_paths.append(lst_steps + [step])
+            elif id_next not in set_visited:
+                set_visited.add(id_next)
+                self.__simple_paths(
+                    id_next, id_target, max_depth, lst_steps + [step], set_visited, lst_paths
+                )
+                set_visited.discard(id_next)
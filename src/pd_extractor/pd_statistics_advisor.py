@@ -0,0 +1,239 @@
+import logging
+
+from src.log_config.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class StatisticsAdvisor:
+    """Derives the statistics and secondary indexes of tables from the joins and filters they're used in
+
+    Columns are collected from:
+
+    * the references (foreign keys) of physical models and the relationships of logical models: the columns of
+      both sides of the join, and of the child side for a foreign key index,
+    * the join conditions of mappings: the columns each side of a composition joins on, and the columns compared to
+      a fixed value (filters).
+
+    Tables and entities are matched on their Code, so the relationships and mappings of a logical model count for
+    the tables of a physical model with the same codes. Columns that are joined on together get one multi-column
+    statistic; a set of columns that is found in several places (e.g. many mappings joining the same tables) gives
+    one statistic. Before rendering each table gets:
+
+        "Statistics": [{"Name": "ST_CUSTOMER_COUNTRYID", "Columns": [{"Id": "o12", "Name": "CountryID",
+                        "Code": "COUNTRYID"}], "Sources": ["FK_CUSTOMER_COUNTRY"]}]
+        "Indexes": [{"Name": "IX_CUSTOMER_COUNTRYID", "Columns": [...], "Sources": ["FK_CUSTOMER_COUNTRY"]}]
+
+    Indexes are only derived with 'foreign_key_indexes', and not for columns that already lead the primary key or
+    the clustered index.
+    """
+
+    # Maximum length of the names of statistics and indexes
+    LENGTH_NAME_MAX = 128
+
+    def __init__(self, foreign_key_indexes: bool = False, filter_columns: bool = True):
+        """Sets the kinds of statistics and indexes to derive
+
+        Args:
+            foreign_key_indexes (bool, optional): Derive nonclustered indexes on foreign key columns.
+                Defaults to False.
+            filter_columns (bool, optional): Derive statistics on columns mappings compare to a fixed value.
+                Defaults to True.
+        """
+        self.foreign_key_indexes = foreign_key_indexes
+        self.filter_columns = filter_columns
+        # Table/entity Code as key, a dict with a frozenset of column Codes as key and the set of sources as value
+        self.dict_statistics = {}
+        self.dict_indexes = {}
+
+    def add_models(self, lst_models: list):
+        """Collects the joined columns of the models' references and relationships
+
+        Args:
+            lst_models (list): Extracted models
+        """
+        for model in lst_models:
+            for reference in model.get("References", []):
+                lst_joins = reference.get("Joins", [])
+                self.__add_join(
+                    code_parent=reference["ParentTable"]["Code"],
+                    lst_parent=[join["ParentColumn"]["Code"] for join in lst_joins],
+                    code_child=reference["ChildTable"]["Code"],
+                    lst_child=[join["ChildColumn"]["Code"] for join in lst_joins],
+                    source=reference["Code"],
+                )
+            for relationship in model.get("Relationships", []):
+                if "Entity1" not in relationship or "Entity2" not in relationship:
+                    continue
+                lst_joins = [
+                    join
+                    for join in relationship.get("Joins", [])
+                    if "Entity1Attribute" in join and "Entity2Attribute" in join
+                ]
+                key_parent, key_child = "Entity1", "Entity2"
+                if self.__is_reversed(relationship):
+                    key_parent, key_child = "Entity2", "Entity1"
+                self.__add_join(
+                    code_parent=relationship[key_parent]["Code"],
+                    lst_parent=[join[key_parent + "Attribute"]["Code"] for join in lst_joins],
+                    code_child=relationship[key_child]["Code"],
+                    lst_child=[join[key_child + "Attribute"]["Code"] for join in lst_joins],
+                    source=relationship["Code"],
+                )
+
+    def add_mappings(self, lst_mappings: list):
+        """Collects the joined and filtered columns of the mappings' compositions
+
+        Args:
+            lst_mappings (list): Extracted mappings
+        """
+        for mapping in lst_mappings:
+            for composition in mapping.get("Compositions", []):
+                lst_conditions = composition.get("JoinConditions", [])
+                if isinstance(lst_conditions, dict):
+                    lst_conditions = [lst_conditions]
+                # Columns joined on together, per entity (and alias of the parent entity)
+                dict_groups = {}
+                for condition in lst_conditions:
+                    if not isinstance(condition, dict):
+                        continue
+                    components = condition.get("JoinConditionComponents", {})
+                    child = components.get("AttributeChild")
+                    parent = components.get("AttributeParent")
+                    if parent is None:
+                        # Compared to a fixed value
+                        if child is not None and "CodeEntity" in child and self.filter_columns:
+                            self.__add(
+                                self.dict_statistics, child["CodeEntity"], [child["Code"]], mapping["Code"]
+                            )
+                        continue
+                    for attribute in [child, parent]:
+                        if attribute is not None and "CodeEntity" in attribute:
+                            key = (attribute["CodeEntity"], attribute.get("EntityAlias"), attribute is child)
+                            dict_groups.setdefault(key, []).append(attribute["Code"])
+                for (code_entity, _, _), lst_columns in dict_groups.items():
+                    self.__add(self.dict_statistics, code_entity, lst_columns, mapping["Code"])
+
+    def copy(self) -> "StatisticsAdvisor":
+        """A copy with the same options, for adding the joins of a single document without affecting others
+
+        Returns:
+            StatisticsAdvisor: The copy
+        """
+        advisor = StatisticsAdvisor(
+            foreign_key_indexes=self.foreign_key_indexes, filter_columns=self.filter_columns
+        )
+        for dict_collected, dict_copy in [
+            (self.dict_statistics, advisor.dict_statistics),
+            (self.dict_indexes, advisor.dict_indexes),
+        ]:
+            for code_table, dict_sets in dict_collected.items():
+                dict_copy[code_table] = {set_codes: set(set_sources) for set_codes, set_sources in dict_sets.items()}
+        return advisor
+
+    def apply(self, lst_models: list) -> dict:
+        """Adds the statistics and indexes to the tables of the models
+
+        Each model gets 'Statistics': the tables that have statistics or indexes, for rendering them per table.
+
+        Args:
+            lst_models (list): Extracted models, their tables can have a PhysicalDesign
+
+        Returns:
+            dict: Number of 'Statistics' and 'Indexes'
+        """
+        dict_counts = {"Statistics": 0, "Indexes": 0}
+        with tracer.span("Statistics advisor", category="stage"):
+            for model in lst_models:
+                lst_tables = []
+                for table in model.get("Tables", []):
+                    table["Statistics"] = self.statistics(table)
+                    table["Indexes"] = self.indexes(table) if self.foreign_key_indexes else []
+                    dict_counts["Statistics"] += len(table["Statistics"])
+                    dict_counts["Indexes"] += len(table["Indexes"])
+                    if len(table["Statistics"]) > 0 or len(table["Indexes"]) > 0:
+                        lst_tables.append(table)
+                model["Statistics"] = lst_tables
+        logger.info(f"Derived statistics and indexes: {dict_counts}")
+        return dict_counts
+
+    def statistics(self, table: dict) -> list:
+        """The statistics of a table, on the column sets it's joined and filtered on
+
+        Args:
+            table (dict): Table with its Columns
+
+        Returns:
+            list: Statistics with their Name, Columns (Id, Name and Code) and Sources
+        """
+        return self.__derive(table, self.dict_statistics, prefix="ST")
+
+    def indexes(self, table: dict) -> list:
+        """The nonclustered indexes of a table, on its foreign key columns
+
+        Column sets that lead the primary key or the clustered index are left out, they're already indexed.
+
+        Args:
+            table (dict): Table with its Columns, PrimaryKey and PhysicalDesign
+
+        Returns:
+            list: Indexes with their Name, Columns (Id, Name and Code) and Sources
+        """
+        lst_indexed = [
+            [column["Name"] for column in (table.get("PrimaryKey") or {}).get("Columns", [])],
+            (table.get("PhysicalDesign") or {}).get("IndexColumns", []),
+        ]
+        return [
+            index
+            for index in self.__derive(table, self.dict_indexes, prefix="IX")
+            if not any(
+                lst_columns[: len(index["Columns"])] == [column["Name"] for column in index["Columns"]]
+                for lst_columns in lst_indexed
+            )
+        ]
+
+    def __derive(self, table: dict, dict_collected: dict, prefix: str) -> list:
+        """Turns the collected column sets of a table into named statistics or indexes on its columns"""
+        dict_sets = dict_collected.get(table["Code"], {})
+        if len(dict_sets) == 0:
+            return []
+        dict_columns = {column["Code"]: column for column in table.get("Columns", [])}
+        lst_result = []
+        for set_codes, set_sources in dict_sets.items():
+            if not set_codes <= dict_columns.keys():
+                logger.debug(
+                    f"Columns {sorted(set_codes - dict_columns.keys())} of '{table['Code']}' ({prefix}) don't exist"
+                )
+                continue
+            lst_columns = sorted(
+                (dict_columns[code] for code in set_codes), key=lambda column: column.get("Order", 0)
+            )
+            name = "_".join([prefix, table["Code"]] + [column["Code"] for column in lst_columns])
+            lst_result.append(
+                {
+                    "Name": name[: self.LENGTH_NAME_MAX],
+                    "Columns": [
+                        {item: column[item] for item in ["Id", "Name", "Code"]} for column in lst_columns
+                    ],
+                    "Sources": sorted(set_sources),
+                }
+            )
+        return sorted(lst_result, key=lambda item: item["Name"])
+
+    def __add_join(self, code_parent: str, lst_parent: list, code_child: str, lst_child: list, source: str):
+        """Collects the columns of both sides of a join, and of the child side for a foreign key index"""
+        self.__add(self.dict_statistics, code_parent, lst_parent, source)
+        self.__add(self.dict_statistics, code_child, lst_child, source)
+        self.__add(self.dict_indexes, code_child, lst_child, source)
+
+    def __add(self, dict_collected: dict, code_table: str, lst_columns: list, source: str):
+        if len(lst_columns) == 0:
+            return
+        dict_sets = dict_collected.setdefault(code_table, {})
+        dict_sets.setdefault(frozenset(lst_columns), set()).add(source)
+
+    def __is_reversed(self, relationship: dict) -> bool:
+        """Whether Entity1 is the child of the relationship: it refers to at most one Entity2, which doesn't"""
+        to_entity2 = relationship.get("Entity1ToEntity2RoleCardinality", "")
+        to_entity1 = relationship.get("Entity2ToEntity1RoleCardinality", "")
+        return to_entity2.endswith(",1") and not to_entity1.endswith(",1")
@@ -0,0 +1,85 @@
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+class StringInterner:
+    """Makes identical strings of a parsed document share one object
+
+    Values like Creator, Modifier, DataType and the '@Id'/'@Ref' keys the parser builds for every element repeat
+    throughout a document, and the parser creates a new string for every occurrence. Passed to xmltodict as
+    postprocessor, the interner replaces each key and short value by the first string with the same content it saw,
+    so the duplicates are released right away.
+    """
+
+    def __init__(self, max_length: int = 100):
+        """Sets up an empty table of strings
+
+        Args:
+            max_length (int, optional): Longer values, like SQL queries or scripts, are rarely repeated and are left
+                as they are. Defaults to 100.
+        """
+        self.max_length = max_length
+        self.dict_strings = {}
+        self.count_strings = 0
+        self.count_shared = 0
+        self.bytes_saved = 0
+
+    def intern(self, value: str) -> str:
+        """Retrieves the shared string with the same content
+
+        Args:
+            value (str): A string
+
+        Returns:
+            str: The shared string
+        """
+        self.count_strings += 1
+        shared = self.dict_strings.setdefault(value, value)
+        if shared is not value:
+            self.count_shared += 1
+            self.bytes_saved += sys.getsizeof(value)
+        return shared
+
+    def postprocessor(self, path: list, key: str, value) -> tuple:
+        """xmltodict postprocessor that interns keys and short string values
+
+        Args:
+            path (list): Path of the element in the document (not used)
+            key (str): Element or attribute name
+            value (any): Element data, attribute value or the dict of a nested element
+
+        Returns:
+            tuple: The interned key and value
+        """
+        key = self.intern(key)
+        if isinstance(value, str) and len(value) <= self.max_length:
+            value = self.intern(value)
+        return key, value
+
+    def stats(self) -> dict:
+        """Counters of the strings that passed
+
+        Returns:
+            dict: Number of strings seen, distinct strings, strings that were replaced by a shared one and the bytes
+                the replaced strings took
+        """
+        return {
+            "Strings": self.count_strings,
+            "Distinct": len(self.dict_strings),
+            "Shared": self.count_shared,
+            "BytesSaved": self.bytes_saved,
+        }
+
+    def report(self, name: str):
+        """Logs the counters
+
+        Args:
+            name (str): What the strings came from, e.g. a document's file name
+        """
+        dict_stats = self.stats()
+        logger.debug(
+            f"Interned strings of '{name}': {dict_stats['Shared']} of {dict_stats['Strings']} shared, "
+            f"{dict_stats['BytesSaved'] / 2**20:.1f} MB saved"
+        )
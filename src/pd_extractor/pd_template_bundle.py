@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+import zipfile
+
+from src.log_config.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateBundle:
+    """Precompiled templates of implementations, so rendering doesn't parse and compile template sources
+
+    build() compiles the templates of an implementation to Python modules in '<dir_bundles>/<implementation>.zip',
+    with a manifest of the SHA-256 hashes of the template sources, the Jinja version and the environment options
+    the code was compiled with. environment() loads the templates from that zip as modules. The bundle is only used
+    when it matches: when the template sources are present their hashes must be the same as in the manifest, and
+    the Jinja version must be the one the bundle was compiled with. Otherwise the template sources are used.
+
+    Example:
+        bundle = TemplateBundle(dir_templates="templates", dir_bundles="templates/bundles")
+        bundle.build("duckdb")
+        environment = bundle.environment("duckdb")
+    """
+
+    FILE_MANIFEST = "manifest.json"
+    # Template files that are compiled, other files (like datatypes.json) are data
+    EXTENSIONS_TEMPLATE = (".sql",)
+    # Compiled code depends on these options, the environment that loads the bundle uses the same
+    DICT_OPTIONS = {"trim_blocks": True, "lstrip_blocks": True}
+
+    def __init__(self, dir_templates: str = "templates", dir_bundles: str = "templates/bundles"):
+        """Sets the directories of the template sources and the bundles
+
+        Args:
+            dir_templates (str, optional): Directory with a directory of templates per implementation.
+                Defaults to "templates".
+            dir_bundles (str, optional): Directory of the bundles. Defaults to "templates/bundles".
+        """
+        self.dir_templates = Path(dir_templates)
+        self.dir_bundles = Path(dir_bundles)
+
+    def file_bundle(self, implementation: str) -> Path:
+        """Path of an implementation's bundle"""
+        return self.dir_bundles / f"{implementation}.zip"
+
+    def build(self, implementation: str) -> Path:
+        """Compiles the templates of an implementation into its bundle
+
+        Args:
+            implementation (str): Name of the implementation, the directory of its templates
+
+        Returns:
+            Path: The bundle
+
+        Raises:
+            FileNotFoundError: When the implementation has no template directory
+            ValueError: When the implementation's directory has no templates, a bundle without them would make
+                rendering skip every object
+        """
+        # Imported on first use, extraction without rendering doesn't need the template engine
+        import jinja2
+        from jinja2 import Environment, FileSystemLoader
+
+        dir_source = self.dir_templates / implementation
+        if not dir_source.is_dir():
+            raise FileNotFoundError(f"No templates of '{implementation}', '{dir_source}' doesn't exist")
+        dict_hashes = self.__hashes(dir_source)
+        if len(dict_hashes) == 0:
+            raise ValueError(f"No templates of '{implementation}' in '{dir_source}' to bundle")
+        file_bundle = self.file_bundle(implementation)
+        file_bundle.parent.mkdir(parents=True, exist_ok=True)
+        environment = Environment(loader=FileSystemLoader(dir_source), **self.DICT_OPTIONS)
+        with tracer.span("Build template bundle", category="stage", implementation=implementation):
+            environment.compile_templates(
+                str(file_bundle),
+                zip="deflated",
+                filter_func=self.__is_template,
+                ignore_errors=False,
+            )
+            manifest = {
+                "Implementation": implementation,
+                "Jinja2": jinja2.__version__,
+                "Options": self.DICT_OPTIONS,
+                "Templates": dict_hashes,
+            }
+            with zipfile.ZipFile(file_bundle, "a") as file_zip:
+                file_zip.writestr(self.FILE_MANIFEST, json.dumps(manifest, indent=4))
+        logger.info(
+            f"Compiled {len(manifest['Templates'])} templates of '{implementation}' into '{file_bundle}'"
+        )
+        return file_bundle
+
+    def manifest(self, implementation: str) -> dict:
+        """The manifest of an implementation's bundle
+
+        Returns:
+            dict: The manifest, None when there's no bundle
+        """
+        file_bundle = self.file_bundle(implementation)
+        if not file_bundle.exists():
+            return None
+        with zipfile.ZipFile(file_bundle) as file_zip:
+            return json.loads(file_zip.read(self.FILE_MANIFEST))
+
+    def verify(self, implementation: str) -> bool:
+        """Checks whether the bundle of an implementation can be used instead of its template sources
+
+        Returns:
+            bool: True when the bundle has all templates of its manifest and matches the Jinja version and, if
+                present, the template sources
+        """
+        import jinja2
+        from jinja2 import ModuleLoader
+
+        manifest = self.manifest(implementation)
+        if manifest is None:
+            return False
+        file_bundle = self.file_bundle(implementation)
+        if len(manifest.get("Templates") or {}) == 0:
+            logger.warning(f"Bundle '{file_bundle}' has no templates, the template sources are used")
+            return False
+        with zipfile.ZipFile(file_bundle) as file_zip:
+            set_files = set(file_zip.namelist())
+        lst_missing = sorted(
+            name for name in manifest["Templates"] if ModuleLoader.get_module_filename(name) not in set_files
+        )
+        if len(lst_missing) > 0:
+            logger.warning(
+                f"Templates {lst_missing} are missing from '{file_bundle}', the template sources are used"
+            )
+            return False
+        if manifest["Jinja2"] != jinja2.__version__:
+            logger.warning(
+                f"Bundle '{file_bundle}' is compiled with Jinja {manifest['Jinja2']}, "
+                f"not {jinja2.__version__}, the template sources are used"
+            )
+            return False
+        dir_source = self.dir_templates / implementation
+        if dir_source.is_dir():
+            dict_hashes = self.__hashes(dir_source)
+            lst_changed = sorted(
+                name
+                for name in set(dict_hashes) | set(manifest["Templates"])
+                if dict_hashes.get(name) != manifest["Templates"].get(name)
+            )
+            if len(lst_changed) > 0:
+                logger.warning(
+                    f"Templates {lst_changed} changed since '{file_bundle}' was built, "
+                    "the template sources are used"
+                )
+                return False
+        return True
+
+    def environment(self, implementation: str):
+        """A template environment that loads the templates of the implementation's bundle
+
+        Returns:
+            jinja2.Environment: The environment, None when there's no bundle or it can't be used
+        """
+        if not self.verify(implementation):
+            return None
+        from jinja2 import Environment
+
+        manifest = self.manifest(implementation)
+        loader = BundleLoader(
+            path=str(self.file_bundle(implementation)), lst_templates=list(manifest["Templates"])
+        )
+        logger.debug(f"Templates of '{implementation}' are loaded from '{self.file_bundle(implementation)}'")
+        return Environment(loader=loader, **manifest["Options"])
+
+    def __is_template(self, name: str) -> bool:
+        return name.endswith(self.EXTENSIONS_TEMPLATE)
+
+    def __hashes(self, dir_source: Path) -> dict:
+        """SHA-256 of the template sources, with the template name as key"""
+        return {
+            file.relative_to(dir_source).as_posix(): hashlib.sha256(file.read_bytes()).hexdigest()
+            for file in sorted(dir_source.rglob("*"))
+            if file.is_file() and self.__is_template(file.name)
+        }
+
+
+class BundleLoader:
+    """Jinja loader for the compiled templates of a bundle, which also lists its templates
+
+    Loading is done by Jinja's ModuleLoader, which imports the compiled templates from the zip file; ModuleLoader
+    itself can't list templates.
+    """
+
+    def __init__(self, path: str, lst_templates: list):
+        """Opens the bundle
+
+        Args:
+            path (str): The bundle's zip file
+            lst_templates (list): Names of the templates in the bundle
+        """
+        from jinja2 import ModuleLoader
+
+        self._loader = ModuleLoader(path)
+        self.lst_templates = sorted(lst_templates)
+
+    def load(self, environment, name: str, globals: dict = None):
+        return self._loader.load(environment, name, globals)
+
+    def list_templates(self) -> list:
+        return self.lst_templates
+
+
+# Run Current Class
+if __name__ == "__main__":
+    from src.log_config.logging_config import setup_logging
+
+    setup_logging()
+    implementations = ["dedicated-pool"]
+    file_config = Path("config.yml")
+    if file_config.exists():
+        import yaml
+
+        with open(file_config) as f:
+            config = yaml.safe_load(f)
+        implementations = config.get("templates", implementations)
+        if isinstance(implementations, str):
+            implementations = [implementations]
+    bundle = TemplateBundle()
+    for implementation in implementations:
+        bundle.build(implementation)
@@ -0,0 +1,201 @@
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import time
+
+from src.log_config.tracing import tracer
+from pd_relationship_graph import RelationshipGraph
+from pd_template_bundle import TemplateBundle
+
+logger = logging.getLogger(__name__)
+
+# Renderer of a worker process, set up once by the pool's initializer
+_renderer = None
+
+
+class TemplateRenderer:
+    """Renders objects of models with the templates of one implementation
+
+    Objects are given as tasks (type of object, position of the model, position of the object in the model), so
+    worker processes that have the models only receive positions, not the objects themselves. The rendering of every
+    object is timed and an object that fails doesn't stop the others.
+    """
+
+    def __init__(
+        self,
+        implementation: str,
+        dict_templates: dict,
+        lst_models: list,
+        relationship_graph: RelationshipGraph = None,
+        dir_templates: str = "templates",
+        bundle: TemplateBundle = None,
+    ):
+        """Loads the templates of the implementation
+
+        Args:
+            implementation (str): Name of the implementation, the directory of its templates
+            dict_templates (dict): Template file name per type of object; types without a template in the
+                implementation's directory are not rendered
+            lst_models (list): Models with the objects to render
+            relationship_graph (RelationshipGraph, optional): Join paths for the templates, built from the models
+                when omitted
+            dir_templates (str, optional): Directory with a directory of templates per implementation.
+                Defaults to "templates".
+            bundle (TemplateBundle, optional): Precompiled templates, used instead of the template sources when
+                the implementation's bundle matches them
+        """
+        # Imported on first use, extraction without rendering doesn't need the template engine
+        from jinja2 import Environment, FileSystemLoader
+
+        self.implementation = implementation
+        self.lst_models = lst_models
+        self.bundle = bundle
+        environment = None if bundle is None else bundle.environment(implementation)
+        if environment is None:
+            environment = Environment(
+                loader=FileSystemLoader(f"{dir_templates}/{implementation}/"),
+                trim_blocks=True,
+                lstrip_blocks=True,
+            )
+        if relationship_graph is None:
+            relationship_graph = RelationshipGraph(lst_models=lst_models)
+        relationship_graph.register(environment)
+        self.environment = environment
+        lst_available = environment.list_templates()
+        with tracer.span("Load templates", category="stage", implementation=implementation):
+            self.dict_templates = {
+                type_object: environment.get_template(name_template)
+                for type_object, name_template in dict_templates.items()
+                if name_template in lst_available
+            }
+
+    def tasks(self) -> list:
+        """All objects of the models that have a template
+
+        Returns:
+            list: Tuples of the type of object, the position of the model and the position of the object
+        """
+        lst_tasks = []
+        for i_model, model in enumerate(self.lst_models):
+            for type_object in self.dict_templates:
+                if type_object not in model:
+                    logger.warning(f"Object for '{type_object}' does not exist in the model.")
+                    continue
+                lst_tasks.extend(
+                    (type_object, i_model, i_object) for i_object in range(len(model[type_object]))
+                )
+        return lst_tasks
+
+    def render(self, lst_tasks: list) -> list:
+        """Renders objects
+
+        Args:
+            lst_tasks (list): Tuples of the type of object, the position of the model and the position of the object
+
+        Returns:
+            list: Per task a tuple of the rendered content (None when it failed), the error message (None when it
+                succeeded) and the seconds it took, in the order of the tasks
+        """
+        lst_results = []
+        for type_object, i_model, i_object in lst_tasks:
+            object = self.lst_models[i_model][type_object][i_object]
+            time_start = time.perf_counter()
+            content = None
+            error = None
+            try:
+                with tracer.span(object["Code"], category="render", type=type_object):
+                    content = self.dict_templates[type_object].render(
+                        item=object, implementation=self.implementation
+                    )
+            except Exception as e:
+                error = repr(e)
+            lst_results.append((content, error, time.perf_counter() - time_start))
+        return lst_results
+
+
+class RenderExecutor:
+    """Renders the objects of models in chunks, in a pool of worker processes
+
+    Rendering an object only reads the object, so objects are rendered independently. Each worker process gets a
+    copy of the models once, when it starts, and renders chunks of tasks; results come back in the order of the
+    tasks, whichever worker finished first. With a single worker objects are rendered in the current process.
+    """
+
+    def __init__(self, workers: int = 1, chunk_size: int = 64):
+        """Sets up the executor
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to 1.
+            chunk_size (int, optional): Number of objects a worker renders per request, larger chunks have less
+                overhead, smaller chunks divide the work more evenly. Defaults to 64.
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def run(self, renderer: TemplateRenderer, lst_tasks: list, dir_templates: str = "templates") -> list:
+        """Renders the tasks
+
+        Args:
+            renderer (TemplateRenderer): Renderer of the implementation, used as is for a single worker
+            lst_tasks (list): Tuples of the type of object, the position of the model and the position of the object
+            dir_templates (str, optional): Directory with a directory of templates per implementation, for the
+                workers' renderers. Defaults to "templates".
+
+        Returns:
+            list: Per task a tuple of the rendered content, the error message and the seconds it took
+        """
+        workers = min(self.workers, -(-len(lst_tasks) // self.chunk_size))
+        if workers <= 1:
+            return renderer.render(lst_tasks)
+        lst_chunks = [
+            lst_tasks[i : i + self.chunk_size] for i in range(0, len(lst_tasks), self.chunk_size)
+        ]
+        dict_templates = {
+            type_object: template.name for type_object, template in renderer.dict_templates.items()
+        }
+        lst_results = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            # Not forked: rendering runs in threads (an implementation each, and the pipeline's stages), each
+            # worker gets the models pickled once through its initializer
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                tracer.enabled,
+                renderer.implementation,
+                dict_templates,
+                renderer.lst_models,
+                dir_templates,
+                renderer.bundle,
+            ),
+        ) as executor:
+            # map returns the chunks in the order they were submitted
+            for lst_results_chunk, lst_events in executor.map(_render_chunk, lst_chunks):
+                tracer.extend(lst_events)
+                lst_results.extend(lst_results_chunk)
+        return lst_results
+
+
+def _init_worker(
+    enabled: bool,
+    implementation: str,
+    dict_templates: dict,
+    lst_models: list,
+    dir_templates: str,
+    bundle: TemplateBundle,
+):
+    """Sets up the renderer of a worker process"""
+    global _renderer
+    tracer.init_worker(enabled)
+    _renderer = TemplateRenderer(
+        implementation=implementation,
+        dict_templates=dict_templates,
+        lst_models=lst_models,
+        dir_templates=dir_templates,
+        bundle=bundle,
+    )
+
+
+def _render_chunk(lst_tasks: list) -> tuple:
+    """Renders a chunk of tasks in a worker process and hands over the spans recorded for it"""
+    return _renderer.render(lst_tasks), tracer.drain()
@@ -2,7 +2,7 @@ import datetime  # TDODO: Remove
 import json  # TODO: Remove
 import logging
 
-import src.log_config.logging_config as logging_config
+from src.log_config.tracing import tracer
 from pd_transform_object import ObjectTransformer
 
 logger = logging.getLogger(__name__)
@@ -25,6 +25,27 @@ class TransformMappings(ObjectTransformer):
         Returns:
             list: _description_
         """
+        return list(
+            self.iter_mappings(
+                lst_mappings=lst_mappings,
+                dict_entities=dict_entities,
+                dict_attributes=dict_attributes,
+            )
+        )
+
+    def iter_mappings(
+        self, lst_mappings: list, dict_entities: dict, dict_attributes: dict
+    ):
+        """Reroutes and enriches mappings one at a time, so a mapping can be written and released before the next
+
+        Args:
+            lst_mappings (list): The part of the PowerDesigner document which contains the list of mappings
+            dict_entities (dict): All entities in the document (internal and external)
+            dict_attributes (dict): All attributes in the document (internal and external)
+
+        Yields:
+            dict: A cleaned and enriched mapping
+        """
         lst_ignored_mapping = [
             "Mapping Br Custom Business Rule Example",
             "Mapping AggrTotalSalesPerCustomer",
@@ -34,48 +55,72 @@ class TransformMappings(ObjectTransformer):
             m for m in lst_mappings if m["a:Name"] not in lst_ignored_mapping
         ]
 
-        lst_mappings = self.clean_keys(lst_mappings)
         for i in range(len(lst_mappings)):
-            mapping = lst_mappings[i]
-            logger.debug(
-                f"Starting mapping transform for {str(i)}) '{mapping['Name']}'"
-            )
-
-            # Target entity rerouting and enriching
-            if "o:Entity" in mapping["c:Classifier"]:
-                id_entity_target = mapping["c:Classifier"]["o:Entity"]["@Ref"]
-                mapping["EntityTarget"] = dict_entities[id_entity_target]
-                logger.debug(
-                    f"Mapping target entity: '{mapping['EntityTarget']['Name']}'"
-                )
-                # Source entities rerouting and enriching
-                mapping = self.__mapping_entities_source(
-                    mapping=mapping, dict_entities=dict_entities
+            mapping = self.clean_keys(lst_mappings[i])
+            # The list doesn't hold on to the mapping, the consumer decides how long it's kept
+            lst_mappings[i] = None
+            with tracer.span(mapping["Name"], category="mapping") as span:
+                mapping = self.__mapping(
+                    mapping=mapping,
+                    i=i,
+                    dict_entities=dict_entities,
+                    dict_attributes=dict_attributes,
                 )
-            else:
-                logger.warning(f"Mapping without entity found: '{mapping['Name']}'")
-            mapping.pop("c:Classifier")
+                span.add(compositions=len(mapping["Compositions"]))
+            yield mapping
 
-            # Reroute datasource
-            # TODO: Research role of DataSource
-            mapping["DataSourceID"] = mapping["c:DataSource"]["o:DefaultDataSource"][
-                "@Ref"
-            ]
-            mapping.pop("c:DataSource")
+    def __mapping(
+        self, mapping: dict, i: int, dict_entities: dict, dict_attributes: dict
+    ) -> dict:
+        """Reroutes a single mapping and enriches it with entity and attribute data
 
-            # Rerouting, restructuring and enriching compositionObjects
-            mapping = self.__mapping_compositions(
-                mapping=mapping,
-                dict_entities=dict_entities,
-                dict_attributes=dict_attributes,
+        Args:
+            mapping (dict): The part of the PowerDesigner document that describes a mapping
+            i (int): Position of the mapping within the document
+            dict_entities (dict): All entities in the document (internal and external)
+            dict_attributes (dict): All attributes in the document (internal and external)
+
+        Returns:
+            dict: The cleaned and enriched mapping
+        """
+        logger.debug(
+            f"Starting mapping transform for {str(i)}) '{mapping['Name']}'"
+        )
+
+        # Target entity rerouting and enriching
+        if "o:Entity" in mapping["c:Classifier"]:
+            id_entity_target = mapping["c:Classifier"]["o:Entity"]["@Ref"]
+            mapping["EntityTarget"] = dict_entities[id_entity_target]
+            logger.debug(
+                f"Mapping target entity: '{mapping['EntityTarget']['Name']}'"
             )
-            # Mapping attributes
-            mapping = self.__mapping_attributes(
-                mapping=mapping, dict_attributes=dict_attributes
+            # Source entities rerouting and enriching
+            mapping = self.__mapping_entities_source(
+                mapping=mapping, dict_entities=dict_entities
             )
+        else:
+            logger.warning(f"Mapping without entity found: '{mapping['Name']}'")
+        mapping.pop("c:Classifier")
+
+        # Reroute datasource
+        # TODO: Research role of DataSource
+        mapping["DataSourceID"] = mapping["c:DataSource"]["o:DefaultDataSource"][
+            "@Ref"
+        ]
+        mapping.pop("c:DataSource")
 
-            lst_mappings[i] = mapping
-        return lst_mappings
+        # Rerouting, restructuring and enriching compositionObjects
+        mapping = self.__mapping_compositions(
+            mapping=mapping,
+            dict_entities=dict_entities,
+            dict_attributes=dict_attributes,
+        )
+        # Mapping attributes
+        mapping = self.__mapping_attributes(
+            mapping=mapping, dict_attributes=dict_attributes
+        )
+
+        return mapping
 
     def __mapping_attributes(self, mapping: dict, dict_attributes: dict) -> dict:
         """Cleans and enriches data on the mapping of attributes
@@ -1,6 +1,7 @@
 import logging
 
-import src.log_config.logging_config as logging_config
+from src.log_config.tracing import tracer
+from pd_domain_resolver import DomainResolver
 from pd_transform_object import ObjectTransformer
 
 logger = logging.getLogger(__name__)
@@ -47,42 +48,53 @@ class TransformModelInternal(ObjectTransformer):
             dict_domains[domain["Id"]] = domain
         return dict_domains
 
-    def entities(self, lst_entities: list, dict_domains: dict) -> list:
+    def entities(
+        self,
+        lst_entities: list,
+        dict_domains: dict = None,
+        domain_resolver: DomainResolver = None,
+    ) -> list:
         """Reroutes internal entity data and enriches attributes with domain data
 
         Args:
             lst_entities (list): The Part of the PowerDesigner document that describes entities
-            dict_domains (dict): All domains (i.e. datatypes used for attributes)
+            dict_domains (dict, optional): All domains (i.e. datatypes used for attributes)
+            domain_resolver (DomainResolver, optional): Resolver shared with other transforms, created from
+                dict_domains when omitted
 
         Returns:
             list: _description_
         """
+        if domain_resolver is None:
+            domain_resolver = DomainResolver(dict_domains=dict_domains or {})
         lst_entities = self.clean_keys(lst_entities)
         for i in range(len(lst_entities)):
             entity = lst_entities[i]
+            with tracer.span(entity["Code"], category="entity"):
+                # Reroute attributes
+                entity = self.__entity_attributes(
+                    entity=entity, domain_resolver=domain_resolver
+                )
+                # Create subset of attributes to enrich identifier attributes
+                dict_attrs = {
+                    d["Id"]: {"Name": d["Name"], "Code": d["Code"]}
+                    for d in entity["Attributes"]
+                }
 
-            # Reroute attributes
-            entity = self.__entity_attributes(entity=entity, dict_domains=dict_domains)
-            # Create subset of attributes to enrich identifier attributes
-            dict_attrs = {
-                d["Id"]: {"Name": d["Name"], "Code": d["Code"]}
-                for d in entity["Attributes"]
-            }
-
-            # Identifiers and primary identifier
-            entity = self.__entity_identifiers(entity=entity, dict_attrs=dict_attrs)
+                # Identifiers and primary identifier
+                entity = self.__entity_identifiers(entity=entity, dict_attrs=dict_attrs)
 
             # Reroute default mapping
             # TODO: research role DefaultMapping
             lst_entities[i] = entity
         return lst_entities
 
-    def __entity_attributes(self, entity: dict, dict_domains: list) -> dict:
+    def __entity_attributes(self, entity: dict, domain_resolver: DomainResolver) -> dict:
         """Reroutes attribute data for internal entities and enriches them with domain data
 
         Args:
             entity (dict): Internal entity
-            dict_domains (list): All domains
+            domain_resolver (DomainResolver): Resolves domain references to the shared domain data
 
         Returns:
             dict: _description_
@@ -92,21 +104,9 @@ class TransformModelInternal(ObjectTransformer):
             lst_attrs = [lst_attrs]
         lst_attrs = self.clean_keys(lst_attrs)
         for i in range(len(lst_attrs)):
-            # Change domain data
             attr = lst_attrs[i]
             attr["Order"] = i
-            if "c:Domain" in attr:
-                # Reroute domain data
-                id_domain = attr["c:Domain"]["o:Domain"]["@Ref"]
-
-                # Add matching domain data
-                attr_domain = dict_domains[id_domain]
-                keys_domain = {"Id", "Name", "Code", "DataType", "Length", "Precision"}
-                attr_domain = {
-                    k: attr_domain[k] for k in keys_domain if k in attr_domain
-                }
-                attr["Domain"] = attr_domain
-                attr.pop("c:Domain")
+            attr = domain_resolver.resolve(obj=attr, type_object="Attribute")
             lst_attrs[i] = attr
         entity["Attributes"] = lst_attrs
         entity.pop("c:Attributes")
@@ -1,6 +1,7 @@
 import logging
 
-import src.log_config.logging_config as logging_config
+from src.log_config.tracing import tracer
+from pd_domain_resolver import DomainResolver
 from pd_transform_object import ObjectTransformer
 
 logger = logging.getLogger(__name__)
@@ -43,16 +44,25 @@ class TransformModelPhysical(ObjectTransformer):
         return dict_domains
 
 
-    def tables(self, lst_tables: list, dict_domains: dict) -> list:
+    def tables(
+        self,
+        lst_tables: list,
+        dict_domains: dict = None,
+        domain_resolver: DomainResolver = None,
+    ) -> list:
         """Reroutes table data and enriches columns with domain data
 
         Args:
             lst_tables (list): The Part of the PowerDesigner document that describes tables
-            dict_domains (dict): All domains (i.e. datatypes used for columns)
+            dict_domains (dict, optional): All domains (i.e. datatypes used for columns)
+            domain_resolver (DomainResolver, optional): Resolver shared with other transforms, created from
+                dict_domains when omitted
 
         Returns:
             list: _description_
         """
+        if domain_resolver is None:
+            domain_resolver = DomainResolver(dict_domains=dict_domains or {})
         lst_tables = self.clean_keys(lst_tables)
         for i in range(len(lst_tables)):
             table = lst_tables[i]
@@ -67,6 +77,8 @@ class TransformModelPhysical(ObjectTransformer):
                 "ModificationDate",
                 "Modifier",
                 "c:Columns",
+                "c:Keys",
+                "c:PrimaryKey",
             ]
             if 'Number' in table:
                 table['Rowcount']= table.pop('Number')
@@ -75,7 +87,9 @@ class TransformModelPhysical(ObjectTransformer):
             table = {item: table[item] for item in table if item in lst_include}
 
             # Reroute columns
-            table = self.__table_columns(table=table, dict_domains=dict_domains)
+            with tracer.span(table["Code"], category="table"):
+                table = self.__table_columns(table=table, domain_resolver=domain_resolver)
+                table = self.__table_keys(table=table)
 
             # Clean table
             # table.pop("c:ClusterObject")
@@ -85,6 +99,68 @@ class TransformModelPhysical(ObjectTransformer):
             lst_tables[i] = table
         return lst_tables
 
+    def references(self, lst_references: list, lst_tables: list) -> list:
+        """Reroutes references (foreign keys) between tables, with the column pairs they join on
+
+        Args:
+            lst_references (list): The Part of the PowerDesigner document that describes references
+            lst_tables (list): The rerouted tables of the model
+
+        Returns:
+            list: References with the Id, Name and Code of their ParentTable and ChildTable and Joins of
+                ParentColumn and ChildColumn; references to tables that aren't in lst_tables are left out
+        """
+        if isinstance(lst_references, dict):
+            lst_references = [lst_references]
+        lst_references = self.clean_keys(lst_references)
+        dict_tables = {table["Id"]: table for table in lst_tables}
+        dict_columns = {
+            column["Id"]: column for table in lst_tables for column in table.get("Columns", [])
+        }
+        lst_include = [
+            "Id",
+            "ObjectID",
+            "Name",
+            "Code",
+            "ForeignKeyConstraintName",
+            "Cardinality",
+            "CreationDate",
+            "Creator",
+            "ModificationDate",
+            "Modifier",
+        ]
+        lst_result = []
+        for reference in lst_references:
+            id_parent = reference.get("c:ParentTable", {}).get("o:Table", {}).get("@Ref")
+            id_child = reference.get("c:ChildTable", {}).get("o:Table", {}).get("@Ref")
+            if id_parent not in dict_tables or id_child not in dict_tables:
+                logger.debug(f"Reference '{reference.get('Code')}' refers to a table outside the model")
+                continue
+            lst_joins = reference.get("c:Joins", {}).get("o:ReferenceJoin", [])
+            if isinstance(lst_joins, dict):
+                lst_joins = [lst_joins]
+            reference_new = {item: reference[item] for item in reference if item in lst_include}
+            reference_new["ParentTable"] = self.__reference_item(dict_tables[id_parent])
+            reference_new["ChildTable"] = self.__reference_item(dict_tables[id_child])
+            reference_new["Joins"] = []
+            for i, join in enumerate(lst_joins):
+                id_column_parent = join.get("c:Object1", {}).get("o:Column", {}).get("@Ref")
+                id_column_child = join.get("c:Object2", {}).get("o:Column", {}).get("@Ref")
+                if id_column_parent not in dict_columns or id_column_child not in dict_columns:
+                    continue
+                reference_new["Joins"].append(
+                    {
+                        "Order": i,
+                        "ParentColumn": self.__reference_item(dict_columns[id_column_parent]),
+                        "ChildColumn": self.__reference_item(dict_columns[id_column_child]),
+                    }
+                )
+            lst_result.append(reference_new)
+        return lst_result
+
+    def __reference_item(self, item: dict) -> dict:
+        return {key: item[key] for key in ["Id", "Name", "Code"] if key in item}
+
     def view(self, lst_view: list) -> list:
         # content = self.convert_timestamps(content)
         lst_view = self.clean_keys(lst_view)
@@ -141,12 +217,12 @@ class TransformModelPhysical(ObjectTransformer):
             lst_procs_new.append(dict_new)
         return lst_procs_new
 
-    def __table_columns(self, table: dict, dict_domains: list) -> dict:
+    def __table_columns(self, table: dict, domain_resolver: DomainResolver) -> dict:
         """Reroutes column data for columns and enriches them with domain data
 
         Args:
             table (dict): table
-            dict_domains (list): All domains
+            domain_resolver (DomainResolver): Resolves domain references to the shared domain data
 
         Returns:
             dict: _description_
@@ -156,26 +232,55 @@ class TransformModelPhysical(ObjectTransformer):
             lst_columns = [lst_columns]
         lst_columns = self.clean_keys(lst_columns)
         for i in range(len(lst_columns)):
-            # Change domain data
             column = lst_columns[i]
             column["Order"] = i
-            if "c:Domain" in column:
-                # Reroute domain data
-                id_domain = column["c:Domain"]["o:Domain"]["@Ref"]
-
-                # Add matching domain data
-                column_domain = dict_domains[id_domain]
-                keys_domain = {"Id", "Name", "Code", "DataType", "Length", "Precision"}
-                attr_domain = {
-                    k: attr_domain[k] for k in keys_domain if k in attr_domain
-                }
-                column["Domain"] = attr_domain
-                column.pop("c:Domain")
+            column = domain_resolver.resolve(obj=column, type_object="Column")
             lst_columns[i] = column
         table["Columns"] = lst_columns
         table.pop("c:Columns")
         return table
 
+    def __table_keys(self, table: dict) -> dict:
+        """Reroutes the keys of a table, with the columns they consist of, and marks its primary key
+
+        Args:
+            table (dict): table with its rerouted columns
+
+        Returns:
+            dict: table with 'Keys' and, when it has one, 'PrimaryKey'
+        """
+        if "c:Keys" not in table:
+            table.pop("c:PrimaryKey", None)
+            return table
+        dict_columns = {column["Id"]: column for column in table["Columns"]}
+        lst_keys = table.pop("c:Keys")["o:Key"]
+        if isinstance(lst_keys, dict):
+            lst_keys = [lst_keys]
+        lst_keys = self.clean_keys(lst_keys)
+        for i in range(len(lst_keys)):
+            key = lst_keys[i]
+            lst_refs = key.get("c:Key.Columns", {}).get("o:Column", [])
+            if isinstance(lst_refs, dict):
+                lst_refs = [lst_refs]
+            key = {
+                "Id": key["Id"],
+                "Name": key.get("Name"),
+                "Code": key.get("Code"),
+                "Columns": [
+                    {item: dict_columns[ref["@Ref"]][item] for item in ["Id", "Name", "Code"]}
+                    for ref in lst_refs
+                    if ref["@Ref"] in dict_columns
+                ],
+            }
+            lst_keys[i] = key
+        table["Keys"] = lst_keys
+        primary_key = table.pop("c:PrimaryKey", None)
+        if primary_key is not None:
+            id_key = primary_key["o:Key"]["@Ref"]
+            table["PrimaryKey"] = next((key for key in lst_keys if key["Id"] == id_key), None)
+        return table
+
+
 #TODO: Clean up code
 class TransformProcedures(ObjectTransformer):
     def __init__(self):
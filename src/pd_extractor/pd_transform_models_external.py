@@ -1,6 +1,6 @@
 import logging
 
-import src.log_config.logging_config as logging_config
+from src.log_config.tracing import tracer
 from pd_transform_object import ObjectTransformer
 
 logger = logging.getLogger(__name__)
@@ -25,13 +25,14 @@ class TransformModelsExternal(ObjectTransformer):
         lst_models = self.clean_keys(lst_models)
         for model in lst_models:
             # model = self.convert_timestamps(model)
-            shortcuts = model["c:SessionShortcuts"]["o:Shortcut"]
-            if isinstance(shortcuts, dict):
-                shortcuts = [shortcuts]
-            shortcuts = [i["@Ref"] for i in shortcuts]
-            model["Entities"] = [
-                dict_entities[id] for id in shortcuts if id in dict_entities
-            ]
+            with tracer.span(model["Name"], category="model"):
+                shortcuts = model["c:SessionShortcuts"]["o:Shortcut"]
+                if isinstance(shortcuts, dict):
+                    shortcuts = [shortcuts]
+                shortcuts = [i["@Ref"] for i in shortcuts]
+                model["Entities"] = [
+                    dict_entities[id] for id in shortcuts if id in dict_entities
+                ]
             if len(model["Entities"]) > 0:
                 model["IsDocumentModel"] = False
                 lst_result.append(model)
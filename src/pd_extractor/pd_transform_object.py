@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 from typing import Union
 
-import src.log_config.logging_config as logging_config
+from src.log_config.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +44,7 @@ class ObjectTransformer:
         return result
 
     def __convert_values_datetime(self, d: dict, convert_key: str) -> dict:
-        """Converts all (nested) dictionary entries with a specified name value containing a Unix timestamp to a datetime object
+        """Converts all (nested) dictionary entries with a specified name value containing a Unix timestamp to an ISO-format string in UTC
 
         Args:
             d (dict): Dictionary contains the timestamp value
@@ -56,7 +56,7 @@ class ObjectTransformer:
         if isinstance(d, dict):
             for key in list(d.keys()):
                 if key == convert_key:
-                    d[key] = datetime.fromtimestamp(int(d[key]))
+                    d[key] = datetime.fromtimestamp(int(d[key]), tz=timezone.utc).isoformat()
                 else:
                     self.__convert_values_datetime(d[key], convert_key)
             return d
@@ -66,7 +66,10 @@ class ObjectTransformer:
             return d
 
     def convert_timestamps(self, pd_content: dict) -> dict:
-        """Converts all unix time integers to datetime objects according to the list of fieldnames specified in the constructor
+        """Converts all unix time integers to ISO-format date strings according to the list of fieldnames specified in the constructor
+
+        The dates are strings, so the extracted data can be written as JSON without an encoder hook. They're in UTC,
+        like the modification dates an ObjectFilter compares, so they don't depend on the timezone of the machine.
 
         Args:
             pd_content (dict): Power Designer document data
@@ -74,6 +77,7 @@ class ObjectTransformer:
         Returns:
             dict: The same Power Designer document data, but with timestamps converted
         """
-        for field in self.__timestamp_fields:
-            pd_content = self.__convert_values_datetime(pd_content, field)
+        with tracer.span("Convert timestamps", category="transform"):
+            for field in self.__timestamp_fields:
+                pd_content = self.__convert_values_datetime(pd_content, field)
         return pd_content
@@ -1,6 +1,5 @@
 import logging
 
-import src.log_config.logging_config as logging_config
 from pd_transform_object import ObjectTransformer
 
 logger = logging.getLogger(__name__)